@@ -1,15 +1,31 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
+import numpy as np
+import functools
+import os
+import sys
+import time
 from datetime import datetime
 
-st.set_page_config(
-    page_title="Zen Estate Financial Dashboard",
-    page_icon="🏢",
-    layout="wide"
-)
+from zen_dashboard import config
+from zen_dashboard.artifact import VENDOR_TOP_N, build_artifact, read_artifact
+from zen_dashboard.charts import (create_combined_monthly_chart, create_extra_income_chart, create_vendor_chart,
+                                  create_wing_difference_chart)
+from zen_dashboard.artifact import main as build_snapshot_main
+from zen_dashboard.ledger import main as import_ledger_main
+from zen_dashboard.report import main as build_report_main
+from zen_dashboard.report import publish_report
+from zen_dashboard.export import ALL_TABLES, EXPORT_TABLES, EXPORTS, MIME_TYPES, TABLE_FORMATS, export_tables
+from zen_dashboard.figures import FIGURES
+from zen_dashboard.ingest import ingest_workbooks
+from zen_dashboard.layout import period_label
+from zen_dashboard.metrics import REGISTRY, finish_trace, serve_metrics, start_trace, timed
+from zen_dashboard.estates import EstateRegistry
+from zen_dashboard.units import load_units, unit_list, unit_months
+from zen_dashboard.views import (DETAIL_SORT_COLUMNS, PENDING_COLUMN, detail_page, detail_positions, period_mask,
+                                  vendor_monthly, vendor_table)
 
-st.markdown("""
+PAGE_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -51,363 +67,554 @@ st.markdown("""
         text-align: center !important;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
 
-@st.cache_data
-def load_excel_from_github():
-    """Load Excel file directly from GitHub repository"""
-    # GitHub raw file URL - UPDATE THIS with your actual file URL
-    GITHUB_EXCEL_URL = "https://raw.githubusercontent.com/dhootmahesh28/zen-estate-dashboard/master/Zen_Estate_Combined_Expenses_Q1.xlsx"
-    
-    try:
-        import requests
-        from io import BytesIO
-        
-        # Download the file
-        response = requests.get(GITHUB_EXCEL_URL)
-        response.raise_for_status()
-        
-        # Load into pandas
-        excel_file = BytesIO(response.content)
-        return load_excel_data(excel_file)
-    except Exception as e:
-        st.error(f"Error loading data from GitHub: {e}")
+def setup_page():
+    st.set_page_config(
+        page_title="Zen Estate Financial Dashboard",
+        page_icon="🏢",
+        layout="wide"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_estates():
+    # One registry per server process, shared by all sessions; each estate gets a background refresher on first view
+    return EstateRegistry(load_latest_data, config.ESTATES, config.REFRESH_INTERVAL, config.CACHE_BUDGET_BYTES)
+
+def current_estate():
+    """Estate of this page: ?estate=<id>, else ZEN_DEFAULT_ESTATE"""
+    return st.query_params.get('estate') or config.DEFAULT_ESTATE
+
+def get_refresher(estate=None):
+    return get_estates().refresher(estate or current_estate())
+
+def load_latest_data(estate, progress=None, previous=None):
+    """Called by the estate's refresher thread, never by a page render"""
+    if config.ARTIFACT_PATH and estate == config.DEFAULT_ESTATE:
+        # Built ahead of time by `python app.py build-snapshot`
+        artifact = read_artifact(config.ARTIFACT_PATH)
+    else:
+        # The first load may use the on-disk copies; later ones revalidate with the server
+        frames, blocks = load_excel_data(config.ESTATES[estate], progress, revalidate=previous is not None)
+        # Flat/shop registers (ZEN_UNITS) replace the wing totals they cover with the sums of their units
+        artifact = build_artifact(frames, blocks, load_units(config.UNIT_SOURCES.get(estate)))
+    # Static page for read-only viewers (ZEN_REPORT_DIR), rewritten only when the data changed
+    publish_report(artifact, estate)
+    return artifact
+
+@st.cache_resource
+def start_metrics_endpoint():
+    # Plain-text /metrics on localhost for a scraping sidecar (off unless ZEN_METRICS_PORT is set)
+    if config.METRICS_PORT:
+        serve_metrics(config.METRICS_PORT)
+    return config.METRICS_PORT
+
+def load_excel_from_github(progress=None, estate=None):
+    """Latest data version of the estate (default: this page's), loaded in the background (None if nothing loaded yet)"""
+    with timed('load_excel_from_github') as stage:
+        # A miss means this render had to wait for the first load of the estate
+        stage['cache'] = 'hit' if get_refresher(estate).current is not None else 'miss'
+        data = wait_for_data_version(progress, estate)
+    return data
+
+def wait_for_data_version(progress=None, estate=None):
+    refresher = get_refresher(estate)
+    # Only the very first load of the estate is waited for; after that the last good version is shown instantly
+    while refresher.current is None and refresher.wait_for_data(timeout=0.2) is None:
+        if refresher.last_error is not None:
+            break
+        if progress and refresher.progress:
+            progress(*refresher.progress)
+    if refresher.current is None:
+        st.error(f"Error loading data from GitHub: {refresher.last_error}")
         st.info("Please make sure the Excel file is uploaded to your GitHub repository.")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-@st.cache_data
-def load_excel_data(file):
-    """Load all financial data from Excel"""
-    try:
-        df = pd.read_excel(file, sheet_name='Sheet1', header=None)
-        
-        # Wing names from columns 6-21
-        wings = ['A Wing', 'A Shop', 'B Wing', 'B Shop', 'C Wing', 'C Shop Total', 
-                 'C Shop Rahul', 'C Shop Sagar', 'D Wing', 'D Shop', 'E Wing', 'E Shop', 
-                 'F Wing', 'G Wing', 'H Wing', 'I Wing']
-        
-        # Extract monthly data
-        months_info = [
-            {'name': 'Sep', 'to_be_row': 9, 'received_row': 8, 'diff_row': 10, 'summary_row': 14, 'expense_col': 15},
-            {'name': 'Oct', 'to_be_row': 29, 'received_row': 28, 'diff_row': 30, 'summary_row': 34, 'expense_col': 15},
-            {'name': 'Nov', 'to_be_row': 45, 'received_row': 44, 'diff_row': 46, 'summary_row': 50, 'expense_col': 15},
-            {'name': 'Dec', 'to_be_row': 62, 'received_row': 61, 'diff_row': 63, 'summary_row': 67, 'expense_col': 15},
-            {'name': 'Jan', 'to_be_row': 77, 'received_row': 76, 'diff_row': 78, 'summary_row': 82, 'expense_col': 15}
-        ]
-        
-        # Monthly summary data
-        monthly_data = []
-        wing_data = []
-        
-        for month_info in months_info:
-            month = month_info['name']
-            
-            # Get summary totals
-            to_be = df.iloc[month_info['summary_row'], 6] if pd.notna(df.iloc[month_info['summary_row'], 6]) else 0
-            received = df.iloc[month_info['summary_row'], 9] if pd.notna(df.iloc[month_info['summary_row'], 9]) else 0
-            expense = df.iloc[month_info['summary_row'], month_info['expense_col']] if pd.notna(df.iloc[month_info['summary_row'], month_info['expense_col']]) else 0
-            extra_income = df.iloc[month_info['summary_row'], 18] if pd.notna(df.iloc[month_info['summary_row'], 18]) else 0
-            
-            monthly_data.append({
-                'Month': month,
-                'To_Be': float(to_be),
-                'Received': float(received),
-                'Expense': float(expense),
-                'Extra_Income': float(extra_income)
-            })
-            
-            # Get wing-wise data
-            for idx, wing in enumerate(wings):
-                col_idx = 6 + idx
-                if col_idx < df.shape[1]:
-                    to_be_val = df.iloc[month_info['to_be_row'], col_idx]
-                    received_val = df.iloc[month_info['received_row'], col_idx]
-                    diff_val = df.iloc[month_info['diff_row'], col_idx]
-                    
-                    wing_data.append({
-                        'Month': month,
-                        'Wing': wing,
-                        'To_Be': float(to_be_val) if pd.notna(to_be_val) else 0,
-                        'Received': float(received_val) if pd.notna(received_val) else 0,
-                        'Difference': float(diff_val) if pd.notna(diff_val) else 0
-                    })
-        
-        # Get vendor data for ALL months (Sep, Oct, Nov, Dec, Jan)
-        vendor_data = []
-        
-        # Define vendor sections for each month
-        vendor_sections = [
-            {'month': 'Sep', 'start': 3, 'end': 20},     # Sep vendor rows
-            {'month': 'Oct', 'start': 22, 'end': 36},    # Oct vendor rows  
-            {'month': 'Nov', 'start': 38, 'end': 52},    # Nov vendor rows
-            {'month': 'Dec', 'start': 55, 'end': 68},    # Dec vendor rows
-            {'month': 'Jan', 'start': 70, 'end': 85}     # Jan vendor rows
-        ]
-        
-        for section in vendor_sections:
-            for idx in range(section['start'], min(section['end'], len(df))):
-                vendor = df.iloc[idx, 2]
-                amount = df.iloc[idx, 3]
-                if pd.notna(vendor) and pd.notna(amount) and isinstance(amount, (int, float)) and amount > 0:
-                    # Check if vendor name is not a header
-                    vendor_str = str(vendor)
-                    if 'Vendor Name' not in vendor_str and 'Vendor Bills' not in vendor_str:
-                        vendor_data.append({
-                            'Vendor': vendor_str,
-                            'Amount': float(amount),
-                            'Month': section['month']
-                        })
-        
-        df_monthly = pd.DataFrame(monthly_data)
-        df_wings = pd.DataFrame(wing_data)
-        df_vendors = pd.DataFrame(vendor_data) if vendor_data else pd.DataFrame()
-        
-        # Extract Extra Income breakdown by source
-        # Using specific rows: Sep=9, Oct=29, Nov=45, Dec=62, Jan=77 (Excel rows)
-        # Columns: NBH=23(X), Lift=24(Y), Event=25(Z), Scrap=26(AA)
-        extra_income_breakdown = []
-        
-        month_rows = {
-            'Sep': 8,   # Row 9 in Excel = index 8
-            'Oct': 28,  # Row 29 in Excel = index 28
-            'Nov': 44,  # Row 45 in Excel = index 44
-            'Dec': 61,  # Row 62 in Excel = index 61
-            'Jan': 76   # Row 77 in Excel = index 76
-        }
-        
-        for month, row_idx in month_rows.items():
-            if row_idx < len(df):
-                nbh = df.iloc[row_idx, 23] if pd.notna(df.iloc[row_idx, 23]) else 0
-                lift = df.iloc[row_idx, 24] if pd.notna(df.iloc[row_idx, 24]) else 0
-                event = df.iloc[row_idx, 25] if pd.notna(df.iloc[row_idx, 25]) else 0
-                scrap = df.iloc[row_idx, 26] if pd.notna(df.iloc[row_idx, 26]) else 0
-                parking_fine = df.iloc[row_idx, 27] if pd.notna(df.iloc[row_idx, 27]) else 0
-                
-                extra_income_breakdown.append({
-                    'Month': month,
-                    'NBH': float(nbh) if isinstance(nbh, (int, float)) else 0,
-                    'Lift': float(lift) if isinstance(lift, (int, float)) else 0,
-                    'Event': float(event) if isinstance(event, (int, float)) else 0,
-                    'Scrap': float(scrap) if isinstance(scrap, (int, float)) else 0,
-                    'Parking_Fine': float(parking_fine) if isinstance(parking_fine, (int, float)) else 0
-                })
-        
-        df_extra_income_breakdown = pd.DataFrame(extra_income_breakdown)
-        
-        # Extract Fine data by vendor type and wing
-        # Fine sections: Sep at row 1, Oct at 20, Nov at 36, Dec at 53, Jan at 68 (Excel rows)
-        # Columns: Col 29=Wing, Col 30=HK, Col 31=Quinteze, Col 32=Security, Col 33=STP
-        fine_data = []
-        
-        fine_sections = [
-            {'month': 'Sep', 'start': 3, 'end': 12},      # Rows 3-11
-            {'month': 'Oct', 'start': 22, 'end': 31},     # Rows 22-30
-            {'month': 'Nov', 'start': 38, 'end': 47},     # Rows 38-46
-            {'month': 'Dec', 'start': 55, 'end': 64},     # Rows 55-63
-            {'month': 'Jan', 'start': 70, 'end': 79}      # Rows 70-78
-        ]
-        
-        for section in fine_sections:
-            for row_idx in range(section['start'], min(section['end'], len(df))):
-                wing = df.iloc[row_idx, 29]  # Col 29 = Wing
-                if pd.notna(wing) and isinstance(wing, str) and 'Wing' in str(wing):
-                    hk_fine = df.iloc[row_idx, 30]
-                    quinteze_fine = df.iloc[row_idx, 31]
-                    security_fine = df.iloc[row_idx, 32]
-                    stp_fine = df.iloc[row_idx, 33]
-                    
-                    hk_fine = float(hk_fine) if pd.notna(hk_fine) and isinstance(hk_fine, (int, float)) else 0
-                    quinteze_fine = float(quinteze_fine) if pd.notna(quinteze_fine) and isinstance(quinteze_fine, (int, float)) else 0
-                    security_fine = float(security_fine) if pd.notna(security_fine) and isinstance(security_fine, (int, float)) else 0
-                    stp_fine = float(stp_fine) if pd.notna(stp_fine) and isinstance(stp_fine, (int, float)) else 0
-                    
-                    total_fine = hk_fine + quinteze_fine + security_fine + stp_fine
-                    
-                    fine_data.append({
-                        'Month': section['month'],
-                        'Wing': wing,
-                        'HK': hk_fine,
-                        'Quinteze': quinteze_fine,
-                        'Security': security_fine,
-                        'STP': stp_fine,
-                        'Total_Fine': total_fine
-                    })
-        
-        df_fines = pd.DataFrame(fine_data) if fine_data else pd.DataFrame()
-        
-        return df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines
-        
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-def create_vendor_breakdown(df_vendors, month):
-    """Vendor Expense Breakdown with color gradient for a specific month"""
-    if df_vendors.empty:
+    return refresher.current
+
+def load_excel_data(sources, progress=None, revalidate=False):
+    """Load all financial data from one or more Excel workbooks (paths, globs or URLs)"""
+    # Several workbooks are parsed in parallel; each month is taken from the last workbook that has it
+    with timed('load_excel_data'):
+        return ingest_workbooks(sources, max_workers=config.INGEST_WORKERS, progress=progress, with_layout=True,
+                                revalidate=revalidate)
+
+def show_table(name, style, table, **kwargs):
+    """st.dataframe of style(table), timed as the table:<name> stage"""
+    with timed(f'table:{name}') as stage:
+        stage['bytes'] = int(table.memory_usage(deep=True).sum())
+        st.dataframe(style(table), **kwargs)
+
+def show_figure(data, name, stage_name, variant=None, build=None):
+    """st.plotly_chart of the version's prebuilt figure name, timed as the chart:<stage_name> stage
+
+    A variant (e.g. a date range narrower than the data) is made by build() instead.
+    """
+    figure_json = data.figures.get(name)
+    if not figure_json:
+        return
+    with timed(f'chart:{stage_name}') as stage:
+        # Loaded and validated (or built) once per data version and variant, then shared by every rerun and session
+        if variant is None:
+            stage['bytes'] = len(figure_json)
+            figure, stage['cache'] = FIGURES.get((data.key, name), figure_json)
+        else:
+            figure, stage['cache'] = FIGURES.get((data.key, name, *variant), build=build)
+        st.plotly_chart(figure, use_container_width=True)
+
+def select_date_range(periods):
+    """Date range slider over the periods: (start, end), or None while it covers all of them"""
+    periods = list(periods)
+    if len(periods) < 2:
         return None
+    start, end = st.select_slider('Date range', periods, value=(periods[0], periods[-1]), format_func=period_label,
+                                  key='date_range')
+    if (start, end) == (periods[0], periods[-1]):
+        return None
+    return start, end
+
+def trace_table(trace):
+    """Stages of a trace as a table, nested stages indented"""
+    return pd.DataFrame({
+        'Stage': ['\u2003' * entry['depth'] + entry['stage'] for entry in trace],
+        'ms': [round((entry['seconds'] or 0) * 1000, 2) for entry in trace],
+        'Bytes': [entry['bytes'] for entry in trace],
+        'Cache': [entry['cache'] for entry in trace],
+    })
+
+def cache_table(stats):
+    """Hit rate of every cache, one row per stage"""
+    rows = []
+    for stage, results in sorted(stats.items()):
+        lookups = sum(results.values())
+        rows.append({
+            'Cache': stage,
+            'Lookups': lookups,
+            'Hits': results.get('hit', 0),
+            'Hit rate': f"{results.get('hit', 0) / lookups:.0%}" if lookups else '-',
+            'Other results': ', '.join(f"{r}: {n}" for r, n in sorted(results.items()) if r != 'hit') or '-',
+        })
+    return pd.DataFrame(rows)
+
+def show_diagnostics(rerun_trace, started):
+    """Hidden panel (?diagnostics=1 or ZEN_DIAGNOSTICS=1) with stage timings and the metrics dump"""
+    if not (config.DIAGNOSTICS or st.query_params.get('diagnostics') == '1'):
+        return
+    with st.expander("🩺 Diagnostics", expanded=False):
+        st.markdown(f"**This page render** ({(time.perf_counter() - started) * 1000:,.1f} ms)")
+        st.dataframe(trace_table(rerun_trace), use_container_width=True, hide_index=True)
+        refresh_trace = REGISTRY.traces.get('refresh')
+        if refresh_trace:
+            st.markdown("**Last background refresh**")
+            st.dataframe(trace_table(refresh_trace), use_container_width=True, hide_index=True)
+        st.markdown("**Cache hit rates** (since the server started)")
+        figure_stats = FIGURES.stats()
+        st.caption(f"Figure cache: {figure_stats['entries']}/{figure_stats['max_entries']} figures, "
+                   f"{figure_stats['json_bytes'] / 1024:,.0f} KiB of JSON")
+        estate_stats = get_estates().stats()
+        budget = f"{estate_stats['budget_bytes'] / 2**20:,.0f} MiB" if estate_stats['budget_bytes'] else "no limit"
+        st.caption(f"Estates: {estate_stats['loaded']}/{estate_stats['estates']} loaded, "
+                   f"{estate_stats['bytes'] / 2**20:,.1f} MiB of data (budget {budget}), "
+                   f"{estate_stats['evictions']} unloaded so far")
+        st.dataframe(cache_table(REGISTRY.cache_stats()), use_container_width=True, hide_index=True)
+        st.markdown("**Prometheus metrics**")
+        port = start_metrics_endpoint()
+        if port:
+            st.caption(f"Scrape http://127.0.0.1:{port}/metrics")
+        st.code(REGISTRY.render(), language='text')
+
+def style_overview(overview):
+    """Styler of the monthly overview table"""
+    return overview.style.format({
+        'To_Be': '₹{:,.2f}',
+        'Received': '₹{:,.2f}',
+        'Difference': '₹{:,.2f}',
+        'Expense': '₹{:,.2f}'
+    }).set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
+    ])
+
+def style_extra_income(breakdown_display):
+    """Styler of the extra income breakdown table"""
+    return breakdown_display.style.format({
+        'NBH': '₹{:,.2f}',
+        'Lift': '₹{:,.2f}',
+        'Event': '₹{:,.2f}',
+        'Scrap': '₹{:,.2f}',
+        'Parking_Fine': '₹{:,.2f}',
+        'Total': '₹{:,.2f}'
+    }).set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
+    ])
+
+def style_wing_table(wing_shop_display):
+    """Styler of one wing/shop's monthly breakdown"""
+    def color_wing_shop_difference(val):
+        if val < 0:
+            return 'background-color: #ccffcc; font-weight: bold'  # Green for excess
+        elif val > 0:
+            return 'background-color: #ffcccc; font-weight: bold'  # Red for pending
+        else:
+            return 'background-color: #ffffcc'  # Yellow for zero
     
-    # Filter by month
-    month_vendors = df_vendors[df_vendors['Month'] == month].copy()
+    styled_wing_shop_df = wing_shop_display[['Month', 'To Be Received', 'Actual Received', 'Fine_Details', PENDING_COLUMN]].style.format({
+        'To Be Received': '₹{:,.2f}',
+        'Actual Received': '₹{:,.2f}',
+        PENDING_COLUMN: '₹{:,.2f}'
+    }).map(color_wing_shop_difference, subset=[PENDING_COLUMN])
     
-    if month_vendors.empty:
-        return None
+    return styled_wing_shop_df.set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold'), ('font-size', '1.1rem'), ('padding', '12px')]},
+        {'selector': 'td', 'props': [('padding', '10px'), ('font-size', '1rem')]}
+    ])
+
+# Light blue, orange, green, pink, purple - cycling for longer ledgers
+DETAIL_MONTH_COLORS = np.array(['#e6f2ff', '#fff4e6', '#e6ffe6', '#ffe6f2', '#f2e6ff'], dtype=object)
+DETAIL_COLUMNS = ['Wing', 'Month', 'To Be Received', 'Actual Received', 'Difference']
+DETAIL_PAGE_SIZES = [25, 50, 100, 250]
+
+def detail_column_config():
+    """Number formatting and alignment of the detail table, done by the browser instead of the Styler"""
+    rupees = st.column_config.NumberColumn(format='₹%,.2f', alignment='center')
+    text = st.column_config.TextColumn(alignment='center')
+    return {'Wing': text, 'Month': text, 'To Be Received': rupees, 'Actual Received': rupees, 'Difference': rupees}
+
+def style_detail(detailed_breakdown, periods=None):
+    """Styler of (a page of) the all-wings monthly details, with alternating month backgrounds
+
+    The CSS of every cell is built column-wise in one pass; periods (all periods of the
+    full table, sorted) keeps a month's color the same on every page.
+    """
+    if periods is None:
+        periods = np.sort(detailed_breakdown['Period'].unique())
+    color_index = np.searchsorted(periods, detailed_breakdown['Period'].to_numpy())
+    month_css = 'background-color: ' + DETAIL_MONTH_COLORS[color_index % len(DETAIL_MONTH_COLORS)]
+    # Difference color coding on top of month backgrounds: green for excess, red for pending
+    difference = detailed_breakdown['Difference'].to_numpy()
+    difference_css = np.where(difference < 0, 'background-color: #ccffcc; font-weight: bold',
+                              np.where(difference > 0, 'background-color: #ffcccc; font-weight: bold', month_css))
+    shown = detailed_breakdown[DETAIL_COLUMNS]
+    css = pd.DataFrame({column: month_css for column in DETAIL_COLUMNS}, index=shown.index)
+    css['Difference'] = difference_css
+    return shown.style.apply(lambda _: css, axis=None)
+
+def style_vendor_table(vendors):
+    """Styler of the vendor totals table"""
+    return vendors.style.format({
+        'Total': '₹{:,.2f}',
+        'Share': '{:.1%}',
+        'Last Month': '₹{:,.2f}',
+        'MoM Change': '₹{:+,.2f}'
+    }).set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
+    ])
+
+RISK_COLORS = {'High': 'background-color: #ffcccc; font-weight: bold', 'Medium': 'background-color: #fff3cd',
+               'Low': 'background-color: #ccffcc'}
+
+def style_forecast_table(forecast):
+    """Styler of the ranked collection forecast and risk table"""
+    return forecast.drop(columns='Period').style.format({
+        'Expected_To_Be': '₹{:,.2f}',
+        'Expected_Received': '₹{:,.2f}',
+        'Collection_Rate': '{:.1%}',
+        'Rolling_Rate': '{:.1%}',
+        'Outstanding': '₹{:,.2f}',
+        'Months_Outstanding': '{:.2f}',
+        'Risk_Score': '{:.1f}'
+    }, na_rep='–').map(RISK_COLORS.get, subset=['Risk']).set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
+    ])
+
+UNIT_SORT_COLUMNS = {'Pending': 'Difference', 'Risk score': 'Risk_Score', 'Months outstanding': 'Months_Outstanding',
+                     'To Be Received': 'To_Be', 'Actual Received': 'Received', 'Unit': 'Unit'}
+UNIT_PAGE_SIZES = [25, 50, 100, 250]
+
+def style_unit_list(units):
+    """Styler of a page of the unit list, or of one unit's months"""
+    def color_unit_difference(val):
+        if val < 0:
+            return 'background-color: #ccffcc'  # Green for excess
+        elif val > 0:
+            return 'background-color: #ffcccc; font-weight: bold'  # Red for pending
+        return ''
     
-    # Sort by amount
-    month_vendors = month_vendors.sort_values('Amount', ascending=False)
+    formats = {'To_Be': '₹{:,.2f}', 'Received': '₹{:,.2f}', 'Difference': '₹{:,.2f}', 'Months_Outstanding': '{:.2f}',
+               'Risk_Score': '{:.1f}'}
+    styled = units.style.format({column: fmt for column, fmt in formats.items() if column in units.columns},
+                                na_rep='–').map(color_unit_difference, subset=['Difference'])
+    # A unit's monthly rows carry no risk
+    if 'Risk' in units.columns:
+        styled = styled.map(lambda risk: RISK_COLORS.get(risk, ''), subset=['Risk'])
+    return styled.set_properties(**{
+        'text-align': 'center'
+    }).set_table_styles([
+        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
+    ])
+
+VENDOR_TOP_CHOICES = [5, 10, 15, 20]
+
+@st.fragment
+def vendor_section(data, date_range=None):
+    """All months in one stacked vendor chart plus the vendor totals; picking another top N reruns only this"""
+    vendors = data.cubes.get('vendors')
+    if vendors is None:
+        return
+    top = st.selectbox('Vendors shown', VENDOR_TOP_CHOICES, index=VENDOR_TOP_CHOICES.index(VENDOR_TOP_N),
+                       key='vendor_top')
+    start, end = date_range or (None, None)
+    # The prebuilt chart is the default top N over all months; others are built once per version and kept
+    variant = None if top == VENDOR_TOP_N and date_range is None else (top, start, end)
+    show_figure(data, 'vendors', 'vendors', variant,
+                lambda: create_vendor_chart(vendor_monthly(vendors, top, start, end)))
+    st.caption("Spelling variants of a vendor's name are counted together; MoM Change compares the last month "
+               "of the range with the month before.")
+    show_table('vendors', style_vendor_table, vendor_table(vendors, top, start, end), use_container_width=True,
+               hide_index=True)
+
+@st.fragment
+def wing_shop_section(data, date_range=None):
+    """Wing/Shop selectbox, summary metrics and monthly table; a new selection reruns only this"""
+    # Get unique wings and shops - sorted
+    wing_summary = data.wing_summary
+    all_wings_shops = list(wing_summary.index)
+
+    if all_wings_shops:
+        # Create columns for better layout
+        col1, col2 = st.columns([1, 3])
+
+        with col1:
+            selected_wing_shop = st.selectbox('Select a Wing/Shop:', all_wings_shops, key='wing_shop_filter')
+
+        with col2:
+            st.write("")  # Spacing
+
+        # Prebuilt monthly rows of the selected wing/shop, fines already deducted
+        wing_shop_display = data.wing_index.get(selected_wing_shop)
+        if wing_shop_display is not None and date_range is not None:
+            wing_shop_display = wing_shop_display[period_mask(wing_shop_display['Period'], *date_range)]
+
+        if wing_shop_display is not None and not wing_shop_display.empty:
+            if date_range is None:
+                summary = wing_summary.loc[selected_wing_shop]
+            else:
+                # Totals of the range, sliced from the wing rollup
+                summary = data.cubes['wings'].totals(*date_range, keys=[selected_wing_shop]).iloc[0].copy()
+                summary['Adjusted'] = summary['Difference'] - summary['Fines']
+
+            # Display metrics
+            st.subheader(f"📊 {selected_wing_shop} - Summary")
+
+            metric_cols = st.columns(4)
+
+            with metric_cols[0]:
+                st.metric("Total To Be Received", f"₹{summary['To_Be']:,.2f}")
+
+            with metric_cols[1]:
+                st.metric("Total Received", f"₹{summary['Received']:,.2f}")
+
+            with metric_cols[2]:
+                st.metric("Total Fines Deducted", f"₹{summary['Fines']:,.2f}")
+
+            # Adjusted difference (pending - fines)
+            adjusted_difference = summary['Adjusted']
+
+            with metric_cols[3]:
+                # Color code based on pending/excess (after deducting fines)
+                if adjusted_difference > 0:
+                    st.metric("Total Pending", f"₹{adjusted_difference:,.2f}", delta=None, 
+                             help="Amount still to be received after fines")
+                else:
+                    st.metric("Total Excess", f"₹{abs(adjusted_difference):,.2f}", delta=None,
+                             help="Amount received extra after fines")
+
+            # Display detailed breakdown
+            st.subheader(f"📋 {selected_wing_shop} - Monthly Breakdown")
+
+            show_table('wing', style_wing_table, wing_shop_display, use_container_width=True)
+            
+            # Flats/shops of the selection, when a unit register is loaded
+            if selected_wing_shop in data.wing_units:
+                unit_section(data, selected_wing_shop, date_range)
+        else:
+            st.warning(f"No data available for {selected_wing_shop}")
+
+@st.fragment
+def unit_section(data, wing, date_range=None):
+    """Paged units of one wing/shop, summed over the range from the unit rollup; sorting or paging reruns only this"""
+    st.subheader(f"🏠 {wing} - Units")
+    units = data.cubes['units']
+    start, end = date_range or (None, None)
+    rows = unit_list(units, data.unit_wings, data.unit_risk, data.wing_units[wing], start, end)
     
-    fig = go.Figure()
+    filter_cols = st.columns([2, 1, 2])
+    with filter_cols[0]:
+        sort_by = st.selectbox('Sort units by', list(UNIT_SORT_COLUMNS), key='unit_sort')
+    with filter_cols[1]:
+        # Largest dues and highest risk first; units by name
+        descending = st.toggle('Descending', value=True, key='unit_descending')
+    with filter_cols[2]:
+        pending_only = st.toggle('Only units with dues', key='unit_pending_only')
     
-    fig.add_trace(go.Bar(
-        x=month_vendors['Vendor'],
-        y=month_vendors['Amount'],
-        marker=dict(
-            color=month_vendors['Amount'],
-            colorscale='Viridis',
-            showscale=True,
-            colorbar=dict(title="Amount Paid")
-        ),
-        text=[f'₹{v:,.2f}' for v in month_vendors['Amount']],
-        textposition='outside',
-        hovertemplate='<b>%{x}</b><br>Amount: ₹%{y:,.2f}<extra></extra>'
-    ))
+    if pending_only:
+        rows = rows[rows['Difference'].to_numpy() > 0]
+    if rows.empty:
+        st.info("No units match the filters")
+        return
+    rows = rows.sort_values(UNIT_SORT_COLUMNS[sort_by], ascending=not descending, kind='stable',
+                            na_position='last', ignore_index=True)
     
-    # Set the year based on month
-    year = "2026" if month == "Jan" else "2025"
+    page_cols = st.columns([1, 1, 3])
+    with page_cols[0]:
+        page_size = st.selectbox('Units per page', UNIT_PAGE_SIZES, key='unit_page_size')
+    pages = -(-len(rows) // page_size)
+    with page_cols[1]:
+        # No key: another page count starts again at page 1 (the label keeps it apart from the detail pager)
+        page = st.number_input('Unit page', min_value=1, max_value=pages, value=1, step=1)
+    first = (page - 1) * page_size
+    with page_cols[2]:
+        st.caption(f"Units {first + 1:,}–{min(first + page_size, len(rows)):,} of {len(rows):,}"
+                   f" (page {page} of {pages}); risk is scored over all months")
     
-    fig.update_layout(
-        title=f'Vendor Expense Breakdown ({month} {year})',
-        xaxis_title='Vendor',
-        yaxis_title='Amount (INR)',
-        height=500,
-        plot_bgcolor='#E5ECF6',
-        yaxis=dict(tickprefix='₹', tickformat=',.2f')
-    )
+    page_rows = rows.iloc[first:first + page_size]
+    show_table('units', style_unit_list, page_rows, use_container_width=True, hide_index=True)
     
-    return fig
+    unit = st.selectbox('Monthly breakdown of unit', list(page_rows['Unit']), key='unit_months')
+    months = unit_months(units, unit, start, end)
+    months.insert(0, 'Month', [period_label(period) for period in months['Period']])
+    show_table('unit', style_unit_list, months.drop(columns='Period'), use_container_width=True, hide_index=True)
 
-def create_extra_income_chart(df_monthly):
-    """Extra Income Month-wise Bar Chart"""
-    fig = go.Figure()
+@st.fragment
+def detail_section(data, date_range=None):
+    """All wing/shop rows, filtered, sorted and paged on the server; only the page is styled and sent"""
+    detail = data.tables['detail']
+    range_periods = list(data.detail_periods)
+    if date_range is not None:
+        range_periods = [p for p, keep in zip(range_periods, period_mask(range_periods, *date_range)) if keep]
+    filter_cols = st.columns([3, 3, 2, 1])
+    with filter_cols[0]:
+        wings = st.multiselect('Wing/Shop', list(data.wing_summary.index), key='detail_wings')
+    with filter_cols[1]:
+        periods = st.multiselect('Month', range_periods, format_func=period_label, key='detail_periods')
+    with filter_cols[2]:
+        sort_by = st.selectbox('Sort by', list(DETAIL_SORT_COLUMNS), key='detail_sort')
+    with filter_cols[3]:
+        descending = st.toggle('Descending', key='detail_descending')
     
-    fig.add_trace(go.Bar(
-        x=df_monthly['Month'],
-        y=df_monthly['Extra_Income'],
-        marker_color='#FFA15A',
-        text=[f'₹{v:,.0f}' for v in df_monthly['Extra_Income']],
-        textposition='outside',
-        textfont=dict(size=12),
-        hovertemplate='<b>%{x}</b><br>Extra Income: ₹%{y:,.0f}<extra></extra>'
-    ))
+    if not periods and date_range is not None:
+        periods = range_periods
     
-    # Calculate max value for proper y-axis range
-    max_value = df_monthly['Extra_Income'].max()
+    # Sorted by month, then wing/shop unless another sort is picked
+    positions = detail_positions(detail, data.detail_orders, sort_by, descending, wings, periods)
+    if len(positions) == 0:
+        st.info("No rows match the filters")
+        return
     
-    fig.update_layout(
-        title='Extra Income by Month',
-        xaxis_title='Month',
-        yaxis_title='Amount (INR)',
-        height=420,
-        yaxis=dict(
-            tickprefix='₹', 
-            tickformat=',.0f',
-            range=[0, max_value * 1.15]  # Add 15% padding for text visibility
-        )
-    )
+    page_cols = st.columns([1, 1, 3])
+    with page_cols[0]:
+        page_size = st.selectbox('Rows per page', DETAIL_PAGE_SIZES, index=1, key='detail_page_size')
+    pages = -(-len(positions) // page_size)
+    with page_cols[1]:
+        # No key: a new page count (other filters) starts again at page 1
+        page = st.number_input('Page', min_value=1, max_value=pages, value=1, step=1)
+    with page_cols[2]:
+        first = (page - 1) * page_size
+        st.caption(f"Rows {first + 1:,}–{min(first + page_size, len(positions)):,} of {len(positions):,}"
+                   f" (page {page} of {pages})")
     
-    return fig
+    page_rows = detail_page(detail, positions, page, page_size)
+    show_table('detail', lambda rows: style_detail(rows, data.detail_periods), page_rows,
+               column_config=detail_column_config(), use_container_width=True)
 
-def create_combined_monthly_chart(df_monthly):
-    """Combined Month-wise Line Chart"""
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
-        x=df_monthly['Month'],
-        y=df_monthly['To_Be'],
-        mode='lines+markers',
-        name='To Be',
-        line=dict(color='#1f77b4', width=3),
-        marker=dict(size=10)
-    ))
-    
-    fig.add_trace(go.Scatter(
-        x=df_monthly['Month'],
-        y=df_monthly['Received'],
-        mode='lines+markers',
-        name='Received',
-        line=dict(color='#2ca02c', width=3),
-        marker=dict(size=10)
-    ))
+FORMAT_LABELS = {'csv': 'CSV', 'parquet': 'Parquet'}
+
+def download_reports(data):
+    """Download buttons for every table; files are written only when a button is clicked"""
+    stamp = datetime.now().strftime('%Y%m%d')
     
-    fig.add_trace(go.Scatter(
-        x=df_monthly['Month'],
-        y=df_monthly['Expense'],
-        mode='lines+markers',
-        name='Expenses (Total)',
-        line=dict(color='#EF553B', width=3),
-        marker=dict(size=10)
-    ))
+    def download(label, name, fmt, file_name):
+        # The callable runs on click; the file is kept for the data version (zen_dashboard.export)
+        st.download_button(label, functools.partial(EXPORTS.read, data, name, fmt), f"{file_name}_{stamp}.{fmt}",
+                           MIME_TYPES[fmt], on_click='ignore', key=f"download_{name}_{fmt}")
     
-    fig.update_layout(
-        title='Combined Month-wise — To Be, Received, Expenses',
-        xaxis_title='Month',
-        yaxis_title='Amount (INR)',
-        height=520,
-        yaxis=dict(tickprefix='₹', tickformat=',.0f')
-    )
+    st.caption("Files are prepared when clicked and reused until the data changes.")
+    col1, col2 = st.columns(2)
+    with col1:
+        download("📦 Everything (zip: CSV, Parquet and Excel)", ALL_TABLES, 'zip', 'zen_estate_report')
+    with col2:
+        download("📗 Everything (Excel workbook, one sheet per table)", ALL_TABLES, 'xlsx', 'zen_estate_report')
     
-    return fig
+    cols = st.columns(3)
+    for i, name in enumerate(export_tables(data)):
+        with cols[i % 3]:
+            label = EXPORT_TABLES[name]
+            for fmt in TABLE_FORMATS:
+                download(f"{label} ({FORMAT_LABELS[fmt]})", name, fmt, name)
 
-def create_wing_difference_chart(df_wings):
-    """Pending/Excess Amount by Wing/Shop"""
-    # Aggregate total difference per wing across all months
-    wing_totals = df_wings.groupby('Wing')['Difference'].sum().reset_index()
-    
-    # Flip the values for display (multiply by -1)
-    # So pending (positive) shows below, excess (negative) shows above
-    wing_totals['Display_Value'] = wing_totals['Difference'] * -1
+def main():
+    setup_page()
+    start_metrics_endpoint()
+    # Stages timed during this rerun, shown in the diagnostics panel
+    started = time.perf_counter()
+    rerun_trace = start_trace()
     
-    # Create color array: Positive original = RED (pending), Negative original = GREEN (excess)
-    colors = []
-    for diff in wing_totals['Difference']:
-        if diff > 0:
-            colors.append('#d62728')  # Red for pending (positive means money owed)
-        elif diff < 0:
-            colors.append('#2ca02c')  # Green for excess (negative means overpaid)
-        else:
-            colors.append('#9e9e9e')  # Gray
+    estate = current_estate()
+    if estate not in config.ESTATES:
+        st.error(f"❌ Unknown estate '{estate}'. Available estates: {', '.join(config.ESTATES)}")
+        finish_trace('rerun')
+        return
     
-    fig = go.Figure()
+    # Auto-load data from GitHub (no upload needed)
+    progress_bar = st.empty()
     
-    fig.add_trace(go.Bar(
-        x=wing_totals['Wing'],
-        y=wing_totals['Display_Value'],  # Use flipped values
-        marker_color=colors,
-        text=[f'₹{v:,.2f}' for v in wing_totals['Difference']],  # Show original values in labels
-        textposition='outside',
-        hovertemplate='<b>%{x}</b><br>Difference: ₹%{text}<extra></extra>',
-        customdata=wing_totals['Difference']
-    ))
+    def show_progress(done, total, source):
+        name = os.path.basename(source.rstrip('/')) or source
+        progress_bar.progress(done / total, text=f"Loaded {name} ({done}/{total})")
     
-    fig.update_layout(
-        title='Pending (red) / Excess (green)',
-        xaxis_title='Wing / Shop',
-        yaxis_title='Amount (INR)',
-        height=520,
-        plot_bgcolor='#E5ECF6',
-        yaxis=dict(tickprefix='₹', tickformat=',.2f'),
-        margin=dict(t=48, r=24, b=96, l=56)
-    )
+    # Read the version once, so a refresh finishing mid-render cannot mix old and new data
+    data = load_excel_from_github(show_progress, estate)
+    progress_bar.empty()
+    if data is not None:
+        df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines = data.frames
+        tables = data.tables
+    else:
+        df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines = (pd.DataFrame(),) * 5
+        tables = {}
     
-    return fig
-
-def main():
-    st.markdown('<h1 class="main-header">🏢 Zen Estate Financial Dashboard (Sep 2025 – Jan 2026)</h1>', unsafe_allow_html=True)
+    if not df_monthly.empty:
+        date_range = f"{period_label(df_monthly['Period'].iloc[0])} – {period_label(df_monthly['Period'].iloc[-1])}"
+        st.markdown(f'<h1 class="main-header">🏢 Zen Estate Financial Dashboard ({date_range})</h1>', unsafe_allow_html=True)
+    else:
+        st.markdown('<h1 class="main-header">🏢 Zen Estate Financial Dashboard</h1>', unsafe_allow_html=True)
     
-    # Auto-load data from GitHub (no upload needed)
-    with st.spinner('Loading latest data from repository...'):
-        df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines = load_excel_from_github()
+    if data is not None:
+        refresher = get_refresher(estate)
+        status_col, button_col = st.columns([5, 1])
+        with status_col:
+            as_of = datetime.fromtimestamp(data.checked_at).strftime('%d %b %Y %H:%M:%S')
+            # Several estates share this server; name the one shown
+            shown = f"Estate {estate}, data" if len(config.ESTATES) > 1 else "Data"
+            st.caption(f"{shown} as of {as_of} (version {data.number})")
+            if refresher.last_error is not None:
+                st.warning(f"Latest refresh failed, showing the last good data: {refresher.last_error}")
+        with button_col:
+            if st.button("🔄 Refresh data", use_container_width=True):
+                refresher.request_refresh()
+                st.toast("Refreshing in the background - reload the page in a moment to see new data")
     
     if not df_monthly.empty:
+            # Every section below shows only the months in the range (None: all of them)
+            date_range = select_date_range(df_monthly['Period'])
+            
             # Monthly Overview Table
             st.markdown("""
                 <div style='background: linear-gradient(90deg, #1f77b4 0%, #2ca02c 100%); 
@@ -418,60 +625,48 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             
-            overview_data = df_monthly.copy()
-            overview_data['Difference'] = overview_data['To_Be'] - overview_data['Received']
+            # Derived tables and figures come prebuilt with the data version
+            overview = tables['overview']
+            if date_range is not None:
+                overview = overview[period_mask(df_monthly['Period'], *date_range)]
+            show_table('overview', style_overview, overview, use_container_width=True)
             
-            st.dataframe(
-                overview_data[['Month', 'To_Be', 'Received', 'Difference', 'Expense']].style.format({
-                    'To_Be': '₹{:,.2f}',
-                    'Received': '₹{:,.2f}',
-                    'Difference': '₹{:,.2f}',
-                    'Expense': '₹{:,.2f}'
-                }).set_properties(**{
-                    'text-align': 'center'
-                }).set_table_styles([
-                    {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
-                ]),
-                use_container_width=True
-            )
+            # Next month's collections and arrears risk, forecast from all months once per data version
+            forecast = tables.get('forecast')
+            if forecast is not None and not forecast.empty:
+                st.markdown("""
+                    <div style='background: linear-gradient(90deg, #1f77b4 0%, #9467bd 100%); 
+                                color: white; padding: 12px; border-radius: 8px; 
+                                font-size: 1.4rem; font-weight: bold; margin-top: 1.5rem; margin-bottom: 1rem;
+                                box-shadow: 0 3px 5px rgba(0,0,0,0.1);'>
+                        🔮 Collection Forecast & Arrears Risk
+                    </div>
+                """, unsafe_allow_html=True)
+                # The projection continues the last billed month, so it is drawn only while the range includes it
+                last_billed = df_monthly.loc[df_monthly['To_Be'] > 0, 'Period'].max()
+                show_figure(data, 'monthly', 'monthly', date_range,
+                            lambda: create_combined_monthly_chart(
+                                df_monthly[period_mask(df_monthly['Period'], *date_range)],
+                                forecast if date_range[1] >= last_billed else None))
+                st.caption(f"Forecast for {period_label(forecast['Period'].iloc[0])} from all months: "
+                           "billing trend × smoothed collection rate per wing/shop, highest risk first. "
+                           "Outstanding is after fines.")
+                show_table('forecast', style_forecast_table, forecast, use_container_width=True, hide_index=True)
             
             st.markdown("---")
             
-            # Vendor Breakdown - 5 separate charts for each month
+            # Vendor Breakdown - one chart per month
             if not df_vendors.empty:
                 st.markdown("""
                     <div style='background: linear-gradient(90deg, #ff7f0e 0%, #d62728 100%); 
                                 color: white; padding: 15px; border-radius: 10px; 
                                 font-size: 1.8rem; font-weight: bold; margin-top: 2rem; margin-bottom: 1rem;
                                 box-shadow: 0 4px 6px rgba(0,0,0,0.1);'>
-                        💼 Vendor Expense Breakdown (Month-wise)
+                        💼 Vendor Expenses (Month-wise)
                     </div>
                 """, unsafe_allow_html=True)
                 
-                # September
-                fig_sep = create_vendor_breakdown(df_vendors, 'Sep')
-                if fig_sep:
-                    st.plotly_chart(fig_sep, use_container_width=True)
-                
-                # October
-                fig_oct = create_vendor_breakdown(df_vendors, 'Oct')
-                if fig_oct:
-                    st.plotly_chart(fig_oct, use_container_width=True)
-                
-                # November
-                fig_nov = create_vendor_breakdown(df_vendors, 'Nov')
-                if fig_nov:
-                    st.plotly_chart(fig_nov, use_container_width=True)
-                
-                # December
-                fig_dec = create_vendor_breakdown(df_vendors, 'Dec')
-                if fig_dec:
-                    st.plotly_chart(fig_dec, use_container_width=True)
-                
-                # January
-                fig_jan = create_vendor_breakdown(df_vendors, 'Jan')
-                if fig_jan:
-                    st.plotly_chart(fig_jan, use_container_width=True)
+                vendor_section(data, date_range)
             
             # Extra Income
             st.markdown("""
@@ -482,9 +677,8 @@ def main():
                     💰 Extra Income (Month-wise)
                 </div>
             """, unsafe_allow_html=True)
-            fig2 = create_extra_income_chart(df_monthly)
-            if fig2:
-                st.plotly_chart(fig2, use_container_width=True)
+            show_figure(data, 'extra_income', 'extra_income', date_range,
+                        lambda: create_extra_income_chart(df_monthly[period_mask(df_monthly['Period'], *date_range)]))
             
             # Extra Income Breakdown by Source
             if not df_extra_income_breakdown.empty:
@@ -497,28 +691,12 @@ def main():
                     </div>
                 """, unsafe_allow_html=True)
                 
-                # Create a formatted dataframe
-                breakdown_display = df_extra_income_breakdown.copy()
-                
-                # Add total column (including Parking_Fine)
-                breakdown_display['Total'] = breakdown_display[['NBH', 'Lift', 'Event', 'Scrap', 'Parking_Fine']].sum(axis=1)
+                breakdown_display = tables['extra_income']
+                if date_range is not None:
+                    breakdown_display = breakdown_display[period_mask(df_extra_income_breakdown['Period'], *date_range)]
                 
                 # Display as table
-                st.dataframe(
-                    breakdown_display.style.format({
-                        'NBH': '₹{:,.2f}',
-                        'Lift': '₹{:,.2f}',
-                        'Event': '₹{:,.2f}',
-                        'Scrap': '₹{:,.2f}',
-                        'Parking_Fine': '₹{:,.2f}',
-                        'Total': '₹{:,.2f}'
-                    }).set_properties(**{
-                        'text-align': 'center'
-                    }).set_table_styles([
-                        {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold')]}
-                    ]),
-                    use_container_width=True
-                )
+                show_table('extra_income', style_extra_income, breakdown_display, use_container_width=True)
             
             # Wing/Shop Analysis
             st.markdown("""
@@ -530,9 +708,8 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             if not df_wings.empty:
-                fig4 = create_wing_difference_chart(df_wings)
-                if fig4:
-                    st.plotly_chart(fig4, use_container_width=True)
+                show_figure(data, 'wing_difference', 'wing_difference', date_range,
+                            lambda: create_wing_difference_chart(data.cubes['wings'], *date_range))
             
             # Wing/Shop Filter Section
             st.markdown("""
@@ -545,140 +722,7 @@ def main():
             """, unsafe_allow_html=True)
             
             if not df_wings.empty:
-                # Get unique wings and shops - sorted
-                all_wings_shops = sorted(df_wings['Wing'].unique())
-                
-                if all_wings_shops:
-                    # Create columns for better layout
-                    col1, col2 = st.columns([1, 3])
-                    
-                    with col1:
-                        selected_wing_shop = st.selectbox('Select a Wing/Shop:', all_wings_shops, key='wing_shop_filter')
-                    
-                    with col2:
-                        st.write("")  # Spacing
-                    
-                    # Filter data for selected wing/shop
-                    wing_shop_data = df_wings[df_wings['Wing'] == selected_wing_shop].copy()
-                    
-                    if not wing_shop_data.empty:
-                        # Calculate totals
-                        total_to_be = wing_shop_data['To_Be'].sum()
-                        total_received = wing_shop_data['Received'].sum()
-                        total_difference = wing_shop_data['Difference'].sum()
-                        
-                        # Get fine data for selected wing (ONLY if it's a Wing, NOT a Shop)
-                        wing_shop_fines = pd.DataFrame()
-                        total_fines = 0
-                        if 'Shop' not in selected_wing_shop:
-                            # This is a Wing, get its fine data
-                            wing_shop_fines = df_fines[df_fines['Wing'] == selected_wing_shop].copy() if not df_fines.empty else pd.DataFrame()
-                            if not wing_shop_fines.empty:
-                                total_fines = wing_shop_fines['Total_Fine'].sum()
-                        
-                        # Display metrics
-                        st.subheader(f"📊 {selected_wing_shop} - Summary")
-                        
-                        metric_cols = st.columns(4)
-                        
-                        with metric_cols[0]:
-                            st.metric("Total To Be Received", f"₹{total_to_be:,.2f}")
-                        
-                        with metric_cols[1]:
-                            st.metric("Total Received", f"₹{total_received:,.2f}")
-                        
-                        with metric_cols[2]:
-                            st.metric("Total Fines Deducted", f"₹{total_fines:,.2f}")
-                        
-                        # Calculate adjusted difference (pending - fines)
-                        adjusted_difference = total_difference - total_fines
-                        
-                        with metric_cols[3]:
-                            # Color code based on pending/excess (after deducting fines)
-                            if adjusted_difference > 0:
-                                st.metric("Total Pending", f"₹{adjusted_difference:,.2f}", delta=None, 
-                                         help="Amount still to be received after fines")
-                            else:
-                                st.metric("Total Excess", f"₹{abs(adjusted_difference):,.2f}", delta=None,
-                                         help="Amount received extra after fines")
-                        
-                        # Display detailed breakdown
-                        st.subheader(f"📋 {selected_wing_shop} - Monthly Breakdown")
-                        
-                        wing_shop_display = wing_shop_data.copy()
-                        # Sort by month chronologically (Sep, Oct, Nov, Dec, Jan)
-                        month_order = {'Sep': 1, 'Oct': 2, 'Nov': 3, 'Dec': 4, 'Jan': 5}
-                        wing_shop_display['month_sort'] = wing_shop_display['Month'].map(month_order)
-                        wing_shop_display = wing_shop_display.sort_values('month_sort')
-                        wing_shop_display = wing_shop_display.drop('month_sort', axis=1)
-                        
-                        wing_shop_display = wing_shop_display.rename(columns={
-                            'To_Be': 'To Be Received',
-                            'Received': 'Actual Received',
-                            'Difference': 'Pending/Excess (-ve = Excess)'
-                        })
-                        
-                        # Add Fine_Details column (only if this is a Wing with fine data)
-                        wing_shop_display['Fine_Details'] = '-'
-                        wing_shop_display['Fine_Amount'] = 0.0
-                        
-                        if not wing_shop_fines.empty:
-                            for idx, row in wing_shop_display.iterrows():
-                                month = row['Month']
-                                fine_month_data = wing_shop_fines[wing_shop_fines['Month'] == month]
-                                if not fine_month_data.empty:
-                                    fine_row = fine_month_data.iloc[0]
-                                    hk = float(fine_row['HK']) if pd.notna(fine_row['HK']) else 0
-                                    quinteze = float(fine_row['Quinteze']) if pd.notna(fine_row['Quinteze']) else 0
-                                    security = float(fine_row['Security']) if pd.notna(fine_row['Security']) else 0
-                                    stp = float(fine_row['STP']) if pd.notna(fine_row['STP']) else 0
-                                    
-                                    total_month_fine = hk + quinteze + security + stp
-                                    
-                                    fine_details_list = []
-                                    if hk > 0:
-                                        fine_details_list.append(f"HK: ₹{hk:,.0f}")
-                                    if quinteze > 0:
-                                        fine_details_list.append(f"Q: ₹{quinteze:,.0f}")
-                                    if security > 0:
-                                        fine_details_list.append(f"Sec: ₹{security:,.0f}")
-                                    if stp > 0:
-                                        fine_details_list.append(f"STP: ₹{stp:,.0f}")
-                                    if fine_details_list:
-                                        wing_shop_display.at[idx, 'Fine_Details'] = ' | '.join(fine_details_list)
-                                        wing_shop_display.at[idx, 'Fine_Amount'] = total_month_fine
-                        
-                        # Calculate adjusted pending/excess after deducting fines
-                        wing_shop_display['Pending/Excess (-ve = Excess)'] = wing_shop_display['Pending/Excess (-ve = Excess)'] - wing_shop_display['Fine_Amount']
-                        
-                        # Style the dataframe
-                        def color_wing_shop_difference(val):
-                            if val < 0:
-                                return 'background-color: #ccffcc; font-weight: bold'  # Green for excess
-                            elif val > 0:
-                                return 'background-color: #ffcccc; font-weight: bold'  # Red for pending
-                            else:
-                                return 'background-color: #ffffcc'  # Yellow for zero
-                        
-                        styled_wing_shop_df = wing_shop_display[['Month', 'To Be Received', 'Actual Received', 'Fine_Details', 'Pending/Excess (-ve = Excess)']].style.format({
-                            'To Be Received': '₹{:,.2f}',
-                            'Actual Received': '₹{:,.2f}',
-                            'Pending/Excess (-ve = Excess)': '₹{:,.2f}'
-                        }).applymap(color_wing_shop_difference, subset=['Pending/Excess (-ve = Excess)'])
-                        
-                        styled_wing_shop_df = styled_wing_shop_df.set_properties(**{
-                            'text-align': 'center'
-                        }).set_table_styles([
-                            {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold'), ('font-size', '1.1rem'), ('padding', '12px')]},
-                            {'selector': 'td', 'props': [('padding', '10px'), ('font-size', '1rem')]}
-                        ])
-                        
-                        st.dataframe(
-                            styled_wing_shop_df,
-                            use_container_width=True
-                        )
-                    else:
-                        st.warning(f"No data available for {selected_wing_shop}")
+                wing_shop_section(data, date_range)
             
             # Detailed Wing/Shop Monthly Breakdown Table
             st.markdown("""
@@ -690,114 +734,14 @@ def main():
                 </div>
             """, unsafe_allow_html=True)
             if not df_wings.empty:
-                st.markdown("**Monthly breakdown showing To Be Received, Actual Received, and Difference for each Wing/Shop** *(Sorted by Wing/Shop name)*")
-                
-                # Format the dataframe for better display
-                detailed_breakdown = df_wings.copy()
-                
-                # Create a custom sort order for months
-                month_order = {'Sep': 1, 'Oct': 2, 'Nov': 3, 'Dec': 4, 'Jan': 5}
-                detailed_breakdown['Month_Sort'] = detailed_breakdown['Month'].map(month_order)
-                
-                # Sort by Month FIRST (chronologically), then Wing (alphabetically)
-                # This groups all Wings/Shops for each month together
-                detailed_breakdown = detailed_breakdown.sort_values(['Month_Sort', 'Wing'])
-                
-                # Remove the helper column
-                detailed_breakdown = detailed_breakdown.drop('Month_Sort', axis=1)
-                
-                # Reset index to show sequential numbering starting from 0
-                detailed_breakdown = detailed_breakdown.reset_index(drop=True)
-                
-                # Rename columns for clarity
-                detailed_breakdown = detailed_breakdown.rename(columns={
-                    'To_Be': 'To Be Received',
-                    'Received': 'Actual Received'
-                })
-                
-                # Create a function to apply alternating month backgrounds
-                def highlight_months(row):
-                    month = row['Month']
-                    # Assign background colors based on month
-                    if month == 'Sep':
-                        return ['background-color: #e6f2ff'] * len(row)  # Light blue
-                    elif month == 'Oct':
-                        return ['background-color: #fff4e6'] * len(row)  # Light orange
-                    elif month == 'Nov':
-                        return ['background-color: #e6ffe6'] * len(row)  # Light green
-                    elif month == 'Dec':
-                        return ['background-color: #ffe6f2'] * len(row)  # Light pink
-                    elif month == 'Jan':
-                        return ['background-color: #f2e6ff'] * len(row)  # Light purple
-                    else:
-                        return [''] * len(row)
-                
-                # Apply styling
-                styled_df = detailed_breakdown[['Wing', 'Month', 'To Be Received', 'Actual Received', 'Difference']].style.format({
-                    'To Be Received': '₹{:,.2f}',
-                    'Actual Received': '₹{:,.2f}',
-                    'Difference': '₹{:,.2f}'
-                }).apply(highlight_months, axis=1)
-                
-                # Apply difference color coding on top of month backgrounds
-                def color_difference(val):
-                    if val < 0:
-                        return 'background-color: #ccffcc; font-weight: bold'  # Green for excess
-                    elif val > 0:
-                        return 'background-color: #ffcccc; font-weight: bold'  # Red for pending
-                    else:
-                        return ''
-                
-                styled_df = styled_df.applymap(color_difference, subset=['Difference'])
-                
-                # Add center alignment and header styling
-                styled_df = styled_df.set_properties(**{
-                    'text-align': 'center'
-                }).set_table_styles([
-                    {'selector': 'th', 'props': [('text-align', 'center'), ('background-color', '#1f77b4'), ('color', 'white'), ('font-weight', 'bold'), ('font-size', '1.1rem'), ('padding', '12px')]},
-                    {'selector': 'td', 'props': [('padding', '10px'), ('font-size', '1rem')]}
-                ])
-                
-                # Display the table
-                st.dataframe(
-                    styled_df,
-                    use_container_width=True,
-                    height=600
-                )
+                st.markdown("**Monthly breakdown showing To Be Received, Actual Received, and Difference for each Wing/Shop** *(By month, then Wing/Shop; choose another column under Sort by)*")
+                detail_section(data, date_range)
             
             # Download Reports
             st.markdown("---")
             st.markdown("### 📥 Download Reports")
             
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                csv_monthly = df_monthly.to_csv(index=False)
-                st.download_button(
-                    "📊 Monthly Summary (CSV)",
-                    csv_monthly,
-                    f"monthly_summary_{datetime.now().strftime('%Y%m%d')}.csv",
-                    "text/csv"
-                )
-            
-            with col2:
-                csv_wings = df_wings.to_csv(index=False)
-                st.download_button(
-                    "🏘️ Wing Data (CSV)",
-                    csv_wings,
-                    f"wing_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                    "text/csv"
-                )
-            
-            with col3:
-                if not df_vendors.empty:
-                    csv_vendors = df_vendors.to_csv(index=False)
-                    st.download_button(
-                        "💼 Vendor Data (CSV)",
-                        csv_vendors,
-                        f"vendor_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                        "text/csv"
-                    )
+            download_reports(data)
     else:
         st.warning("⚠️ No data found")
     
@@ -805,6 +749,15 @@ def main():
     if df_monthly.empty:
         st.error("❌ Unable to load data from repository")
         st.info("Please ensure the Excel file is committed to the GitHub repository.")
+    
+    finish_trace('rerun')
+    show_diagnostics(rerun_trace, started)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['build-snapshot']:
+        sys.exit(build_snapshot_main(sys.argv[2:]))
+    if sys.argv[1:2] == ['build-report']:
+        sys.exit(build_report_main(sys.argv[2:]))
+    if sys.argv[1:2] == ['import-ledger']:
+        sys.exit(import_ledger_main(sys.argv[2:]))
     main()
@@ -0,0 +1,105 @@
+"""Query latency of the ledger stores against loading the workbook, on a multi-year ledger.
+
+    python benchmarks/bench_backends.py [--months 240] [--repeat 10] [--output results.json]
+
+Writes a synthetic workbook of ``--months`` months (see ``synthetic.py``),
+imports it into a SQLite and a Parquet ledger, and times the same queries
+four ways: loading the workbook (from its parsed snapshot, as a restart does)
+then filtering with pandas, filtering frames already in memory, an indexed
+SQLite query, and a filtered Parquet read.  The queries are one wing over the
+last 12 months, every frame over the last 12 months (what ``ZEN_HISTORY_MONTHS=12``
+loads), one vendor over all months, and the whole ledger.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from zen_dashboard.ingest import ingest_workbooks  # noqa: E402
+from zen_dashboard.ledger import FILTER_COLUMNS, ParquetLedger, SQLiteLedger  # noqa: E402
+from zen_dashboard.snapshot import FRAME_NAMES  # noqa: E402
+
+
+def pandas_query(frames, start=None, wings=None, vendors=None):
+    """The ledger read() done on loaded frames with boolean masks"""
+    result = []
+    for name, frame in zip(FRAME_NAMES, frames):
+        mask = frame['Period'] >= start if start is not None else frame['Period'].notna()
+        keys = vendors if name == 'vendors' else wings
+        if keys is not None and name in FILTER_COLUMNS:
+            mask &= frame[FILTER_COLUMNS[name]].isin(keys)
+        result.append(frame[mask.to_numpy()])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=240)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore')
+
+    tmp = tempfile.mkdtemp(prefix='zen-bench-backends-')
+    workbook = os.path.join(tmp, 'ledger.xlsx')
+    subprocess.run([sys.executable, os.path.join(HERE, 'synthetic.py'), workbook, '--months', str(args.months)],
+                   check=True, stdout=subprocess.DEVNULL)
+    os.environ['ZEN_CACHE_DIR'] = os.path.join(tmp, 'cache')
+
+    start = time.perf_counter()
+    frames, blocks = ingest_workbooks(workbook, max_workers=1, with_layout=True)
+    parse_s = time.perf_counter() - start
+    sqlite, parquet = SQLiteLedger(os.path.join(tmp, 'ledger.sqlite')), ParquetLedger(os.path.join(tmp, 'parquet'))
+    imports = {}
+    for name, ledger in (('sqlite', sqlite), ('parquet', parquet)):
+        start = time.perf_counter()
+        ledger.write(frames, blocks)
+        imports[name] = time.perf_counter() - start
+
+    periods = sorted(frames[0]['Period'].astype(str))
+    last_year = periods[max(0, len(periods) - 12)]
+    wing = str(frames[1]['Wing'].iloc[0])
+    vendor = str(frames[2]['Vendor'].iloc[0])
+    queries = [
+        (f"one wing ({wing}), last 12 months", dict(start=last_year, wings=[wing])),
+        ('all frames, last 12 months', dict(start=last_year)),
+        (f"one vendor ({vendor}), all months", dict(vendors=[vendor])),
+        ('whole ledger', {}),
+    ]
+    sources = [
+        ('workbook load + pandas', lambda q: pandas_query(ingest_workbooks(workbook, max_workers=1), **q)),
+        ('in-memory pandas', lambda q: pandas_query(frames, **q)),
+        ('sqlite (indexed)', lambda q: sqlite.read(**q)),
+        ('parquet (filtered)', lambda q: parquet.read(**q)),
+    ]
+    print(f"{args.months} months, {sum(len(frame) for frame in frames):,} rows; workbook parse {parse_s:.2f} s, "
+          f"import into sqlite {imports['sqlite']:.2f} s, parquet {imports['parquet']:.2f} s\n")
+
+    report = {'commit': git_commit(), 'months': args.months, 'parse_s': parse_s, 'import_s': imports, 'results': []}
+    for query, kwargs in queries:
+        print(f"{query}: {sum(len(frame) for frame in sqlite.read(**kwargs)):,} rows")
+        print(f"  {'source':<28}{'min ms':>12}{'median ms':>12}")
+        for source, fn in sources:
+            times = time_case(lambda: fn(kwargs), args.repeat)
+            report['results'].append({'query': query, 'source': source, 'min_s': min(times),
+                                      'median_s': statistics.median(times)})
+            print(f"  {source:<28}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Figure JSON size and build time of the time series charts as the number of points grows.
+
+    python benchmarks/bench_charts.py [--points 12,120,1000,10000,100000,1000000] [--repeat 3]
+                                      [--output results.json]
+
+Builds a collection series over ten years (a Date column with To_Be,
+Received, Expense and Extra_Income; daily at 3,653 points) of each length and times ``create_combined_monthly_chart``
+and ``create_extra_income_chart`` plus ``to_json()``, which is what a data
+version stores and Streamlit sends to the browser.  Each is run with the
+default ``ZEN_CHART_MAX_POINTS`` (downsampled, WebGL lines beyond
+``WEBGL_POINTS``) and with ``max_points=0``, where every point is sent.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from zen_dashboard import charts, config  # noqa: E402
+
+
+def daily_series(points, seed=0):
+    rng = np.random.default_rng(seed)
+    days = np.arange(points) * 3653 // points
+    # Bills fall due at the start of each month; collections trail them
+    to_be = np.where(days % 30 < 3, rng.uniform(50_000, 80_000, points), rng.uniform(0, 2_000, points))
+    return pd.DataFrame({
+        'Date': pd.date_range('2015-01-01', '2024-12-31', periods=points),
+        'To_Be': np.round(to_be, 2),
+        'Received': np.round(to_be * rng.uniform(0.7, 1.05, points), 2),
+        'Expense': np.round(rng.gamma(2.0, 20_000, points), 2),
+        'Extra_Income': np.round(rng.exponential(800, points) * (rng.random(points) < 0.3), 2),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', default='12,120,1000,10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)
+
+    report = {'commit': git_commit(), 'max_points': config.CHART_MAX_POINTS, 'results': []}
+    print(f"default max_points {config.CHART_MAX_POINTS}, WebGL beyond {charts.WEBGL_POINTS} points per line\n")
+    print(f"{'chart':<32}{'points':>10}{'mode':>14}{'median ms':>12}{'JSON KiB':>12}{'trace':>12}")
+    for points in [int(p) for p in args.points.split(',') if p.strip()]:
+        frame = daily_series(points)
+        for name, build in (('create_combined_monthly_chart', charts.create_combined_monthly_chart),
+                            ('create_extra_income_chart', charts.create_extra_income_chart)):
+            for mode, max_points in (('downsampled', None), ('all points', 0)):
+                if mode == 'all points' and config.CHART_MAX_POINTS and points <= config.CHART_MAX_POINTS:
+                    continue  # the same figure as downsampled
+                times = time_case(lambda: build(frame, max_points=max_points).to_json(), args.repeat)
+                figure = build(frame, max_points=max_points)
+                size = len(figure.to_json())
+                report['results'].append({'name': name, 'points': points, 'mode': mode, 'trace': figure.data[0].type,
+                                          'min_s': min(times), 'median_s': statistics.median(times),
+                                          'json_bytes': size})
+                print(f"{name:<32}{points:>10,}{mode:>14}{statistics.median(times) * 1000:12.1f}"
+                      f"{size / 1024:12,.1f}{figure.data[0].type:>12}")
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
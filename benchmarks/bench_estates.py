@@ -0,0 +1,145 @@
+"""Load test: 20 estates served from one process, with and without a cache budget.
+
+    python benchmarks/bench_estates.py [--estates 20] [--months 60] [--requests 400]
+                                       [--budgets 0,16] [--output results.json]
+
+Writes one synthetic ledger per estate (different sizes and seeds), then for
+every budget (MiB, 0 = no limit) starts a fresh process that serves
+``--requests`` page views the way the app does: ``EstateRegistry.refresher``
+for an estate picked with a skewed distribution (a few busy estates, a long
+tail), wait for its data version, load its wing chart through the figure
+cache and build its wing index.  The process RSS is sampled after every view.
+Without a budget every estate viewed stays loaded and RSS grows with the
+number of estates; with one, the least recently viewed estates are unloaded
+and RSS levels off.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit  # noqa: E402
+
+
+def rss_bytes():
+    """Current resident set size (peak on systems without /proc)"""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def write_estates(directory, estates, months):
+    """{estate id: workbook path}, written by a separate process so this one stays small"""
+    paths = {}
+    for i in range(estates):
+        estate = f"estate{i + 1:02d}"
+        paths[estate] = os.path.join(directory, f"{estate}.xlsx")
+        # Estates differ in size: from half to one and a half times --months
+        size = max(3, months // 2 + (months * i) // max(1, estates - 1))
+        subprocess.run([sys.executable, os.path.join(HERE, 'synthetic.py'), paths[estate], '--months', str(size),
+                        '--seed', str(i)], check=True, stdout=subprocess.DEVNULL)
+    return paths
+
+
+def serve(args):
+    """Child process: the page views for one budget; prints a JSON report"""
+    import numpy as np
+
+    warnings.simplefilter('ignore')
+    from streamlit import logger
+    logger.set_log_level('error')
+    import app
+    from zen_dashboard import config
+    from zen_dashboard.estates import EstateRegistry
+    from zen_dashboard.figures import FIGURES
+
+    registry = EstateRegistry(app.load_latest_data, config.ESTATES, interval=3600,
+                              budget_bytes=int(args.budget_mb * 1024 * 1024))
+    estates = list(config.ESTATES)
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, len(estates) + 1)
+    picks = rng.choice(len(estates), size=args.requests, p=weights / weights.sum())
+    baseline = rss_bytes()
+    samples, waits = [], []
+    for i, pick in enumerate(picks):
+        estate = estates[pick]
+        start = time.perf_counter()
+        data = registry.refresher(estate).wait_for_data()
+        FIGURES.get((data.key, 'wing_difference'), data.figures['wing_difference'])
+        data.wing_index
+        waits.append(time.perf_counter() - start)
+        stats = registry.stats()
+        samples.append({'request': i + 1, 'estate': estate, 'rss': rss_bytes(), 'loaded': stats['loaded'],
+                        'data_bytes': stats['bytes'], 'evictions': stats['evictions']})
+    print(json.dumps({'budget_mb': args.budget_mb, 'baseline_rss': baseline, 'samples': samples,
+                      'median_view_s': float(np.median(waits)), 'max_view_s': max(waits)}))
+
+
+def run(budget_mb, requests, env):
+    output = subprocess.run([sys.executable, __file__, '--serve', '--budget-mb', str(budget_mb),
+                             '--requests', str(requests)], env=env, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--estates', type=int, default=20)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--budgets', default='0,16')
+    parser.add_argument('--output')
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--budget-mb', type=float, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args)
+
+    tmp = tempfile.mkdtemp(prefix='zen-bench-estates-')
+    paths = write_estates(tmp, args.estates, args.months)
+    env = dict(os.environ)
+    env['ZEN_ESTATES'] = ';'.join(f"{estate}={path}" for estate, path in paths.items())
+    env['ZEN_CACHE_DIR'] = os.path.join(tmp, 'cache')
+    # Keep every estate's parsed snapshot on disk, so an unloaded estate comes back without a reparse
+    env['ZEN_SNAPSHOT_MAX_ENTRIES'] = str(args.estates * 2)
+    env['ZEN_SNAPSHOT_MAX_BYTES'] = str(1 << 30)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(HERE), env.get('PYTHONPATH', '')])
+
+    report = {'commit': git_commit(), 'estates': args.estates, 'months': args.months, 'requests': args.requests,
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'runs': []}
+    checkpoints = sorted({max(1, args.requests * k // 8) for k in range(1, 9)})
+    for budget in [float(b) for b in args.budgets.split(',') if b.strip()]:
+        result = run(budget, args.requests, env)
+        report['runs'].append(result)
+        label = f"budget {budget:g} MiB" if budget else "no budget"
+        print(f"\n{label}: median view {result['median_view_s'] * 1000:.1f} ms, "
+              f"slowest {result['max_view_s'] * 1000:.0f} ms")
+        print(f"{'views':>8}{'RSS MiB':>10}{'growth':>10}{'loaded':>8}{'data MiB':>10}{'unloaded':>10}")
+        for sample in result['samples']:
+            if sample['request'] in checkpoints:
+                growth = (sample['rss'] - result['baseline_rss']) / 2**20
+                print(f"{sample['request']:>8}{sample['rss'] / 2**20:>10.1f}{growth:>+10.1f}{sample['loaded']:>8}"
+                      f"{sample['data_bytes'] / 2**20:>10.2f}{sample['evictions']:>10}")
+        peak = max(sample['rss'] for sample in result['samples'])
+        print(f"peak RSS {peak / 2**20:.1f} MiB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
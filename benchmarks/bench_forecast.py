@@ -0,0 +1,103 @@
+"""Collection forecast and risk scores for many units: one batched pass vs a loop per unit.
+
+    python benchmarks/bench_forecast.py [--units 10000] [--months 60] [--repeat 5] [--output results.json]
+
+Builds (month x unit) To_Be / Received / fine matrices with random bills,
+units that joined late, and a share of units falling behind, and times
+``forecast_collections`` on them.  For comparison the same trend, smoothed
+rate and outstanding amount are computed one unit at a time with ``np.polyfit``
+and ``pandas.Series.ewm`` (on at most ``--loop-units`` units, scaled up).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from synthetic import month_sequence  # noqa: E402
+from zen_dashboard.forecast import (RATE_CAP, RATE_HALF_LIFE, TREND_MONTHS,  # noqa: E402
+                                    forecast_collections)
+
+
+def unit_matrices(units, months, seed=0):
+    rng = np.random.default_rng(seed)
+    bills = rng.uniform(2_000, 12_000, units)
+    to_be = np.tile(bills, (months, 1)) * rng.uniform(0.95, 1.05, (months, units))
+    # Some units join late and bill nothing before
+    joined = np.where(rng.random(units) < 0.1, rng.integers(0, months, units), 0)
+    to_be[np.arange(months)[:, None] < joined] = 0
+    rates = np.clip(rng.normal(0.98, 0.05, (months, units)), 0, RATE_CAP)
+    # A tenth of the units fall behind over the last year
+    behind = rng.random(units) < 0.1
+    rates[-12:, behind] *= np.linspace(1, 0.4, 12)[:, None]
+    received = np.round(to_be * rates, 2)
+    fines = np.where(rng.random((months, units)) < 0.01, 500.0, 0.0)
+    return np.round(to_be, 2), received, fines
+
+
+def loop_forecast(to_be, received, fines):
+    """The forecast one unit at a time (billed months only, no risk levels)"""
+    rows = []
+    for unit in range(to_be.shape[1]):
+        billed = to_be[:, unit] > 0
+        window = np.flatnonzero(billed)[-TREND_MONTHS:]
+        if len(window) > 1:
+            slope, intercept = np.polyfit(window, to_be[window, unit], 1)
+            expected = max(slope * len(to_be) + intercept, 0.0)
+        else:
+            expected = to_be[window, unit].sum()
+        rates = pd.Series(np.minimum(received[billed, unit] / to_be[billed, unit], RATE_CAP))
+        rate = rates.ewm(halflife=RATE_HALF_LIFE).mean().iloc[-1]
+        outstanding = (to_be[:, unit] - received[:, unit] - fines[:, unit]).sum()
+        rows.append((expected, expected * rate, rate, outstanding))
+    return pd.DataFrame(rows, columns=['Expected_To_Be', 'Expected_Received', 'Collection_Rate', 'Outstanding'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=10_000)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--loop-units', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    to_be, received, fines = unit_matrices(args.units, args.months)
+    periods = [f"{year}-{month + 1:02d}" for year, month in month_sequence(args.months)]
+    keys = [f"Unit {i + 1:05d}" for i in range(args.units)]
+    table = forecast_collections(periods, keys, to_be, received, fines, key_name='Unit')
+    print(f"{args.units:,} units x {args.months} months; risk levels: "
+          f"{table['Risk'].value_counts().to_dict()}\n")
+
+    loop_units = min(args.units, args.loop_units)
+    scale = args.units / loop_units
+    cases = [
+        ('forecast_collections (batched)', lambda: forecast_collections(periods, keys, to_be, received, fines,
+                                                                        key_name='Unit'), 1),
+        (f"loop per unit (polyfit + ewm, x{scale:g})",
+         lambda: loop_forecast(to_be[:, :loop_units], received[:, :loop_units], fines[:, :loop_units]), scale),
+    ]
+    report = {'commit': git_commit(), 'units': args.units, 'months': args.months, 'results': []}
+    print(f"{'case':<44}{'min ms':>12}{'median ms':>12}")
+    for name, fn, factor in cases:
+        times = [t * factor for t in time_case(fn, args.repeat)]
+        report['results'].append({'name': name, 'min_s': min(times), 'median_s': statistics.median(times)})
+        print(f"{name:<44}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
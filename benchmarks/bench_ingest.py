@@ -0,0 +1,68 @@
+"""Multi-workbook ingestion: serial vs process pool.
+
+    python benchmarks/bench_ingest.py [--years 8] [--workers N]
+
+Writes ``--years`` copies of the bundled workbook, each shifted by a year
+(so every copy holds different periods), and ingests them with one worker
+and with a process pool. Snapshots are disabled so every run really parses.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zen_dashboard.ingest import ingest_workbooks  # noqa: E402
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'Zen_Estate_Combined_Expenses_Q1.xlsx')
+TITLE_YEAR = re.compile(r'^(\s*[A-Za-z]{3}[A-Za-z]*\.?\s+)(\d{4})(\s+Vendor Bills)')
+
+
+def write_year_shifted_copies(directory, years):
+    import openpyxl
+
+    paths = []
+    for shift in range(years):
+        workbook = openpyxl.load_workbook(WORKBOOK)
+        sheet = workbook['Sheet1']
+        for (cell,) in sheet.iter_rows(min_col=1, max_col=1):
+            if isinstance(cell.value, str):
+                cell.value = TITLE_YEAR.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + shift}{m.group(3)}", cell.value)
+        path = os.path.join(directory, f'ledger_{2025 + shift}.xlsx')
+        workbook.save(path)
+        paths.append(path)
+    return paths
+
+
+def timed(sources, workers):
+    start = time.perf_counter()
+    frames = ingest_workbooks(sources, max_workers=workers, use_snapshots=False)
+    return time.perf_counter() - start, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--years', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_year_shifted_copies(tmp, args.years)
+        pattern = os.path.join(tmp, 'ledger_*.xlsx')
+        serial, frames = timed(pattern, 1)
+        pooled, pooled_frames = timed(pattern, args.workers)
+        for a, b in zip(frames, pooled_frames):
+            assert a.equals(b)
+
+    periods = frames[0]['Period']
+    print(f"{args.years} workbooks, {len(periods)} periods ({periods.iloc[0]} .. {periods.iloc[-1]})")
+    print(f"  1 worker   {serial:8.2f} s")
+    print(f"  {args.workers} workers  {pooled:8.2f} s   speedup {serial / pooled:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
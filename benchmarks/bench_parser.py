@@ -0,0 +1,142 @@
+"""Microbenchmark: layout discovery + vectorized extract_frames vs the old per-cell iloc extractor.
+
+    python benchmarks/bench_parser.py [--repeat 5] [--scale 100]
+
+Runs on the bundled workbook and on a synthetic sheet made of the real one
+stacked ``--scale`` times, and checks both implementations agree.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zen_dashboard.layout import discover_layout  # noqa: E402
+from zen_dashboard.parser import WINGS, extract_frames  # noqa: E402
+from zen_dashboard.reader import read_sheet  # noqa: E402
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'Zen_Estate_Combined_Expenses_Q1.xlsx')
+
+
+def legacy_extract(df, blocks):
+    """The per-cell implementation load_excel_data used before, driven by the same block table"""
+    monthly_data = []
+    wing_data = []
+    for month_info in blocks:
+        month = month_info['name']
+        to_be = df.iloc[month_info['summary_row'], 6] if pd.notna(df.iloc[month_info['summary_row'], 6]) else 0
+        received = df.iloc[month_info['summary_row'], 9] if pd.notna(df.iloc[month_info['summary_row'], 9]) else 0
+        expense = df.iloc[month_info['summary_row'], month_info['expense_col']] if pd.notna(df.iloc[month_info['summary_row'], month_info['expense_col']]) else 0
+        extra_income = df.iloc[month_info['summary_row'], 18] if pd.notna(df.iloc[month_info['summary_row'], 18]) else 0
+        monthly_data.append({'Month': month, 'To_Be': float(to_be), 'Received': float(received),
+                             'Expense': float(expense), 'Extra_Income': float(extra_income)})
+        for idx, wing in enumerate(WINGS):
+            col_idx = 6 + idx
+            if col_idx < df.shape[1]:
+                to_be_val = df.iloc[month_info['to_be_row'], col_idx]
+                received_val = df.iloc[month_info['received_row'], col_idx]
+                diff_val = df.iloc[month_info['diff_row'], col_idx]
+                wing_data.append({
+                    'Month': month, 'Wing': wing,
+                    'To_Be': float(to_be_val) if pd.notna(to_be_val) else 0,
+                    'Received': float(received_val) if pd.notna(received_val) else 0,
+                    'Difference': float(diff_val) if pd.notna(diff_val) else 0
+                })
+
+    vendor_data = []
+    for block in blocks:
+        start, end = block['vendor_rows']
+        for idx in range(start, min(end, len(df))):
+            vendor = df.iloc[idx, 2]
+            amount = df.iloc[idx, 3]
+            if pd.notna(vendor) and pd.notna(amount) and isinstance(amount, (int, float)) and amount > 0:
+                vendor_str = str(vendor)
+                if 'Vendor Name' not in vendor_str and 'Vendor Bills' not in vendor_str:
+                    vendor_data.append({'Vendor': vendor_str, 'Amount': float(amount), 'Month': block['name']})
+
+    extra_income_breakdown = []
+    for block in blocks:
+        row_idx = block['income_row']
+        if row_idx < len(df):
+            row = {'Month': block['name']}
+            for name, col in (('NBH', 23), ('Lift', 24), ('Event', 25), ('Scrap', 26), ('Parking_Fine', 27)):
+                value = df.iloc[row_idx, col] if pd.notna(df.iloc[row_idx, col]) else 0
+                row[name] = float(value) if isinstance(value, (int, float)) else 0
+            extra_income_breakdown.append(row)
+
+    fine_data = []
+    for block in blocks:
+        start, end = block['fine_rows']
+        for row_idx in range(start, min(end, len(df))):
+            wing = df.iloc[row_idx, 29]
+            if pd.notna(wing) and isinstance(wing, str) and 'Wing' in str(wing):
+                fines = []
+                for col in (30, 31, 32, 33):
+                    value = df.iloc[row_idx, col]
+                    fines.append(float(value) if pd.notna(value) and isinstance(value, (int, float)) else 0)
+                fine_data.append({'Month': block['name'], 'Wing': wing, 'HK': fines[0], 'Quinteze': fines[1],
+                                  'Security': fines[2], 'STP': fines[3], 'Total_Fine': sum(fines)})
+
+    return (pd.DataFrame(monthly_data), pd.DataFrame(wing_data),
+            pd.DataFrame(vendor_data) if vendor_data else pd.DataFrame(),
+            pd.DataFrame(extra_income_breakdown),
+            pd.DataFrame(fine_data) if fine_data else pd.DataFrame())
+
+
+def stacked(values, blocks, scale):
+    """The sheet repeated scale times vertically, with the block table shifted to match"""
+    height = values.shape[0]
+    big = np.concatenate([values] * scale)
+    big_blocks = []
+    for k in range(scale):
+        shift = k * height
+        for b in blocks:
+            big_blocks.append({key: (tuple(x + shift for x in v) if isinstance(v, tuple)
+                                     else v + shift if key.endswith('_row') else v)
+                               for key, v in b.items()})
+    return big, big_blocks
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(label, values, blocks, repeat):
+    df = pd.DataFrame(values)
+    old = legacy_extract(df, blocks)
+    new = extract_frames(values, discover_layout(values))
+    for a, b in zip(old, new):
+        pd.testing.assert_frame_equal(a, b.drop(columns='Period', errors='ignore'), check_dtype=False)
+
+    # The new path pays for discovering the layout too; the old one had it hardcoded
+    t_old = best_of(lambda: legacy_extract(df, blocks), repeat)
+    t_new = best_of(lambda: extract_frames(values, discover_layout(values)), repeat)
+    print(f"{label:<28} {values.shape[0]:>7} rows  legacy {t_old * 1000:9.2f} ms  "
+          f"vectorized {t_new * 1000:8.2f} ms  speedup {t_old / t_new:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=100)
+    args = parser.parse_args()
+
+    values = read_sheet(WORKBOOK, engine='pandas', max_col=None)
+    blocks = discover_layout(values)
+    run('bundled workbook', values, blocks, args.repeat)
+    big, big_blocks = stacked(values, blocks, args.scale)
+    run(f'synthetic {args.scale}x', big, big_blocks, max(1, args.repeat // 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Peak memory (tracemalloc) and wall time of each Sheet1 reader engine.
+
+    python benchmarks/bench_reader.py [--scale 30] [--extra-cols 60]
+
+Measures the bundled workbook and a large synthetic one. The synthetic one is
+the real sheet stacked ``--scale`` times, plus ``--extra-cols`` of formatted
+filler to the right of the ledger, which the bounded readers never touch.
+tracemalloc only sees Python allocations, so calamine's Rust-side buffers are
+not counted.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zen_dashboard.layout import DEFAULT_MAX_COL  # noqa: E402
+from zen_dashboard.reader import HAS_CALAMINE, read_sheet  # noqa: E402
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'Zen_Estate_Combined_Expenses_Q1.xlsx')
+
+
+def write_stacked_workbook(path, scale, extra_cols):
+    """The bundled sheet repeated scale times, with formatted filler columns on the right"""
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    values = read_sheet(WORKBOOK, engine='openpyxl', max_col=None)
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    fill = PatternFill('solid', start_color='FFF4E6')
+    font = Font(bold=True)
+    for k in range(scale):
+        for r, row in enumerate(values):
+            filler = []
+            for c in range(extra_cols):
+                cell = WriteOnlyCell(sheet, value=(k * 1000 + r) * c)
+                cell.fill = fill
+                cell.font = font
+                filler.append(cell)
+            sheet.append(list(row) + filler)
+    workbook.save(path)
+
+
+def measure(path, engine, max_col):
+    # Timed and traced in separate runs - tracemalloc slows pure-Python readers down a lot
+    start = time.perf_counter()
+    values = read_sheet(path, engine=engine, max_col=max_col)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    read_sheet(path, engine=engine, max_col=max_col)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return values.shape, elapsed, peak
+
+
+def report(label, path):
+    size = os.path.getsize(path) / 1024
+    print(f"\n{label} ({size:,.0f} KiB)")
+    print(f"  {'engine':<24}{'shape':>14}{'wall ms':>12}{'peak MiB':>12}")
+    runs = [('pandas (unbounded)', 'pandas', None), ('openpyxl stream', 'openpyxl', DEFAULT_MAX_COL)]
+    if HAS_CALAMINE:
+        runs.append(('calamine', 'calamine', DEFAULT_MAX_COL))
+    for name, engine, max_col in runs:
+        shape, elapsed, peak = measure(path, engine, max_col)
+        print(f"  {name:<24}{str(shape):>14}{elapsed * 1000:12.1f}{peak / 2 ** 20:12.2f}")
+    if not HAS_CALAMINE:
+        print("  (python-calamine not installed - calamine engine skipped)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=30)
+    parser.add_argument('--extra-cols', type=int, default=60)
+    args = parser.parse_args()
+
+    report('bundled workbook', WORKBOOK)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.xlsx')
+        write_stacked_workbook(path, args.scale, args.extra_cols)
+        report(f'synthetic {args.scale}x + {args.extra_cols} formatted columns', path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""Rerun latency of the whole dashboard under Streamlit's AppTest.
+
+    python benchmarks/bench_rerun.py [--scales 1,10] [--repeat 10] [--output results.json]
+                                     [--compare previous.json] [--app path/to/app.py]
+
+Times what a session waits for after an interaction, from the script start
+to the last element: the first run (data loaded in the background), a rerun
+with nothing changed, and a rerun after picking another wing in the
+Wing/Shop selectbox.  AppTest always reruns the whole script, so the
+fragment cases run only the fragment (``wing_shop_section`` /
+``vendor_section``) on the same data, which is what the browser triggers
+when a widget inside it changes.  They are skipped for an app without
+fragments.  To measure before/after a change, point ``--app`` at a checkout
+of the older app and ``--compare`` the two JSON files.
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+from bench_suite import BASE_MONTHS, compare, git_commit  # noqa: E402
+
+
+def write_workbook(path, months):
+    """Synthetic ledger, written by a separate process so this one imports only the benchmarked app's package"""
+    subprocess.run([sys.executable, os.path.join(HERE, 'synthetic.py'), path, '--months', str(months)],
+                   check=True, stdout=subprocess.DEVNULL)
+    return path
+
+
+def fragment_script(section):
+    """AppTest script running one fragment of app.py on the current data version"""
+    return (
+        "import app\n"
+        "data = app.load_excel_from_github()\n"
+        f"app.{section}(data)\n"
+    )
+
+
+def time_runs(at, repeat, before_run=None):
+    times = []
+    for i in range(repeat + 1):
+        if before_run:
+            before_run(at, i)
+        start = time.perf_counter()
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+        if i:  # the first run warms up
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def pick_next_wing(at, i):
+    selectbox = at.selectbox(key='wing_shop_filter')
+    selectbox.select(selectbox.options[i % len(selectbox.options)])
+
+
+def pick_next_month(at, i):
+    # Apps before the combined vendor chart had one tab per month
+    labels = [tab.label for tab in at.tabs]
+    at.session_state['vendor_month'] = labels[i % len(labels)]
+
+
+def pick_next_top(at, i):
+    selectbox = at.selectbox(key='vendor_top')
+    selectbox.select(selectbox.options[i % len(selectbox.options)])
+
+
+def cases(app_path, app_module, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    at = AppTest.from_file(app_path, default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    results.append(('first run', [time.perf_counter() - start]))
+    results.append(('full rerun (no change)', time_runs(at, repeat)))
+    results.append(('full rerun (wing selected)', time_runs(at, repeat, pick_next_wing)))
+    if hasattr(app_module, 'wing_shop_section'):
+        fragment = AppTest.from_string(fragment_script('wing_shop_section'), default_timeout=600)
+        fragment.run()
+        results.append(('fragment rerun (wing selected)', time_runs(fragment, repeat, pick_next_wing)))
+    if hasattr(app_module, 'vendor_section'):
+        fragment = AppTest.from_string(fragment_script('vendor_section'), default_timeout=600)
+        fragment.run()
+        if any(selectbox.key == 'vendor_top' for selectbox in fragment.selectbox):
+            results.append(('fragment rerun (vendor top N)', time_runs(fragment, repeat, pick_next_top)))
+        else:
+            results.append(('fragment rerun (vendor month tab)', time_runs(fragment, repeat, pick_next_month)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,10')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    parser.add_argument('--app', default=os.path.join(ROOT, 'app.py'))
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    app_path = os.path.abspath(args.app)
+    sys.path.insert(0, os.path.dirname(app_path))
+
+    tmp = tempfile.mkdtemp(prefix='zen-bench-rerun-')
+    os.environ['ZEN_CACHE_DIR'] = os.path.join(tmp, 'cache')
+    warnings.simplefilter('ignore')
+
+    import streamlit as st  # noqa: E402
+    from streamlit import logger  # noqa: E402
+    logger.set_log_level('error')
+
+    results = []
+    print(f"{'case':<40}{'scale':>6}{'months':>8}{'min ms':>12}{'median ms':>12}")
+    for scale in scales:
+        months = BASE_MONTHS * scale
+        os.environ['ZEN_WORKBOOKS'] = write_workbook(os.path.join(tmp, f'ledger_{scale}x.xlsx'), months=months)
+        # Fresh settings and refresher for every workbook
+        importlib.reload(importlib.import_module('zen_dashboard.config'))
+        app_module = importlib.import_module('app')
+        st.cache_resource.clear()
+        for name, times in cases(app_path, app_module, args.repeat):
+            results.append({
+                'name': name, 'scale': scale, 'months': months, 'repeat': len(times),
+                'min_s': min(times), 'median_s': statistics.median(times), 'mean_s': statistics.fmean(times),
+            })
+            print(f"{name:<40}{scale:>5}x{months:>8}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    report = {
+        'commit': git_commit(),
+        'app': app_path,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
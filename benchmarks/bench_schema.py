@@ -0,0 +1,96 @@
+"""Memory and filter speed of the loaded frames: object strings vs the categorical schema.
+
+    python benchmarks/bench_schema.py [--months 120] [--vendors 25] [--repeat 20] [--output results.json]
+
+Loads one synthetic multi-year ledger and compares three versions of the
+same five frames: plain object columns (what the parser emits), the
+categorical schema of ``zen_dashboard.schema`` and the schema with float32
+amounts.  Memory is ``memory_usage(deep=True)``; the filters are the ones the
+dashboard runs (one wing, one month, one vendor, a wing multiselect) plus a
+per-wing groupby and the (Period, Wing) sort of the detail table.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from synthetic import write_workbook  # noqa: E402
+from zen_dashboard.ingest import combine_frames, load_source  # noqa: E402
+from zen_dashboard.schema import apply_schema  # noqa: E402
+from zen_dashboard.snapshot import FRAME_NAMES  # noqa: E402
+
+
+def memory(frames):
+    return {name: int(frame.memory_usage(deep=True).sum()) for name, frame in zip(FRAME_NAMES, frames)}
+
+
+def cases(frames):
+    df_monthly, df_wings, df_vendors, _, df_fines = frames
+    wing = df_wings['Wing'].iloc[len(df_wings) // 2]
+    wings = list(df_wings['Wing'].drop_duplicates().iloc[:3])
+    period = df_fines['Period'].iloc[len(df_fines) // 2]
+    vendor = df_vendors['Vendor'].iloc[len(df_vendors) // 2]
+    return [
+        ("df_wings[Wing == wing]", lambda: df_wings[df_wings['Wing'] == wing]),
+        ("df_wings[Wing.isin(3 wings)]", lambda: df_wings[df_wings['Wing'].isin(wings)]),
+        ("df_fines[Period == month]", lambda: df_fines[df_fines['Period'] == period]),
+        ("df_vendors[Vendor == vendor]", lambda: df_vendors[df_vendors['Vendor'] == vendor]),
+        ("df_wings.groupby(Wing).sum()", lambda: df_wings.groupby('Wing', observed=True)['Difference'].sum()),
+        ("df_wings.sort_values([Period, Wing])", lambda: df_wings.sort_values(['Period', 'Wing'])),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=120)
+    parser.add_argument('--vendors', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)
+
+    path = write_workbook(os.path.join(tempfile.mkdtemp(prefix='zen-bench-'), 'ledger.xlsx'),
+                          months=args.months, vendors=args.vendors)
+    plain = combine_frames([load_source(path, use_snapshots=False)])
+    variants = {
+        'object': plain,
+        'categorical': apply_schema(plain, float32=False),
+        'categorical+float32': apply_schema(plain, float32=True),
+    }
+    rows = sum(len(frame) for frame in plain)
+    print(f"{args.months} months, {rows:,} rows in five frames\n")
+
+    report = {'commit': git_commit(), 'months': args.months, 'rows': rows, 'memory': {}, 'results': []}
+    print(f"{'memory (KiB)':<38}" + ''.join(f"{name:>22}" for name in variants))
+    usage = {name: memory(frames) for name, frames in variants.items()}
+    for frame_name in FRAME_NAMES + ('total',):
+        values = [sum(u.values()) if frame_name == 'total' else u[frame_name] for u in usage.values()]
+        print(f"{frame_name:<38}" + ''.join(f"{v / 1024:>22,.1f}" for v in values))
+    report['memory'] = usage
+
+    print(f"\n{'median ms':<38}" + ''.join(f"{name:>22}" for name in variants))
+    timings = {name: dict((case, time_case(fn, args.repeat)) for case, fn in cases(frames))
+               for name, frames in variants.items()}
+    for case in timings['object']:
+        medians = [statistics.median(timings[name][case]) for name in variants]
+        print(f"{case:<38}" + ''.join(f"{m * 1000:>22.3f}" for m in medians))
+        for name, m in zip(variants, medians):
+            report['results'].append({'name': case, 'variant': name, 'median_s': m})
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark suite: the loader and every chart/table builder, from small to 100x scale.
+
+    python benchmarks/bench_suite.py [--scales 1,10,100] [--repeat 5] [--output results.json]
+                                     [--compare previous.json]
+
+Scale 1 is one quarter (3 months) of the real layout; scale k is a synthetic
+ledger of 3k months (see ``synthetic.py``).  Every case is run once to warm up
+and then ``--repeat`` times.  Results go to stdout and, with ``--output``, to a
+JSON file that a later run can be checked against with ``--compare``.  Styler
+tables are timed through ``Styler.to_html()``, which computes every style the
+way ``st.dataframe`` has to.  The detail table is shown one page at a time; both
+the whole table and one sorted page of it are timed.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+BASE_MONTHS = 3
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_case(fn, repeat):
+    fn()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def cases(path, app, charts, cube, forecast, views, ingest_workbooks):
+    """(name, callable) for one workbook"""
+    frames, _ = ingest_workbooks(path, max_workers=1, use_snapshots=False, with_layout=True)
+    df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines = frames
+    cubes = cube.build_cubes(frames)
+    tables = views.build_tables(frames, cubes)
+    wing_periods = cubes['wings'].periods
+    last_year = (wing_periods[max(0, len(wing_periods) - 12)], wing_periods[-1])
+    wing = tables['wing_summary']['Wing'].iloc[0]
+    detail = tables['detail']
+    orders = views.detail_sort_orders(detail)
+    periods = np.sort(detail['Period'].unique())
+
+    return [
+        ('load_excel_data (parse)',
+         lambda: ingest_workbooks(path, max_workers=1, use_snapshots=False, with_layout=True)),
+        ('load_excel_data (snapshot hit)', lambda: app.load_excel_data(path)),
+        ('create_vendor_chart (top 10)', lambda: charts.create_vendor_chart(views.vendor_monthly(cubes['vendors'], 10))),
+        ('vendor_table (last 12 months)', lambda: views.vendor_table(cubes['vendors'], 10, *last_year)),
+        ('create_extra_income_chart', lambda: charts.create_extra_income_chart(df_monthly)),
+        ('create_combined_monthly_chart',
+         lambda: charts.create_combined_monthly_chart(df_monthly, tables['forecast'])),
+        ('wing_forecast', lambda: forecast.wing_forecast(cubes['wings'])),
+        ('create_wing_difference_chart', lambda: charts.create_wing_difference_chart(cubes['wings'])),
+        ('build_cubes', lambda: cube.build_cubes(frames)),
+        ('build_tables', lambda: views.build_tables(frames, cubes)),
+        ('wing_summary_table (last 12 months)', lambda: views.wing_summary_table(cubes['wings'], *last_year)),
+        ('style_overview', lambda: app.style_overview(tables['overview']).to_html()),
+        ('style_extra_income', lambda: app.style_extra_income(tables['extra_income']).to_html()),
+        ('style_wing_table', lambda: app.style_wing_table(
+            views.wing_table(df_wings, df_fines, wing)).to_html()),
+        ('style_detail', lambda: app.style_detail(tables['detail']).to_html()),
+        ('style_detail (one sorted page)', lambda: app.style_detail(views.detail_page(
+            detail, views.detail_positions(detail, orders, 'Difference', True), 1, 50), periods).to_html()),
+    ]
+
+
+def compare(results, previous_path):
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    before = {(r['name'], r['scale']): r['median_s'] for r in previous['results']}
+    print(f"\nchange vs {previous_path} (commit {previous.get('commit')}), median:")
+    for r in results:
+        old = before.get((r['name'], r['scale']))
+        if old:
+            change = (r['median_s'] - old) / old * 100
+            flag = '  <-- slower' if change > 10 else ''
+            print(f"  {r['name']:<40}{r['scale']:>5}x {change:+8.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,10,100')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+
+    tmp = tempfile.mkdtemp(prefix='zen-bench-')
+    # Keep the snapshot cache of the benchmark away from the app's
+    os.environ['ZEN_CACHE_DIR'] = os.path.join(tmp, 'cache')
+    warnings.simplefilter('ignore', FutureWarning)
+
+    import app  # noqa: E402  (after ZEN_CACHE_DIR is set)
+    from synthetic import write_workbook  # noqa: E402
+    from zen_dashboard import charts, cube, forecast, views  # noqa: E402
+    from zen_dashboard.ingest import ingest_workbooks  # noqa: E402
+
+    results = []
+    print(f"{'case':<40}{'scale':>6}{'months':>8}{'min ms':>12}{'median ms':>12}")
+    for scale in scales:
+        months = BASE_MONTHS * scale
+        path = write_workbook(os.path.join(tmp, f'ledger_{scale}x.xlsx'), months=months)
+        for name, fn in cases(path, app, charts, cube, forecast, views, ingest_workbooks):
+            times = time_case(fn, args.repeat)
+            results.append({
+                'name': name, 'scale': scale, 'months': months, 'repeat': args.repeat,
+                'min_s': min(times), 'median_s': statistics.median(times), 'mean_s': statistics.fmean(times),
+            })
+            print(f"{name:<40}{scale:>5}x{months:>8}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
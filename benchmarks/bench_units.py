@@ -0,0 +1,137 @@
+"""Unit register roll-up and drilldown at estate scale: codes + bincount vs pandas groupby / np.add.at.
+
+    python benchmarks/bench_units.py [--units 5000] [--months 60] [--wings 16] [--repeat 5] [--output results.json]
+
+Builds a typed unit register (one row per unit per month, units spread over
+the wings, some joining late) and times each step of a load and of a
+drilldown rerun:
+
+- ``typed_units`` on the raw rows (categorical Period / Wing / Unit, sorted);
+- the (period, wing) sums by ``unit_wing_rows`` (one ``np.bincount``) and by
+  ``groupby(['Period', 'Wing'])`` on the same frame, checked to agree;
+- the period x unit rollup by ``unit_cube`` (``Rollup.from_codes``) and by the
+  label lookup plus ``np.add.at`` scatter ``Rollup.from_rows`` used before;
+- ``unit_forecast`` of every unit;
+- one rerun of the drilldown: ``unit_list`` of the largest wing over a date
+  range, sorted by dues, one page cut and one unit's months.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from synthetic import month_sequence  # noqa: E402
+from zen_dashboard.cube import Rollup, unit_cube  # noqa: E402
+from zen_dashboard.parser import WINGS  # noqa: E402
+from zen_dashboard.units import (UNIT_METRICS, typed_units, unit_forecast, unit_list, unit_months,  # noqa: E402
+                                 unit_risk, unit_wing_rows, unit_wings, wing_units)
+
+PAGE_SIZE = 50
+
+
+def register_rows(units, months, wings, seed=0):
+    """Raw unit rows (Period, Wing, Unit, To_Be, Received, Difference) in random order"""
+    rng = np.random.default_rng(seed)
+    periods = np.array([f"{year}-{month + 1:02d}" for year, month in month_sequence(months)], dtype=object)
+    names = np.array(list(WINGS[:wings]), dtype=object)
+    unit_wing = rng.integers(0, len(names), units)
+    labels = np.array([f"{names[w].split()[0]}-{i + 1:05d}" for i, w in enumerate(unit_wing)], dtype=object)
+    # A tenth of the units join late and have no rows before
+    joined = np.where(rng.random(units) < 0.1, rng.integers(0, months, units), 0)
+    period_index, unit_index = np.nonzero(np.arange(months)[:, None] >= joined)
+    bills = rng.uniform(2_000, 12_000, units)[unit_index]
+    to_be = np.round(bills * rng.uniform(0.95, 1.05, len(bills)), 2)
+    received = np.round(to_be * np.clip(rng.normal(0.97, 0.08, len(bills)), 0, 1.5), 2)
+    order = rng.permutation(len(to_be))
+    return pd.DataFrame({
+        'Period': periods[period_index][order],
+        'Wing': names[unit_wing[unit_index]][order],
+        'Unit': labels[unit_index][order],
+        'To_Be': to_be[order],
+        'Received': received[order],
+        'Difference': np.round(to_be - received, 2)[order],
+    })
+
+
+def groupby_wing_rows(units):
+    return units.groupby(['Period', 'Wing'], observed=True, sort=True)[['To_Be', 'Received']].sum().reset_index()
+
+
+def add_at_cube(units):
+    """The rollup the way Rollup.from_rows built it before: labels looked up, then an np.add.at scatter"""
+    periods, keys = list(units['Period'].cat.categories), list(units['Unit'].cat.categories)
+    values = np.zeros((len(periods), len(keys), len(UNIT_METRICS)))
+    period_index = pd.Index(periods).get_indexer(np.asarray(units['Period'], dtype=object))
+    key_index = pd.Index(keys).get_indexer(np.asarray(units['Unit'], dtype=object))
+    np.add.at(values, (period_index, key_index), units[list(UNIT_METRICS)].to_numpy(dtype=float))
+    return Rollup(periods, keys, UNIT_METRICS, values, key_name='Unit')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--units', type=int, default=5_000)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--wings', type=int, default=len(WINGS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    rows = register_rows(args.units, args.months, min(args.wings, len(WINGS)))
+    units = typed_units(rows)
+    cube = unit_cube(units)
+    forecast = unit_forecast(cube, units)
+    wings = unit_wings(units, cube.keys)
+    risk = unit_risk(cube, forecast)
+    by_wing = wing_units(wings)
+    wing = max(by_wing, key=lambda name: len(by_wing[name]))
+    periods = list(cube.periods)
+    start, end = periods[len(periods) // 4], periods[-1]
+
+    # The bincount sums and the groupby sums are the same rows
+    summed = unit_wing_rows(units)
+    grouped = groupby_wing_rows(units)
+    assert np.allclose(summed[['To_Be', 'Received']].to_numpy(), grouped[['To_Be', 'Received']].to_numpy(), atol=0.01)
+    assert np.allclose(cube.values, add_at_cube(units).values)
+    print(f"{len(units):,} unit rows: {len(cube.keys):,} units x {len(periods)} months in {len(by_wing)} wings; "
+          f"drilldown of {wing} ({len(by_wing[wing]):,} units), {start} .. {end}\n")
+
+    def drilldown():
+        listed = unit_list(cube, wings, risk, by_wing[wing], start, end)
+        page = listed.sort_values('Difference', ascending=False, kind='stable', ignore_index=True).iloc[:PAGE_SIZE]
+        return unit_months(cube, page['Unit'].iloc[0], start, end)
+
+    cases = [
+        ('typed_units (categoricals + sort)', lambda: typed_units(rows)),
+        ('unit_wing_rows (bincount)', lambda: unit_wing_rows(units)),
+        ('groupby Period, Wing (pandas)', lambda: groupby_wing_rows(units)),
+        ('unit_cube (Rollup.from_codes)', lambda: unit_cube(units)),
+        ('labels + np.add.at (before)', lambda: add_at_cube(units)),
+        ('unit_forecast', lambda: unit_forecast(cube, units)),
+        ('drilldown rerun (list, sort, page)', drilldown),
+    ]
+    report = {'commit': git_commit(), 'units': args.units, 'months': args.months, 'rows': len(units),
+              'results': []}
+    print(f"{'case':<40}{'min ms':>12}{'median ms':>12}")
+    for name, fn in cases:
+        times = time_case(fn, args.repeat)
+        report['results'].append({'name': name, 'min_s': min(times), 'median_s': statistics.median(times)})
+        print(f"{name:<40}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Vendor analytics on a large bill ledger: name grouping, the vendor rollup and its queries.
+
+    python benchmarks/bench_vendors.py [--months 120] [--vendors 300] [--lines 100000] [--repeat 10]
+                                       [--output results.json]
+
+Builds a vendor frame of ``--lines`` bill lines over ``--months`` months, the
+names written in several spellings per vendor (dots, case, doubled spaces,
+plurals, "Pvt Ltd", dated utility bills).  Times grouping the distinct names
+from a cold cache, building the rollup, and what the vendor section does on
+each rerun: the vendor table and the combined chart of the top 10 over the
+last 12 months.  The same table computed with a pandas filter + groupby per
+query is timed for comparison.
+"""
+import argparse
+import calendar
+import json
+import os
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bench_suite import git_commit, time_case  # noqa: E402
+from synthetic import VENDOR_NAMES, month_sequence  # noqa: E402
+from zen_dashboard import charts, cube, views  # noqa: E402
+from zen_dashboard.vendors import canonical_vendors, display_name, vendor_tokens  # noqa: E402
+
+
+def spellings(name, rng):
+    """A few ways the same vendor gets written on bills"""
+    variants = [name, name.upper(), name.replace(' ', '  ', 1), f"M/s. {name}", f"{name} Pvt. Ltd."]
+    return [variants[0]] + list(rng.choice(variants[1:], size=2, replace=False))
+
+
+def vendor_frame(months, vendors, lines, seed=0):
+    rng = np.random.default_rng(seed)
+    bases = [VENDOR_NAMES[i % len(VENDOR_NAMES)] + ('' if i < len(VENDOR_NAMES) else f" {i // len(VENDOR_NAMES)}")
+             for i in range(vendors)]
+    names = [spellings(base, rng) for base in bases]
+    periods = [f"{year}-{month + 1:02d}" for year, month in month_sequence(months)]
+    period_index = np.sort(rng.integers(0, months, lines))
+    vendor_index = rng.zipf(1.3, lines) % vendors
+    spelling_index = rng.integers(0, 3, lines)
+    rows = []
+    for p, v, s in zip(period_index, vendor_index, spelling_index):
+        name = names[v][s]
+        if 'Electri' in name:
+            year, month = periods[p].split('-')
+            name = f"{name} {calendar.month_name[int(month)]} {year}"
+        rows.append(name)
+    return pd.DataFrame({
+        'Vendor': pd.Categorical(rows),
+        'Amount': np.round(rng.uniform(500, 450_000, lines), 2),
+        'Period': pd.Categorical([periods[p] for p in period_index], categories=periods, ordered=True),
+    })
+
+
+def pandas_table(df_vendors, canonical, n, start, end):
+    """Top n vendors over start..end with a filter and groupby per query (no rollup)"""
+    rows = df_vendors[(df_vendors['Period'] >= start) & (df_vendors['Period'] <= end)]
+    vendor = rows['Vendor'].map(canonical)
+    monthly = rows.groupby([vendor, rows['Period']], observed=True)['Amount'].sum().unstack(fill_value=0)
+    return monthly.sum(axis=1).nlargest(n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--months', type=int, default=120)
+    parser.add_argument('--vendors', type=int, default=300)
+    parser.add_argument('--lines', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', FutureWarning)
+
+    df_vendors = vendor_frame(args.months, args.vendors, args.lines)
+    names = list(df_vendors['Vendor'].cat.categories)
+    vendors = cube.vendor_cube(df_vendors)
+    canonical = canonical_vendors(names)
+    periods = vendors.periods
+    start, end = periods[max(0, len(periods) - 12)], periods[-1]
+    print(f"{args.lines:,} bill lines, {len(names):,} distinct names -> {len(vendors.keys):,} vendors, "
+          f"{len(periods)} months\n")
+
+    def cold_grouping():
+        vendor_tokens.cache_clear()
+        display_name.cache_clear()
+        canonical_vendors(names)
+
+    cases = [
+        ('canonical_vendors (cold cache)', cold_grouping),
+        ('canonical_vendors (cached names)', lambda: canonical_vendors(names)),
+        ('vendor_cube (build)', lambda: cube.vendor_cube(df_vendors)),
+        ('vendor_table (top 10, 12 months)', lambda: views.vendor_table(vendors, 10, start, end)),
+        ('vendor_table (all vendors, all months)', lambda: views.vendor_table(vendors)),
+        ('create_vendor_chart (top 10, 12 months)',
+         lambda: charts.create_vendor_chart(views.vendor_monthly(vendors, 10, start, end))),
+        ('pandas filter + groupby (top 10, 12 months)', lambda: pandas_table(df_vendors, canonical, 10, start, end)),
+    ]
+    report = {'commit': git_commit(), 'lines': args.lines, 'names': len(names), 'vendors': len(vendors.keys),
+              'results': []}
+    print(f"{'case':<46}{'min ms':>12}{'median ms':>12}")
+    for name, fn in cases:
+        times = time_case(fn, args.repeat)
+        report['results'].append({'name': name, 'min_s': min(times), 'median_s': statistics.median(times)})
+        print(f"{name:<46}{min(times) * 1000:12.2f}{statistics.median(times) * 1000:12.2f}")
+
+    if args.output:
+        report['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Synthetic ledger workbooks in the exact Sheet1 layout the loader expects.
+
+    python benchmarks/synthetic.py out.xlsx [--months 36] [--wings 16] [--vendors 17] [--fines 9]
+
+Each month is one block, laid out like the real ledger: title row, header
+row, vendor bills in columns A-D, the per-wing Received / To Be / Pending rows
+in the Wing columns, extra income on the Received row, the summary row with the
+month's totals and the fine table at the fine Wing column.  The numbers are
+random but consistent (Pending = To Be - Received, totals add up), and a
+fixed seed makes every run produce the same workbook.
+
+``wings`` is capped at the 16 Wing/Shop columns the parser reads, and
+``fines`` at the number of Wings (shops are never fined) among them.
+"""
+import argparse
+import calendar
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zen_dashboard.layout import DEFAULT_FINE_WING_COL, DEFAULT_MAX_COL  # noqa: E402
+from zen_dashboard.parser import EXTRA_INCOME_COLS, FINE_COLS, WING_COL, WINGS  # noqa: E402
+
+LABEL_COL = 5
+# Rows of a block, relative to its title row
+HEADER, FIRST_BODY = 1, 2
+RECEIVED, TO_BE, PENDING, SUMMARY = 7, 8, 9, 13
+MIN_BLOCK_ROWS = SUMMARY + 2
+
+VENDOR_NAMES = ['Arun Walture(Quinteze FMS)', "Pandve's Security Services", 'Sachin Water Supplier',
+                'Silver Streak Enterprises', 'Nilesh Gavali', 'Barge Enterprises', 'Dass Enterprise',
+                'Securise Services  (Housekeeping)', 'Sarupa Ram (Vedant Enterprises)', 'Safe & Hygiene Solutions',
+                'Shree Water Tank Cleaning Services', 'Visionmax Enterprises', 'STP Electricity Bill',
+                'Comman Electrcity', 'NBH Pinless System', 'NBH ERP System', 'Future Secure Safety (Barricades)']
+
+
+def month_sequence(months, start_year=2025, start_month=9):
+    """(year, month) pairs of consecutive months"""
+    index = start_year * 12 + start_month - 1
+    return [divmod(index + i, 12) for i in range(months)]
+
+
+def vendor_name(i):
+    base = VENDOR_NAMES[i % len(VENDOR_NAMES)]
+    return base if i < len(VENDOR_NAMES) else f"{base} #{i // len(VENDOR_NAMES) + 1}"
+
+
+def month_block(rng, year, month, wings, vendors, fines):
+    """Rows (lists of DEFAULT_MAX_COL cells) of one month block"""
+    name = calendar.month_abbr[month + 1]
+    n_rows = max(MIN_BLOCK_ROWS, FIRST_BODY + vendors, FIRST_BODY + fines + 1)
+    rows = [[None] * DEFAULT_MAX_COL for _ in range(n_rows)]
+    wing_names = WINGS[:wings]
+    fined = [w for w in wing_names if 'Shop' not in w][:fines]
+    fine_col = DEFAULT_FINE_WING_COL
+
+    rows[0][0] = f"{name} {year} Vendor Bills (Paid in {calendar.month_abbr[(month + 1) % 12 + 1]})"
+    rows[0][fine_col] = f"{name} Fine"
+
+    header = rows[HEADER]
+    header[:4] = ['Sr. No', 'Date', 'Vendor Name', 'Amount Paid']
+    header[LABEL_COL] = 'Wing '
+    header[WING_COL:WING_COL + wings] = wing_names
+    header[WING_COL + len(WINGS)] = 'Cash Received'
+    for source, col in EXTRA_INCOME_COLS.items():
+        header[col] = source.replace('_', ' ')
+    header[fine_col] = 'Wing'
+    header[fine_col + 1:fine_col + 1 + len(FINE_COLS)] = list(FINE_COLS)
+
+    amounts = np.round(rng.uniform(5_000, 450_000, vendors), 2)
+    for i in range(vendors):
+        row = rows[FIRST_BODY + i]
+        row[:4] = [float(i + 1), f"28-{month + 1:02d}-{year}", vendor_name(i), float(amounts[i])]
+
+    to_be = np.round(rng.uniform(20_000, 330_000, wings), 0)
+    received = np.round(to_be * rng.uniform(0.85, 1.1, wings), 2)
+    for r in range(FIRST_BODY, RECEIVED):
+        rows[r][LABEL_COL] = 'Amount received'
+    for r, label, values in ((RECEIVED, 'Total Amount Received per Wing', received),
+                             (TO_BE, 'Total Amount To be Received', to_be),
+                             (PENDING, 'Pending Amount ', to_be - received)):
+        rows[r][LABEL_COL] = label
+        rows[r][WING_COL:WING_COL + wings] = [float(v) for v in values]
+
+    extra = np.round(rng.uniform(0, 8_000, len(EXTRA_INCOME_COLS)), 0)
+    for value, col in zip(extra, EXTRA_INCOME_COLS.values()):
+        rows[RECEIVED][col] = float(value)
+
+    summary = rows[SUMMARY]
+    summary[LABEL_COL:LABEL_COL + 2] = ['Total Amount To be Received per Wing', float(to_be.sum())]
+    summary[8:10] = ['Total Amount Received per Wing', float(received.sum())]
+    summary[11:13] = ['Difference', float(to_be.sum() - received.sum())]
+    summary[14:16] = [f'Total {name} {year} Expense', float(amounts.sum())]
+    summary[17:19] = ['Extra Income', float(extra.sum())]
+
+    fine_values = np.where(rng.random((len(fined), len(FINE_COLS))) < 0.3,
+                           np.round(rng.uniform(100, 2_000, (len(fined), len(FINE_COLS))), 0), 0.0)
+    for i, wing in enumerate(fined):
+        row = rows[FIRST_BODY + i]
+        row[fine_col] = wing
+        row[fine_col + 1:fine_col + 1 + len(FINE_COLS)] = [float(v) for v in fine_values[i]]
+    total = rows[FIRST_BODY + len(fined)]
+    total[fine_col - 1] = 'Total'
+    total[fine_col:fine_col + 1 + len(FINE_COLS)] = [0.0] + [float(v) for v in fine_values.sum(axis=0)]
+    return rows
+
+
+def synthetic_rows(months=36, wings=16, vendors=17, fines=9, seed=0, start_year=2025, start_month=9):
+    """All Sheet1 rows of a synthetic ledger"""
+    wings = max(1, min(wings, len(WINGS)))
+    rng = np.random.default_rng(seed)
+    rows = [[None] * DEFAULT_MAX_COL]
+    for year, month in month_sequence(months, start_year, start_month):
+        rows.extend(month_block(rng, year, month, wings, vendors, fines))
+    return rows
+
+
+def write_workbook(path, months=36, wings=16, vendors=17, fines=9, seed=0, start_year=2025, start_month=9):
+    """Write a synthetic ledger to path (Sheet1 only) and return path"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    for row in synthetic_rows(months, wings, vendors, fines, seed, start_year, start_month):
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output')
+    parser.add_argument('--months', type=int, default=36)
+    parser.add_argument('--wings', type=int, default=len(WINGS))
+    parser.add_argument('--vendors', type=int, default=17)
+    parser.add_argument('--fines', type=int, default=9)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    write_workbook(args.output, args.months, args.wings, args.vendors, args.fines, args.seed)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:,.0f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import zen_dashboard from the checkout, like the benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,65 @@
+import pandas as pd
+
+from zen_dashboard.charts import create_combined_monthly_chart
+
+PERIODS = [f'{2025 + (8 + i) // 12}-{(8 + i) % 12 + 1:02d}' for i in range(12)]  # 2025-09 .. 2026-08
+
+
+def monthly_frame(periods):
+    return pd.DataFrame({
+        'Month': [pd.Timestamp(period).strftime('%b') for period in periods],
+        'Period': periods,
+        'To_Be': 1000.0,
+        'Received': 900.0,
+        'Expense': 500.0,
+        'Extra_Income': 50.0,
+    })
+
+
+def forecast_frame(period):
+    return pd.DataFrame({'Wing': ['A Wing', 'B Wing'], 'Period': period, 'Expected_To_Be': [600.0, 500.0],
+                         'Expected_Received': [550.0, 450.0]})
+
+
+def projected_traces(figure):
+    traces = [trace for trace in figure.data if 'projected' in trace.name]
+    assert len(traces) == 2
+    return traces
+
+
+def test_projection_onto_the_unbilled_month_on_the_axis():
+    # Sep..Mar with Mar not billed yet: the forecast for Mar is drawn at 'Mar', not at a second March
+    frame = monthly_frame(PERIODS[:7])
+    frame.loc[6, ['To_Be', 'Received']] = 0.0
+    figure = create_combined_monthly_chart(frame, forecast_frame('2026-03'))
+    to_be, received, expense = figure.data[:3]
+    assert list(to_be.x) == list(received.x) == ['Sep', 'Oct', 'Nov', 'Dec', 'Jan', 'Feb']
+    assert 0.0 not in list(to_be.y)
+    assert list(expense.x) == list(frame['Month'])
+    for trace in projected_traces(figure):
+        assert list(trace.x) == ['Feb', 'Mar']
+
+
+def test_projection_to_a_new_month():
+    figure = create_combined_monthly_chart(monthly_frame(PERIODS[:6]), forecast_frame('2026-03'))
+    for trace in projected_traces(figure):
+        assert list(trace.x) == ['Feb', 'Mar']
+        assert trace.y[-1] in (1100.0, 1000.0)
+
+
+def test_projection_after_a_full_year_switches_the_axis_to_dates():
+    # Twelve months Sep..Aug: the forecast month (Sep 2026) shares its name with the first month
+    figure = create_combined_monthly_chart(monthly_frame(PERIODS), forecast_frame('2026-09'))
+    actual_x = [pd.Timestamp(value) for value in figure.data[0].x]
+    assert actual_x == [pd.Timestamp(period) for period in PERIODS]
+    for trace in projected_traces(figure):
+        assert [pd.Timestamp(value) for value in trace.x] == [pd.Timestamp('2026-08'), pd.Timestamp('2026-09')]
+
+
+def test_projection_on_a_period_axis():
+    # Repeated month names switch the axis to dates; the projection follows it
+    periods = PERIODS + ['2026-09']
+    figure = create_combined_monthly_chart(monthly_frame(periods), forecast_frame('2026-10'))
+    projected = [trace for trace in figure.data if 'projected' in trace.name]
+    assert pd.Timestamp(projected[0].x[-1]) == pd.Timestamp('2026-10-01')
+    assert pd.Timestamp(projected[0].x[0]) == pd.Timestamp('2026-09-01')
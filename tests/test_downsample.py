@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.downsample import lttb, min_max
+
+
+def walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.normal(size=n))
+
+
+def reference_lttb(x, y, max_points):
+    """Largest-Triangle-Three-Buckets one point at a time, as published"""
+    n = len(y)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    kept, a = [0], 0
+    for i in range(max_points - 2):
+        low, high = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x, next_y = x[high:edges[i + 2]].mean(), y[high:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+        best, best_area = low, -1.0
+        for j in range(low, high):
+            area = abs((x[a] - next_x) * (y[j] - y[a]) - (x[a] - x[j]) * (next_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    return np.array(kept + [n - 1])
+
+
+def test_lttb_matches_the_sequential_algorithm():
+    # Exact LTTB, not an approximation: every kept point agrees
+    for seed, n, max_points in ((0, 20_000, 2_000), (1, 3_653, 500), (2, 1_001, 7)):
+        x, y = np.arange(n, dtype=float), walk(n, seed)
+        assert np.array_equal(lttb(x, y, max_points), reference_lttb(x, y, max_points))
+
+
+def test_lttb_keeps_ends_and_spikes():
+    y = walk(20_000)
+    y[5_000], y[12_345] = y.max() + 100, y.min() - 100
+    kept = lttb(np.arange(len(y)), y, 2_000)
+    assert len(kept) == 2_000 and kept[0] == 0 and kept[-1] == len(y) - 1
+    assert (np.diff(kept) > 0).all()
+    assert 5_000 in kept and 12_345 in kept
+
+
+def test_lttb_follows_the_line():
+    y = walk(20_000, seed=1)
+    x = pd.Series(pd.date_range('2015-01-01', periods=len(y), freq='h'))
+    kept = lttb(x, y, 2_000)
+    position = np.arange(len(y))
+    # One point in ten, interpolated back, stays close to the line; every tenth point would not
+    error = np.abs(np.interp(position, kept, y[kept]) - y).mean()
+    every_tenth = np.abs(np.interp(position, position[::10], y[::10]) - y).mean()
+    assert error < every_tenth * 1.5
+
+
+def test_short_series_are_kept_whole():
+    assert list(lttb(np.arange(5), walk(5), 10)) == list(range(5))
+    assert list(min_max(walk(5), 10)) == list(range(5))
+
+
+def test_min_max_keeps_each_bucket_extremes():
+    y = walk(10_000, seed=2)
+    kept = min_max(y, 200)
+    assert y[kept].max() == y.max() and y[kept].min() == y.min()
+    assert len(kept) <= 200
@@ -0,0 +1,26 @@
+import threading
+from types import SimpleNamespace
+
+from zen_dashboard.estates import EstateRegistry
+
+
+def test_estate_still_loading_is_not_evicted():
+    release = threading.Event()
+
+    def load(estate, progress, previous):
+        if estate == 'slow':
+            release.wait(5)
+        return {'fingerprints': {estate: 1}}
+
+    registry = EstateRegistry(load, ['slow', 'big', 'other'], interval=3600, budget_bytes=1)
+    slow = registry.refresher('slow')
+    big = registry.refresher('big')
+    assert big.wait_for_data(5) is not None
+    # Pretend the loaded version is over budget
+    big.current = SimpleNamespace(nbytes=10)
+    other = registry.refresher('other')
+    assert list(registry._refreshers) == ['slow', 'other']
+    assert registry.evictions == 1
+    release.set()
+    for refresher in (slow, other):
+        refresher.stop()
@@ -0,0 +1,23 @@
+import os
+from types import SimpleNamespace
+
+import pandas as pd
+
+from zen_dashboard.export import ExportStore
+
+
+def version(number):
+    monthly = pd.DataFrame({'Month': ['Apr', 'May'], 'To_Be': [100.0, 200.0 + number]})
+    return SimpleNamespace(key=('', number, 1_700_000_000 + number), artifact={'frames': {'monthly': monthly}},
+                           tables={})
+
+
+def test_pruned_versions_release_their_build_locks(tmp_path):
+    store = ExportStore(str(tmp_path), keep_versions=2)
+    paths = []
+    for number in range(1, 6):
+        paths.append(store.path(version(number), 'monthly', 'csv'))
+        # Prune keeps the newest directories by mtime; spread them out for coarse clocks
+        os.utime(os.path.dirname(paths[-1]), (number, number))
+    assert [os.path.exists(path) for path in paths] == [False, False, False, True, True]
+    assert sorted(store._building) == sorted(paths[-2:])
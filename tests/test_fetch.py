@@ -0,0 +1,112 @@
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from zen_dashboard.fetch import FetchCache
+
+
+class Workbook:
+    """What the stand-in server serves, and the conditional headers it was sent"""
+
+    def __init__(self):
+        self.requests = []
+        self.set(b'first version of the workbook')
+
+    def set(self, content):
+        self.content = content
+        self.etag = f'"v{len(self.requests)}-{len(content)}"'
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+
+@pytest.fixture
+def server():
+    workbook = Workbook()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            workbook.requests.append({'If-None-Match': self.headers.get('If-None-Match'),
+                                      'If-Modified-Since': self.headers.get('If-Modified-Since')})
+            if self.headers.get('If-None-Match') == workbook.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', workbook.etag)
+            self.send_header('Last-Modified', workbook.last_modified)
+            self.send_header('Content-Length', str(len(workbook.content)))
+            self.end_headers()
+            self.wfile.write(workbook.content)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    workbook.url = f'http://127.0.0.1:{httpd.server_port}/workbook.xlsx'
+    yield workbook
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def cache(tmp_path, **kwargs):
+    return FetchCache(cache_dir=str(tmp_path), timeout=(5, 5), session=requests.Session(), **kwargs)
+
+
+def test_fresh_copy_is_served_from_disk(server, tmp_path):
+    first = cache(tmp_path, ttl=600).fetch(server.url)
+    assert first.status == 'downloaded' and first.content == server.content
+    # A new cache object (a restart) reads the same files
+    again = cache(tmp_path, ttl=600).fetch(server.url)
+    assert again.status == 'fresh' and again.content == server.content
+    assert len(server.requests) == 1
+
+
+def test_unchanged_file_is_revalidated_with_a_304(server, tmp_path):
+    fetcher = cache(tmp_path, ttl=0, serve_stale=False)
+    first = fetcher.fetch(server.url)
+    second = fetcher.fetch(server.url)
+    assert second.status == 'revalidated' and second.content == first.content
+    # The validators of the 200 are sent back
+    assert server.requests[1] == {'If-None-Match': first.etag, 'If-Modified-Since': first.last_modified}
+    assert first.etag == server.etag and first.last_modified == server.last_modified
+
+
+def test_changed_file_is_downloaded_again(server, tmp_path):
+    fetcher = cache(tmp_path, ttl=0, serve_stale=False)
+    first = fetcher.fetch(server.url)
+    server.set(b'second version, with more rows')
+    second = fetcher.fetch(server.url)
+    assert second.status == 'downloaded' and second.content == server.content
+    assert second.etag == server.etag != first.etag
+    assert fetcher.fetch(server.url).status == 'revalidated'
+
+
+def test_stale_copy_is_served_while_revalidating_in_background(server, tmp_path):
+    fetcher = cache(tmp_path, ttl=0, serve_stale=True)
+    old = fetcher.fetch(server.url).content
+    server.set(b'second version, with more rows')
+    stale = fetcher.fetch(server.url)
+    assert stale.status == 'stale' and stale.content == old
+    # The background request stores the new bytes for the next fetch
+    deadline = time.time() + 5
+    while (fetcher._inflight or len(server.requests) < 2) and time.time() < deadline:
+        time.sleep(0.01)
+    assert fetcher.fetch(server.url, revalidate=True).status == 'revalidated'
+    assert cache(tmp_path, ttl=600).fetch(server.url).content == server.content
+
+
+def test_bytes_replaced_without_their_metadata_are_not_trusted(server, tmp_path):
+    fetcher = cache(tmp_path, ttl=600)
+    fetcher.fetch(server.url)
+    # A crash after the data file was replaced, before the metadata: same size, other bytes
+    data_path, _ = fetcher._paths(server.url)
+    with open(data_path, 'wb') as f:
+        f.write(b'X' * len(server.content))
+    result = fetcher.fetch(server.url)
+    assert result.status == 'downloaded' and result.content == server.content
+    assert server.requests[-1]['If-None-Match'] is None
@@ -0,0 +1,25 @@
+import pandas as pd
+import pytest
+
+from zen_dashboard import ingest, ledger
+from zen_dashboard.snapshot import FRAME_NAMES, HAS_PARQUET
+
+
+@pytest.fixture
+def nothing_parsed(monkeypatch):
+    frames = tuple(pd.DataFrame({'Period': pd.Series(dtype=str)}) for _ in FRAME_NAMES)
+    monkeypatch.setattr(ingest, 'ingest_workbooks', lambda *args, **kwargs: (frames, []))
+
+
+@pytest.mark.parametrize('name', ['ledger.sqlite', pytest.param('ledger', marks=pytest.mark.skipif(
+    not HAS_PARQUET, reason='pyarrow not installed'))])
+def test_import_of_no_months_into_an_empty_ledger(nothing_parsed, tmp_path, capsys, name):
+    assert ledger.main([str(tmp_path / name), '--sources', 'workbook.xlsx']) == 0
+    assert 'holds no months' in capsys.readouterr().out
+
+
+def test_import_without_sources_is_a_message(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        ledger.main([str(tmp_path / 'ledger.sqlite'), '--sources', ''])
+    assert exit_info.value.code == 1
+    assert 'No workbook sources given' in capsys.readouterr().err
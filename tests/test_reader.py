@@ -0,0 +1,38 @@
+import pytest
+
+from zen_dashboard.reader import HAS_CALAMINE, SHEET_NAME, read_sheet
+
+ENGINES = ['openpyxl', 'pandas', pytest.param('calamine', marks=pytest.mark.skipif(
+    not HAS_CALAMINE, reason='python-calamine is not installed'))]
+
+
+@pytest.fixture
+def offset_workbook(tmp_path):
+    """Sheet1 whose first cell is C3, so the used range starts after blank rows and columns"""
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = SHEET_NAME
+    sheet['C3'] = 'x'
+    sheet['D5'] = 2.5
+    sheet['B6'] = 'last'
+    path = tmp_path / 'offset.xlsx'
+    workbook.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engines_keep_cell_positions(offset_workbook, engine):
+    grid = read_sheet(offset_workbook, engine=engine, max_col=6)
+    reference = read_sheet(offset_workbook, engine='openpyxl', max_col=6)
+    assert grid.shape == reference.shape == (6, 6)
+    assert grid.tolist() == reference.tolist()
+    assert grid[2, 2] == 'x' and grid[4, 3] == 2.5 and grid[5, 1] == 'last'
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_engines_honour_bounds(offset_workbook, engine):
+    grid = read_sheet(offset_workbook, engine=engine, max_row=3, max_col=4)
+    assert grid.shape == (3, 4)
+    assert grid[2, 2] == 'x'
+    assert sum(value is not None for value in grid.ravel()) == 1
@@ -0,0 +1,26 @@
+import threading
+
+from zen_dashboard.refresh import DataRefresher
+
+
+def test_refresh_requested_during_a_load_is_not_lost():
+    loading, release = threading.Event(), threading.Event()
+    loads = []
+
+    def load(progress, previous):
+        loads.append(previous)
+        if len(loads) == 1:
+            loading.set()
+            release.wait(5)
+        return {'fingerprints': {'workbook.xlsx': len(loads)}}
+
+    refresher = DataRefresher(load, interval=3600).start()
+    try:
+        assert loading.wait(5)
+        # Between the first load and the hour-long wait
+        refresher.request_refresh()
+        release.set()
+        with refresher._published:
+            assert refresher._published.wait_for(lambda: len(loads) == 2 and refresher.current.number == 2, timeout=5)
+    finally:
+        refresher.stop()
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from zen_dashboard.cube import vendor_cube
+
+NAMES = ['26th January Celebration', 'HK Services', 'H.K. Services', 'HK  Services',
+         'STP Electricity Bill October 2025', 'STP Electricity Bill November 2025']
+
+
+def vendor_frame(names):
+    return pd.DataFrame({'Period': '2025-10', 'Vendor': names, 'Amount': 100.0})
+
+
+def test_single_dated_name_has_no_alias():
+    cube = vendor_cube(vendor_frame(NAMES))
+    assert '26th January Celebration' in cube.keys
+    assert cube.aliases['26th January Celebration'] == []
+
+
+def test_spelling_variants_are_aliases():
+    cube = vendor_cube(vendor_frame(NAMES))
+    assert cube.aliases['HK Services'] == ['H.K. Services']
+    # Monthly bills of one vendor are not spellings of it
+    assert cube.aliases['STP Electricity Bill'] == []
+    assert cube.total('Amount', keys=['HK Services']) == 300.0
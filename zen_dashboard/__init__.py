@@ -0,0 +1 @@
+"""Data loading and caching helpers for the Zen Estate Financial Dashboard."""
@@ -0,0 +1,168 @@
+"""Render-ready dashboard snapshot: frames, derived tables and figure JSON in one file.
+
+    python app.py build-snapshot [--output dashboard-snapshot.zip] [--sources ...]
+
+builds it without starting Streamlit, e.g. from cron or CI.  With
+``ZEN_ARTIFACT`` pointing at the file, the app only reads and displays it.
+The file is a zip holding ``manifest.json``, ``frames/<name>.parquet``,
+``tables/<name>.parquet``, ``figures/<name>.json`` (Plotly figure JSON) and,
+with a unit register, ``units.parquet``.
+"""
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+import pandas as pd
+
+from zen_dashboard import config
+from zen_dashboard.charts import (create_combined_monthly_chart, create_extra_income_chart, create_vendor_chart,
+                                  create_wing_difference_chart)
+from zen_dashboard.cube import build_cubes
+from zen_dashboard.ingest import ingest_workbooks
+from zen_dashboard.metrics import instrumented, timed
+from zen_dashboard.parser import PARSER_VERSION
+from zen_dashboard.snapshot import FRAME_NAMES
+from zen_dashboard.units import load_units, merge_units, unit_fingerprints, units_in_periods
+from zen_dashboard.views import build_tables, vendor_monthly
+
+# Bump whenever the file layout or the meaning of a table/figure changes
+ARTIFACT_VERSION = 3
+
+DEFAULT_OUTPUT = 'dashboard-snapshot.zip'
+# Vendors drawn separately in the prebuilt vendor chart; the rest are summed
+VENDOR_TOP_N = 10
+
+
+@instrumented('build_figures')
+def build_figures(frames, cubes, tables):
+    """Figure JSON by name, for the whole date range"""
+    df_monthly, df_wings, df_vendors, _, _ = frames
+    figures = {}
+    if not df_monthly.empty:
+        figures['monthly'] = create_combined_monthly_chart(df_monthly, tables.get('forecast')).to_json()
+    if not df_vendors.empty:
+        figures['vendors'] = create_vendor_chart(vendor_monthly(cubes['vendors'], VENDOR_TOP_N)).to_json()
+    if not df_monthly.empty:
+        figures['extra_income'] = create_extra_income_chart(df_monthly).to_json()
+    if not df_wings.empty:
+        figures['wing_difference'] = create_wing_difference_chart(cubes['wings']).to_json()
+    return figures
+
+
+def build_artifact(frames, blocks, units=None):
+    """Artifact dict for the frames and the month blocks they were parsed from
+
+    units (see zen_dashboard.units) are limited to the months of the frames
+    and replace the wing rows they cover.
+    """
+    fingerprints = {block['period']: block.get('fingerprint') for block in blocks}
+    if units is not None:
+        with timed('merge_units'):
+            units = units_in_periods(units, fingerprints)
+            frames = merge_units(frames, units)
+            fingerprints = unit_fingerprints(fingerprints, units)
+    with timed('build_cubes'):
+        cubes = build_cubes(frames, units)
+    with timed('build_tables'):
+        tables = build_tables(frames, cubes, units)
+    return {
+        'version': ARTIFACT_VERSION,
+        'parser_version': PARSER_VERSION,
+        'built_at': time.time(),
+        'fingerprints': fingerprints,
+        'frames': dict(zip(FRAME_NAMES, frames)),
+        'units': units,
+        'tables': tables,
+        'figures': build_figures(frames, cubes, tables),
+        'cubes': cubes,  # in memory only; rebuilt from the frames after read_artifact
+    }
+
+
+def artifact_frames(artifact):
+    """The five frames of an artifact, in loader order"""
+    return tuple(artifact['frames'][name] for name in FRAME_NAMES)
+
+
+def _parquet_bytes(frame):
+    buffer = io.BytesIO()
+    frame.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def write_artifact(artifact, path):
+    """Write artifact to path atomically"""
+    manifest = {key: artifact[key] for key in ('version', 'parser_version', 'built_at', 'fingerprints')}
+    manifest['tables'] = sorted(artifact['tables'])
+    manifest['figures'] = sorted(artifact['figures'])
+    manifest['units'] = artifact.get('units') is not None
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.zip')
+    try:
+        with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('manifest.json', json.dumps(manifest))
+            for name, frame in artifact['frames'].items():
+                archive.writestr(f'frames/{name}.parquet', _parquet_bytes(frame))
+            for name, table in artifact['tables'].items():
+                archive.writestr(f'tables/{name}.parquet', _parquet_bytes(table))
+            for name, figure_json in artifact['figures'].items():
+                archive.writestr(f'figures/{name}.json', figure_json)
+            if manifest['units']:
+                archive.writestr('units.parquet', _parquet_bytes(artifact['units']))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def read_artifact(path):
+    """Artifact dict written by write_artifact; ValueError if it was built by another version"""
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read('manifest.json'))
+        if manifest.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"{path} has snapshot format {manifest.get('version')}, expected {ARTIFACT_VERSION}")
+        artifact = dict(manifest)
+        artifact['frames'] = {name: pd.read_parquet(io.BytesIO(archive.read(f'frames/{name}.parquet')))
+                              for name in FRAME_NAMES}
+        artifact['tables'] = {name: pd.read_parquet(io.BytesIO(archive.read(f'tables/{name}.parquet')))
+                              for name in manifest['tables']}
+        artifact['figures'] = {name: archive.read(f'figures/{name}.json').decode('utf-8')
+                               for name in manifest['figures']}
+        artifact['units'] = pd.read_parquet(io.BytesIO(archive.read('units.parquet'))) if manifest['units'] else None
+    return artifact
+
+
+def build_snapshot(sources, output, max_workers=None, use_snapshots=True, unit_sources=None):
+    """Load sources (and unit registers), build the artifact and write it to output"""
+    frames, blocks = ingest_workbooks(sources, max_workers=max_workers, use_snapshots=use_snapshots,
+                                      with_layout=True, revalidate=True)
+    artifact = build_artifact(frames, blocks, load_units(unit_sources))
+    write_artifact(artifact, output)
+    return artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='app.py build-snapshot',
+                                     description='Build the render-ready dashboard snapshot without Streamlit')
+    parser.add_argument('--output', '-o', default=config.ARTIFACT_PATH or DEFAULT_OUTPUT)
+    parser.add_argument('--sources', default=config.WORKBOOK_SOURCES,
+                        help='comma/newline separated workbook paths, globs or URLs')
+    parser.add_argument('--units', default=config.UNIT_SOURCES.get(config.DEFAULT_ESTATE),
+                        help='unit registers (CSV/Parquet or workbooks with a Units sheet) to roll up into the wings')
+    parser.add_argument('--workers', type=int, default=config.INGEST_WORKERS)
+    parser.add_argument('--no-cache', action='store_true', help='ignore the parsed-frame snapshot cache')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    artifact = build_snapshot(args.sources, args.output, args.workers, use_snapshots=not args.no_cache,
+                              unit_sources=args.units)
+    periods = sorted(artifact['fingerprints'])
+    span = f"{periods[0]} .. {periods[-1]}" if periods else "no months"
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:,.0f} KiB): "
+          f"{len(periods)} months ({span}), {len(artifact['tables'])} tables, "
+          f"{len(artifact['figures'])} figures in {time.perf_counter() - start:.2f} s")
+    return 0
@@ -0,0 +1,231 @@
+"""Plotly figure builders for the dashboard (no Streamlit code).
+
+The time series charts take monthly frames as well as daily or weekly ones
+(with a Date column).  A series longer than ``max_points`` (default
+``ZEN_CHART_MAX_POINTS``) is downsampled on the server first, lines with
+LTTB and bars with min-max (see ``zen_dashboard.downsample``).  The app
+builds a chart per date range, so the points kept are those of the range
+shown.  Line traces longer than ``WEBGL_POINTS`` are drawn with WebGL
+(``Scattergl``).  Labels use ``texttemplate``, formatted by plotly.js, and
+not one Python-formatted string per point.
+"""
+import pandas as pd
+import plotly.graph_objects as go
+
+from zen_dashboard import config
+from zen_dashboard.downsample import lttb, min_max
+from zen_dashboard.layout import period_label
+from zen_dashboard.metrics import instrumented
+from zen_dashboard.views import OTHER_VENDORS
+
+# Line traces with more points are drawn with WebGL instead of SVG
+WEBGL_POINTS = 1000
+# Markers are drawn up to this many points per line, value labels up to this many bars
+MARKER_POINTS = 100
+LABEL_POINTS = 60
+
+
+def time_axis(frame):
+    """x values of a time series frame: its Date column, the Month labels while unique, else each Period's first day"""
+    if 'Date' in frame:
+        return pd.to_datetime(frame['Date'])
+    if frame['Month'].is_unique:
+        return frame['Month']
+    return pd.to_datetime(frame['Period'].astype(str))
+
+
+def line_trace(x, y, max_points, **kwargs):
+    """Line of y over x, LTTB-downsampled beyond max_points (0: never) and drawn with WebGL when long"""
+    x, y = pd.Series(x).reset_index(drop=True), pd.Series(y).reset_index(drop=True)
+    if max_points and len(y) > max_points:
+        kept = lttb(x, y, max_points)
+        x, y = x.iloc[kept], y.iloc[kept]
+    if len(y) > MARKER_POINTS:
+        kwargs['mode'] = 'lines'
+        kwargs.pop('marker', None)
+    trace = go.Scattergl if len(y) > WEBGL_POINTS else go.Scatter
+    return trace(x=x, y=y, **kwargs)
+
+
+def chart_max_points(max_points):
+    return config.CHART_MAX_POINTS if max_points is None else max_points
+
+
+@instrumented('create_vendor_chart')
+def create_vendor_chart(monthly):
+    """Vendor Expenses by month, one stacked bar segment per vendor (monthly: views.vendor_monthly)"""
+    months = [period_label(period) for period in monthly.index]
+    
+    fig = go.Figure()
+    
+    for vendor in monthly.columns:
+        fig.add_trace(go.Bar(
+            x=months,
+            y=monthly[vendor],
+            name=vendor,
+            marker_color='#9e9e9e' if vendor == OTHER_VENDORS else None,
+            hovertemplate='<b>%{fullData.name}</b><br>%{x}: ₹%{y:,.2f}<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title='Vendor Expenses by Month',
+        barmode='stack',
+        xaxis_title='Month',
+        yaxis_title='Amount (INR)',
+        height=520,
+        plot_bgcolor='#E5ECF6',
+        yaxis=dict(tickprefix='₹', tickformat=',.0f'),
+        legend=dict(traceorder='normal')
+    )
+    
+    return fig
+
+
+@instrumented('create_extra_income_chart')
+def create_extra_income_chart(df_monthly, max_points=None):
+    """Extra Income Month-wise Bar Chart; beyond max_points bars, the min and max of each stretch are kept"""
+    fig = go.Figure()
+    
+    x = time_axis(df_monthly).reset_index(drop=True)
+    y = df_monthly['Extra_Income'].reset_index(drop=True)
+    max_points = chart_max_points(max_points)
+    if max_points and len(y) > max_points:
+        kept = min_max(y, max_points)
+        x, y = x.iloc[kept], y.iloc[kept]
+    
+    labels = len(y) <= LABEL_POINTS
+    fig.add_trace(go.Bar(
+        x=x,
+        y=y,
+        marker_color='#FFA15A',
+        texttemplate='₹%{y:,.0f}' if labels else None,
+        textposition='outside' if labels else None,
+        textfont=dict(size=12),
+        hovertemplate='<b>%{x}</b><br>Extra Income: ₹%{y:,.0f}<extra></extra>'
+    ))
+    
+    # Calculate max value for proper y-axis range
+    max_value = df_monthly['Extra_Income'].max()
+    
+    fig.update_layout(
+        title='Extra Income by Month',
+        xaxis_title='Month',
+        yaxis_title='Amount (INR)',
+        height=420,
+        yaxis=dict(
+            tickprefix='₹', 
+            tickformat=',.0f',
+            range=[0, max_value * 1.15]  # Add 15% padding for text visibility
+        )
+    )
+    
+    return fig
+
+
+@instrumented('create_combined_monthly_chart')
+def create_combined_monthly_chart(df_monthly, forecast=None, max_points=None):
+    """Combined Month-wise Line Chart, with the forecast month (see zen_dashboard.forecast) as a dashed segment
+
+    The forecast is monthly, so it is drawn only on a monthly frame (no Date column).
+    """
+    fig = go.Figure()
+    
+    x = time_axis(df_monthly)
+    max_points = chart_max_points(max_points)
+    billed = (df_monthly['To_Be'] > 0).to_numpy()
+    target = None
+    if forecast is not None and not forecast.empty and billed.any() and 'Date' not in df_monthly:
+        period = str(forecast['Period'].iloc[0])
+        periods = df_monthly['Period'].astype(str)
+        if pd.api.types.is_datetime64_any_dtype(x):
+            target = pd.Timestamp(period)
+        elif (periods == period).any():
+            # Already on the axis, not billed yet: the projection ends on that month's x
+            target = x[(periods == period).to_numpy()].iloc[0]
+        elif (periods.str[-2:] == period[-2:]).any():
+            # The month name is on the axis a year earlier: the whole axis goes by date instead
+            x = pd.to_datetime(periods)
+            target = pd.Timestamp(period)
+        else:
+            target = period_label(period).split()[0]
+    # With a projection, To Be and Received stop at the last billed month instead of dropping to 0 after it
+    shown = len(billed) - billed[::-1].argmax() if target is not None else len(billed)
+    for column, name, color in (('To_Be', 'To Be', '#1f77b4'), ('Received', 'Received', '#2ca02c'),
+                                ('Expense', 'Expenses (Total)', '#EF553B')):
+        rows = slice(None, shown) if column != 'Expense' else slice(None)
+        fig.add_trace(line_trace(
+            x.iloc[rows], df_monthly[column].iloc[rows], max_points,
+            mode='lines+markers',
+            name=name,
+            line=dict(color=color, width=3),
+            marker=dict(size=10)
+        ))
+    
+    # Projected segment: from the last billed month to the sums of the per-wing forecasts
+    if target is not None:
+        last = df_monthly[billed].iloc[-1]
+        for column, name, color in (('To_Be', 'To Be (projected)', '#1f77b4'),
+                                    ('Received', 'Received (projected)', '#2ca02c')):
+            fig.add_trace(go.Scatter(
+                x=[x[billed].iloc[-1], target],
+                y=[last[column], forecast[f'Expected_{column}'].sum()],
+                mode='lines+markers',
+                name=name,
+                line=dict(color=color, width=3, dash='dash'),
+                marker=dict(size=10, symbol='circle-open')
+            ))
+    
+    fig.update_layout(
+        title='Combined Month-wise — To Be, Received, Expenses',
+        xaxis_title='Month',
+        yaxis_title='Amount (INR)',
+        height=520,
+        yaxis=dict(tickprefix='₹', tickformat=',.0f')
+    )
+    
+    return fig
+
+
+@instrumented('create_wing_difference_chart')
+def create_wing_difference_chart(wings, start=None, end=None):
+    """Pending/Excess Amount by Wing/Shop over the periods start..end of the wing rollup"""
+    # Total difference per wing, sliced from the rollup (all months by default)
+    wing_totals = wings.totals(start, end)[['Difference']].reset_index()
+    
+    # Flip the values for display (multiply by -1)
+    # So pending (positive) shows below, excess (negative) shows above
+    wing_totals['Display_Value'] = wing_totals['Difference'] * -1
+    
+    # Create color array: Positive original = RED (pending), Negative original = GREEN (excess)
+    colors = []
+    for diff in wing_totals['Difference']:
+        if diff > 0:
+            colors.append('#d62728')  # Red for pending (positive means money owed)
+        elif diff < 0:
+            colors.append('#2ca02c')  # Green for excess (negative means overpaid)
+        else:
+            colors.append('#9e9e9e')  # Gray
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=wing_totals['Wing'],
+        y=wing_totals['Display_Value'],  # Use flipped values
+        marker_color=colors,
+        customdata=wing_totals['Difference'],
+        texttemplate='₹%{customdata:,.2f}',  # Show original values in labels
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Difference: ₹%{customdata:,.2f}<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title='Pending (red) / Excess (green)',
+        xaxis_title='Wing / Shop',
+        yaxis_title='Amount (INR)',
+        height=520,
+        plot_bgcolor='#E5ECF6',
+        yaxis=dict(tickprefix='₹', tickformat=',.2f'),
+        margin=dict(t=48, r=24, b=96, l=56)
+    )
+    
+    return fig
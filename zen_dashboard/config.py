@@ -0,0 +1,120 @@
+"""Runtime settings, overridable through environment variables."""
+import json
+import os
+import tempfile
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# GitHub raw file URL - UPDATE THIS with your actual file URL
+GITHUB_EXCEL_URL = os.environ.get(
+    "ZEN_EXCEL_URL",
+    "https://raw.githubusercontent.com/dhootmahesh28/zen-estate-dashboard/master/Zen_Estate_Combined_Expenses_Q1.xlsx",
+)
+
+# All workbooks to show, e.g. one per quarter: comma/newline separated paths, globs or URLs.
+# A month present in several workbooks is taken from the last one listed.
+WORKBOOK_SOURCES = os.environ.get("ZEN_WORKBOOKS", GITHUB_EXCEL_URL)
+
+
+def _estates(value):
+    """{estate id: workbook sources} from a JSON file, or 'id=sources' entries separated by ';' or newlines"""
+    if not value:
+        return {"default": WORKBOOK_SOURCES}
+    if os.path.isfile(value):
+        with open(value, encoding="utf-8") as f:
+            return {str(estate): sources for estate, sources in json.load(f).items()}
+    estates = {}
+    for entry in value.replace("\n", ";").split(";"):
+        if entry.strip():
+            estate, _, sources = entry.partition("=")
+            estates[estate.strip()] = sources.strip()
+    return estates
+
+
+# Estates (housing societies) served by this process, each with its own workbooks; picked with ?estate=<id>
+ESTATES = _estates(os.environ.get("ZEN_ESTATES", ""))
+DEFAULT_ESTATE = os.environ.get("ZEN_DEFAULT_ESTATE") or next(iter(ESTATES))
+
+
+def _unit_sources(value):
+    """{estate id: unit register sources} from 'id=sources' entries separated by ';' (plain sources: default estate)"""
+    sources = {}
+    for entry in value.replace("\n", ";").split(";"):
+        estate, _, rest = entry.partition("=")
+        if rest and estate.strip() in ESTATES:
+            sources[estate.strip()] = rest.strip()
+        elif entry.strip():
+            sources[DEFAULT_ESTATE] = ",".join(filter(None, (sources.get(DEFAULT_ESTATE), entry.strip())))
+    return sources
+
+
+# Unit (flat/shop) registers rolled up into the wing rows: CSV/Parquet files or workbooks with a Units sheet
+# (see zen_dashboard.units); without one the dashboard stops at the wing/shop totals of Sheet1
+UNIT_SOURCES = _unit_sources(os.environ.get("ZEN_UNITS", ""))
+
+# Memory for the loaded data of all estates; the least recently viewed are unloaded beyond it (0 = no limit)
+CACHE_BUDGET_BYTES = int(_env_float("ZEN_CACHE_BUDGET_MB", 512) * 1024 * 1024)
+
+# Months of history loaded from a SQLite/Parquet ledger source, the latest ones (0 = all; see zen_dashboard.ledger)
+HISTORY_MONTHS = int(_env_float("ZEN_HISTORY_MONTHS", 0))
+
+# Worker processes used to parse several workbooks (default: one per CPU)
+INGEST_WORKERS = int(_env_float("ZEN_INGEST_WORKERS", 0)) or None
+
+# Where downloaded workbooks (and their ETag/Last-Modified) are kept between restarts
+CACHE_DIR = os.environ.get("ZEN_CACHE_DIR", os.path.join(tempfile.gettempdir(), "zen-estate-cache"))
+
+# Seconds a downloaded workbook is trusted before it is revalidated with GitHub
+FETCH_TTL = _env_float("ZEN_FETCH_TTL", 600.0)
+
+# (connect, read) timeouts in seconds for the download
+FETCH_TIMEOUT = (_env_float("ZEN_CONNECT_TIMEOUT", 5.0), _env_float("ZEN_READ_TIMEOUT", 30.0))
+
+# Seconds between background data refreshes (each one revalidates every URL source)
+REFRESH_INTERVAL = _env_float("ZEN_REFRESH_INTERVAL", FETCH_TTL)
+
+# Return the expired copy immediately and revalidate it in the background
+SERVE_STALE = _env_bool("ZEN_SERVE_STALE", True)
+
+# Parsed-frame snapshots (see zen_dashboard.snapshot)
+SNAPSHOT_DIR = os.environ.get("ZEN_SNAPSHOT_DIR", os.path.join(CACHE_DIR, "snapshots"))
+SNAPSHOT_MAX_ENTRIES = int(_env_float("ZEN_SNAPSHOT_MAX_ENTRIES", 8))
+SNAPSHOT_MAX_BYTES = int(_env_float("ZEN_SNAPSHOT_MAX_BYTES", 64 * 1024 * 1024))
+
+# Sheet reader: 'auto' (calamine when installed, else streaming openpyxl), 'openpyxl', 'calamine' or 'pandas'
+READ_ENGINE = os.environ.get("ZEN_READ_ENGINE", "auto")
+
+# Prebuilt render-ready snapshot (python app.py build-snapshot); when set the app only reads this file
+ARTIFACT_PATH = os.environ.get("ZEN_ARTIFACT", "")
+
+# Port of the localhost /metrics endpoint (Prometheus text format); 0 = off
+METRICS_PORT = int(_env_float("ZEN_METRICS_PORT", 0))
+
+# Always show the diagnostics panel (otherwise only with ?diagnostics=1 in the URL)
+DIAGNOSTICS = _env_bool("ZEN_DIAGNOSTICS", False)
+
+# Loaded Plotly figures kept in memory across reruns and sessions (LRU, see zen_dashboard.figures)
+FIGURE_CACHE_ENTRIES = int(_env_float("ZEN_FIGURE_CACHE_ENTRIES", 64))
+
+# Report downloads, written on first request and kept per data version (see zen_dashboard.export)
+EXPORT_DIR = os.environ.get("ZEN_EXPORT_DIR", os.path.join(CACHE_DIR, "exports"))
+
+# Directory for static HTML reports, <estate>.html, rewritten when the data changes ('' = off; see zen_dashboard.report)
+REPORT_DIR = os.environ.get("ZEN_REPORT_DIR", "")
+
+# Points per chart trace beyond which a time series is downsampled on the server (0 = never; see zen_dashboard.charts)
+CHART_MAX_POINTS = int(_env_float("ZEN_CHART_MAX_POINTS", 2000))
+
+# Store amounts as float32 (half the memory, ~7 significant digits; see zen_dashboard.schema)
+FLOAT32 = _env_bool("ZEN_FLOAT32", False)
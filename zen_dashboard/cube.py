@@ -0,0 +1,180 @@
+"""Pre-aggregated period x key x metric rollups, built once per data version.
+
+A ``Rollup`` holds a dense float64 array ``values[period, key, metric]`` and
+its running sum over periods, ``prefix[i] = values[:i].sum(axis=0)``.  The
+total of any period range is then ``prefix[end] - prefix[start]``: O(keys x
+metrics) whatever the number of months, and O(1) per key and metric.
+
+``wing_cube`` rolls up the wing rows (To_Be, Received, Difference) and the
+fines deducted from them (per type and in total, by the same rules as the
+fine-adjusted wing table); ``income_cube`` the extra income per source;
+``vendor_cube`` the bills per vendor, spelling variants merged (see
+``zen_dashboard.vendors``); ``unit_cube`` the bills of every flat or shop of a
+unit register (see ``zen_dashboard.units``).
+Periods are 'YYYY-MM' strings, so a range is given by its first and last
+period, both inclusive; ``None`` means open-ended.
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.units import UNIT_METRICS
+from zen_dashboard.vendors import canonical_vendors, display_name
+from zen_dashboard.views import EXTRA_INCOME_SOURCES, FINE_LABELS, fine_amounts
+
+WING_METRICS = ('To_Be', 'Received', 'Difference', *FINE_LABELS, 'Fines')
+# Amounts carry paise; rounding results to this many decimals drops the float noise of prefix differences
+DECIMALS = 4
+
+
+class Rollup:
+    """Sums of values[period, key, metric] over period ranges and key subsets"""
+
+    def __init__(self, periods, keys, metrics, values, key_name='Key', aliases=None):
+        self.periods = np.asarray(periods, dtype=object)
+        self.keys = list(keys)
+        self.metrics = list(metrics)
+        self.key_name = key_name
+        self.aliases = aliases or {}  # key -> other labels merged into it
+        self._key_index = {key: i for i, key in enumerate(self.keys)}
+        self._metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+        self.values = values
+        self.prefix = np.zeros((len(self.periods) + 1,) + values.shape[1:])
+        np.cumsum(values, axis=0, out=self.prefix[1:])
+
+    @classmethod
+    def from_rows(cls, periods, keys, metrics, row_periods, row_keys, row_values, key_name='Key', aliases=None):
+        """Rollup of rows (one period, one key and one value per metric each); repeated cells are added"""
+        period_index = pd.Index(periods).get_indexer(row_periods)
+        key_index = pd.Index(keys).get_indexer(row_keys)
+        return cls.from_codes(periods, keys, metrics, period_index, key_index, row_values, key_name, aliases)
+
+    @classmethod
+    def from_codes(cls, periods, keys, metrics, period_codes, key_codes, row_values, key_name='Key', aliases=None):
+        """Rollup of rows given by their positions in periods and keys: one np.bincount per metric"""
+        cells = np.asarray(period_codes, dtype=np.int64) * len(keys) + np.asarray(key_codes, dtype=np.int64)
+        row_values = np.asarray(row_values, dtype=float).reshape(len(cells), len(metrics))
+        size = len(periods) * len(keys)
+        values = np.column_stack([np.bincount(cells, weights=row_values[:, m], minlength=size)
+                                  for m in range(len(metrics))]) if size else np.zeros((0, len(metrics)))
+        return cls(periods, keys, metrics, values.reshape(len(periods), len(keys), len(metrics)), key_name, aliases)
+
+    def period_range(self, start=None, end=None):
+        """[i, j) positions of the periods from start to end (inclusive)"""
+        i = 0 if start is None else int(np.searchsorted(self.periods, start, side='left'))
+        j = len(self.periods) if end is None else int(np.searchsorted(self.periods, end, side='right'))
+        return i, max(i, j)
+
+    def _key_positions(self, keys):
+        return [self._key_index[key] for key in keys if key in self._key_index]
+
+    def totals(self, start=None, end=None, keys=None):
+        """(key x metric) DataFrame of the sums over the period range"""
+        i, j = self.period_range(start, end)
+        sums = self.prefix[j] - self.prefix[i]
+        keys = self.keys if keys is None else [self.keys[p] for p in self._key_positions(keys)]
+        if len(keys) != len(self.keys):
+            sums = sums[[self._key_index[key] for key in keys]]
+        return pd.DataFrame(np.round(sums, DECIMALS), index=pd.Index(keys, name=self.key_name),
+                            columns=self.metrics)
+
+    def total(self, metric, start=None, end=None, keys=None):
+        """Sum of one metric over the period range and keys (default: all)"""
+        i, j = self.period_range(start, end)
+        sums = self.prefix[j, :, self._metric_index[metric]] - self.prefix[i, :, self._metric_index[metric]]
+        if keys is not None:
+            sums = sums[self._key_positions(keys)]
+        return round(float(sums.sum()), DECIMALS)
+
+    def by_period(self, metric, start=None, end=None, keys=None):
+        """Series of one metric per period in the range, summed over keys (default: all)"""
+        i, j = self.period_range(start, end)
+        column = self.values[i:j, :, self._metric_index[metric]]
+        if keys is not None:
+            column = column[:, self._key_positions(keys)]
+        return pd.Series(np.round(column.sum(axis=1), DECIMALS), index=pd.Index(self.periods[i:j], name='Period'),
+                         name=metric)
+
+    def top(self, metric, n, start=None, end=None):
+        """The n keys with the largest sum of metric over the period range, largest first"""
+        i, j = self.period_range(start, end)
+        sums = self.prefix[j, :, self._metric_index[metric]] - self.prefix[i, :, self._metric_index[metric]]
+        positions = heapq.nlargest(n, range(len(self.keys)), key=sums.__getitem__)
+        return [self.keys[p] for p in positions]
+
+    def matrix(self, metric, start=None, end=None, keys=None):
+        """(period x key) DataFrame of one metric over the period range"""
+        i, j = self.period_range(start, end)
+        keys = self.keys if keys is None else [self.keys[p] for p in self._key_positions(keys)]
+        column = self.values[i:j, [self._key_index[key] for key in keys], self._metric_index[metric]]
+        return pd.DataFrame(np.round(column, DECIMALS), index=pd.Index(self.periods[i:j], name='Period'),
+                            columns=pd.Index(keys, name=self.key_name))
+
+
+def wing_cube(df_wings, df_fines):
+    """Rollup of period x wing x WING_METRICS"""
+    periods = sorted(pd.unique(np.asarray(df_wings['Period'], dtype=object)))
+    wings = sorted(pd.unique(np.asarray(df_wings['Wing'], dtype=object)))
+    fines = fine_amounts(df_wings, df_fines)
+    row_values = np.column_stack([
+        df_wings[['To_Be', 'Received', 'Difference']].to_numpy(dtype=float),
+        fines[[*FINE_LABELS, 'Fine_Amount']].to_numpy(dtype=float),
+    ])
+    return Rollup.from_rows(periods, wings, WING_METRICS, np.asarray(df_wings['Period'], dtype=object),
+                            np.asarray(df_wings['Wing'], dtype=object), row_values, key_name='Wing')
+
+
+def income_cube(df_extra_income_breakdown):
+    """Rollup of period x extra income source x Amount"""
+    frame = df_extra_income_breakdown
+    periods = np.asarray(frame['Period'], dtype=object)
+    values = frame[EXTRA_INCOME_SOURCES].to_numpy(dtype=float)
+    rows = len(frame) * len(EXTRA_INCOME_SOURCES)
+    return Rollup.from_rows(sorted(pd.unique(periods)), EXTRA_INCOME_SOURCES, ['Amount'],
+                            np.repeat(periods, len(EXTRA_INCOME_SOURCES)),
+                            np.tile(np.array(EXTRA_INCOME_SOURCES, dtype=object), len(frame)),
+                            values.reshape(rows, 1), key_name='Source')
+
+
+def vendor_cube(df_vendors):
+    """Rollup of period x vendor x Amount, spelling variants of a vendor under one canonical name"""
+    codes, names = pd.factorize(df_vendors['Vendor'])
+    names = np.asarray(names, dtype=object)
+    counts = dict(zip(names, np.bincount(codes, minlength=len(names))))
+    canonical = canonical_vendors(names, counts)
+    # Other spellings of each vendor; dated bill names ("... October 2025") are not spellings.  Both sides drop
+    # dates: a single-name vendor keeps its dates in the canonical name ("26th January Celebration")
+    aliases = {}
+    for name in sorted(canonical):
+        spellings = aliases.setdefault(canonical[name], [])
+        spelling = display_name(name, drop_dates=True)
+        if spelling != display_name(canonical[name], drop_dates=True) and spelling not in spellings:
+            spellings.append(spelling)
+    row_periods = np.asarray(df_vendors['Period'], dtype=object)
+    # One canonical lookup per distinct name, then a take per row
+    row_vendors = np.array([canonical[name] for name in names], dtype=object)[codes]
+    return Rollup.from_rows(sorted(pd.unique(row_periods)), sorted(aliases), ['Amount'], row_periods, row_vendors,
+                            df_vendors[['Amount']].to_numpy(dtype=float), key_name='Vendor', aliases=aliases)
+
+
+def unit_cube(units):
+    """Rollup of period x unit x UNIT_METRICS of the typed unit rows (see zen_dashboard.units)"""
+    return Rollup.from_codes(list(units['Period'].cat.categories), list(units['Unit'].cat.categories), UNIT_METRICS,
+                             units['Period'].cat.codes, units['Unit'].cat.codes,
+                             units[list(UNIT_METRICS)].to_numpy(dtype=float), key_name='Unit')
+
+
+def build_cubes(frames, units=None):
+    """{'wings': ..., 'income': ..., 'vendors': ..., 'units': ...} rollups of whatever has rows"""
+    _, df_wings, df_vendors, df_extra_income_breakdown, df_fines = frames
+    cubes = {}
+    if not df_wings.empty:
+        cubes['wings'] = wing_cube(df_wings, df_fines)
+    if not df_extra_income_breakdown.empty:
+        cubes['income'] = income_cube(df_extra_income_breakdown)
+    if not df_vendors.empty:
+        cubes['vendors'] = vendor_cube(df_vendors)
+    if units is not None and not units.empty:
+        cubes['units'] = unit_cube(units)
+    return cubes
@@ -0,0 +1,87 @@
+"""Several estates (housing societies) served from one process.
+
+Each estate has its own workbooks and its own ``DataRefresher``, so its own
+numbered data versions; all of them share the process, its imports and the
+process-wide caches (figures and exports are keyed by estate).  An estate is
+loaded when it is first viewed.  The registry keeps estates in order of their
+last view, and on every view it checks the memory of the loaded versions
+(``DataVersion.nbytes``) against the budget.  While they exceed it, the least
+recently viewed estates are stopped and dropped; the estate being viewed and
+estates still loading their first version are never dropped.  A dropped estate loads again on its next view, from its
+parsed snapshot on disk when the workbooks have not changed.  A session still
+rendering a dropped version keeps it until its rerun ends.
+"""
+import functools
+import logging
+import threading
+from collections import OrderedDict
+
+from zen_dashboard.metrics import count_cache
+from zen_dashboard.refresh import DataRefresher
+
+logger = logging.getLogger(__name__)
+
+
+def version_bytes(version):
+    return version.nbytes if version is not None else 0
+
+
+class EstateRegistry:
+    """One DataRefresher per viewed estate, within a memory budget for their data (0 = no limit)"""
+
+    def __init__(self, load, estates, interval, budget_bytes=0):
+        self._load = load  # load(estate, progress, previous artifact or None) -> artifact
+        self.estates = list(estates)
+        self.interval = interval
+        self.budget_bytes = budget_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._refreshers = OrderedDict()  # estate -> DataRefresher, least recently viewed first
+
+    def refresher(self, estate):
+        """Running refresher of the estate, started on its first view; KeyError for an unknown estate"""
+        if estate not in self.estates:
+            raise KeyError(f"Unknown estate {estate!r}")
+        with self._lock:
+            refresher = self._refreshers.get(estate)
+            if refresher is None:
+                refresher = DataRefresher(functools.partial(self._load, estate), self.interval, estate)
+                self._refreshers[estate] = refresher
+            self._refreshers.move_to_end(estate)
+            evicted = self._evict()
+        count_cache('estate', 'hit' if refresher.current is not None else 'miss')
+        for old in evicted:
+            old.stop()
+            logger.info("Unloaded estate %s to stay within the cache budget", old.estate)
+        return refresher.start()
+
+    def _evict(self):
+        """Remove the least recently viewed refreshers while their data exceeds the budget (lock held)"""
+        if not self.budget_bytes:
+            return []
+        total = sum(version_bytes(r.current) for r in self._refreshers.values())
+        evicted = []
+        # The last entry is the estate being viewed
+        for estate in list(self._refreshers)[:-1]:
+            if total <= self.budget_bytes:
+                break
+            if self._refreshers[estate].current is None:
+                # Still loading its first version: it holds no counted memory, and a viewer is waiting on it
+                continue
+            refresher = self._refreshers.pop(estate)
+            total -= version_bytes(refresher.current)
+            evicted.append(refresher)
+        self.evictions += len(evicted)
+        return evicted
+
+    def stats(self):
+        """Loaded estates, the memory of their data, the budget and the estates unloaded so far"""
+        with self._lock:
+            loaded = {estate: version_bytes(r.current) for estate, r in self._refreshers.items()}
+        return {
+            'estates': len(self.estates),
+            'loaded': len(loaded),
+            'bytes': sum(loaded.values()),
+            'budget_bytes': self.budget_bytes,
+            'evictions': self.evictions,
+        }
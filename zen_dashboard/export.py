@@ -0,0 +1,171 @@
+"""Report downloads: every frame and the fine-adjusted wing table as CSV, Parquet, XLSX or one zip.
+
+Nothing is serialized until a download is requested.  Each export is written
+once per data version to ``EXPORT_DIR/<estate>/<version>/`` and every later
+download of it reads that file.  Building streams to disk: CSV in chunks of
+rows, the workbook through openpyxl's write-only mode and the zip one member
+at a time from the files already written, so a large export is never held in
+memory while it is built.  Only the newest ``KEEP_VERSIONS`` directories of
+each estate are kept.
+"""
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+
+import pandas as pd
+
+from zen_dashboard import config
+from zen_dashboard.metrics import timed
+from zen_dashboard.snapshot import HAS_PARQUET
+
+logger = logging.getLogger(__name__)
+
+# Exported tables, in download order: name -> sheet / button label
+EXPORT_TABLES = {
+    'monthly': 'Monthly Summary',
+    'wings': 'Wing Data',
+    'wing_detail': 'Wing Data (after fines)',
+    'vendors': 'Vendor Data',
+    'vendor_totals': 'Vendor Totals',
+    'extra_income_breakdown': 'Extra Income',
+    'fines': 'Fines',
+    'forecast': 'Collection Forecast',
+    'unit_forecast': 'Unit Arrears',
+}
+# Per-table formats; 'xlsx' and 'zip' hold every table and are requested under the name ALL_TABLES
+ALL_TABLES = 'report'
+TABLE_FORMATS = ('csv', 'parquet') if HAS_PARQUET else ('csv',)
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'zip': 'application/zip',
+}
+CSV_CHUNK_ROWS = 50_000
+KEEP_VERSIONS = 2
+
+
+def export_tables(data):
+    """{name: frame} of a DataVersion, for the tables that exist"""
+    tables = dict(data.artifact['frames'])
+    for name in ('wing_detail', 'vendor_totals', 'forecast', 'unit_forecast'):
+        if name in data.tables:
+            tables[name] = data.tables[name]
+    return {name: tables[name] for name in EXPORT_TABLES if name in tables and not tables[name].empty}
+
+
+def write_csv(frame, path):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for start in range(0, max(len(frame), 1), CSV_CHUNK_ROWS):
+            frame.iloc[start:start + CSV_CHUNK_ROWS].to_csv(f, index=False, header=start == 0)
+
+
+def write_parquet(frame, path):
+    frame.to_parquet(path, index=False)
+
+
+def _cell(value):
+    # openpyxl cannot write NaN/NA; numpy scalars are passed as Python numbers
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def write_xlsx(tables, path):
+    """One sheet per table, rows appended as they are read"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    for name, frame in tables.items():
+        sheet = workbook.create_sheet(EXPORT_TABLES[name][:31])
+        sheet.append([str(column) for column in frame.columns])
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append([_cell(value) for value in row])
+    workbook.save(path)
+
+
+class ExportStore:
+    """Export files of the recent data versions, built on first request"""
+
+    def __init__(self, directory, keep_versions=KEEP_VERSIONS):
+        self.directory = directory
+        self.keep_versions = keep_versions
+        self._lock = threading.Lock()
+        self._building = {}  # path -> lock, so two sessions never build the same file
+
+    def _version_dir(self, data_key):
+        estate, number, built_at = data_key
+        return os.path.join(self.directory, estate or 'default', f"v{number}-{int(built_at * 1000)}")
+
+    def file_name(self, name, fmt):
+        """Download file name; the workbook and the bundle are named after the whole report"""
+        return f"{name}.{fmt}" if fmt in TABLE_FORMATS else f"zen_estate_report.{fmt}"
+
+    def path(self, data, name, fmt):
+        """Path of the export, building it (and what it is made of) if needed"""
+        directory = self._version_dir(data.key)
+        path = os.path.join(directory, self.file_name(name, fmt))
+        with self._lock:
+            lock = self._building.setdefault(path, threading.Lock())
+        with lock, timed(f'export:{fmt}') as stage:
+            if os.path.exists(path):
+                stage['cache'] = 'hit'
+            else:
+                stage['cache'] = 'miss'
+                if not os.path.isdir(directory):
+                    os.makedirs(directory, exist_ok=True)
+                    self._prune(os.path.dirname(directory))
+                self._build(data, name, fmt, path)
+            stage['bytes'] = os.path.getsize(path)
+        return path
+
+    def read(self, data, name, fmt):
+        """Bytes of the export (what st.download_button hands to the browser)"""
+        with open(self.path(data, name, fmt), 'rb') as f:
+            return f.read()
+
+    def _build(self, data, name, fmt, path):
+        tables = export_tables(data)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-', suffix=f'.{fmt}')
+        os.close(fd)
+        try:
+            if fmt == 'csv':
+                write_csv(tables[name], tmp)
+            elif fmt == 'parquet':
+                write_parquet(tables[name], tmp)
+            elif fmt == 'xlsx':
+                write_xlsx(tables, tmp)
+            elif fmt == 'zip':
+                # Every table in every format plus the workbook, copied in from their own exports
+                members = [(table, table_fmt) for table in tables for table_fmt in TABLE_FORMATS]
+                members.append((ALL_TABLES, 'xlsx'))
+                with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for table, member_fmt in members:
+                        archive.write(self.path(data, table, member_fmt), self.file_name(table, member_fmt))
+            else:
+                raise ValueError(f"Unknown export format {fmt!r}")
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _prune(self, estate_dir):
+        """Remove all but the newest keep_versions version directories of one estate"""
+        try:
+            versions = [entry for entry in os.scandir(estate_dir) if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        versions.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in versions[self.keep_versions:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            with self._lock:
+                for path in [path for path in self._building if os.path.dirname(path) == entry.path]:
+                    del self._building[path]
+            logger.info("Removed old exports %s", entry.path)
+
+
+EXPORTS = ExportStore(config.EXPORT_DIR)
@@ -0,0 +1,200 @@
+"""Disk-backed workbook download with ETag/Last-Modified revalidation.
+
+The bytes of every URL are kept in ``CACHE_DIR`` together with the validators
+GitHub sent.  Within the TTL the file is served straight from disk; after it a
+conditional request is made, so an unchanged workbook only costs a 304.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from zen_dashboard import config
+from zen_dashboard.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def get_session():
+    """Shared requests.Session with a connection pool and a small retry budget"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retries = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                            allowed_methods=frozenset(["GET"]))
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+@dataclass
+class FetchResult:
+    content: bytes
+    status: str  # 'fresh', 'revalidated' (304), 'downloaded' (200) or 'stale'
+    etag: str = None
+    last_modified: str = None
+    fetched_at: float = 0.0
+
+
+class FetchCache:
+    """Persistent cache of downloaded files, revalidated with conditional GETs"""
+
+    def __init__(self, cache_dir=None, ttl=None, timeout=None, serve_stale=None, session=None):
+        self.cache_dir = cache_dir or config.CACHE_DIR
+        self.ttl = config.FETCH_TTL if ttl is None else ttl
+        self.timeout = timeout or config.FETCH_TIMEOUT
+        self.serve_stale = config.SERVE_STALE if serve_stale is None else serve_stale
+        self.session = session or get_session()
+        self._inflight = set()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + ".bin", base + ".json"
+
+    def _read_entry(self, url):
+        data_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(data_path, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        # The validators only belong to these bytes if the digest matches (see _revalidate)
+        if meta.get("url") != url or meta.get("size") != len(content) or meta.get("sha256") != _digest(content):
+            return None
+        return meta, content
+
+    def _atomic_write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def _write_meta(self, url, meta):
+        _, meta_path = self._paths(url)
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def _result(self, meta, content, status):
+        return FetchResult(content=content, status=status, etag=meta.get("etag"),
+                           last_modified=meta.get("last_modified"), fetched_at=meta.get("fetched_at", 0.0))
+
+    def fetch(self, url, revalidate=False):
+        """Return the file at url, from disk when possible
+
+        With revalidate, the TTL is ignored and the server is asked right away
+        (still conditionally, and still falling back to the cached copy).
+        """
+        with timed('fetch') as stage:
+            result = self._fetch(url, revalidate)
+            stage['cache'] = result.status
+            stage['bytes'] = len(result.content)
+        return result
+
+    def _fetch(self, url, revalidate):
+        entry = self._read_entry(url)
+        if entry is not None and not revalidate:
+            meta, content = entry
+            if time.time() - meta.get("fetched_at", 0.0) < self.ttl:
+                return self._result(meta, content, "fresh")
+            if self.serve_stale:
+                self._revalidate_in_background(url)
+                return self._result(meta, content, "stale")
+        try:
+            return self._revalidate(url, entry)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            # GitHub unreachable - the last good copy is better than nothing
+            logger.warning("Revalidating %s failed, serving cached copy: %s", url, e)
+            return self._result(entry[0], entry[1], "stale")
+
+    def _revalidate(self, url, entry):
+        headers = {}
+        if entry is not None:
+            meta = entry[0]
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and entry is not None:
+            meta, content = entry
+            meta = dict(meta, fetched_at=time.time())
+            self._write_meta(url, meta)
+            return self._result(meta, content, "revalidated")
+
+        response.raise_for_status()
+        content = response.content
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "size": len(content),
+            "sha256": _digest(content),
+        }
+        data_path, _ = self._paths(url)
+        # Data first, then metadata, each replaced atomically.  A crash in between leaves the old metadata with the
+        # new bytes; its digest no longer matches, so the entry is dropped instead of pairing old validators with it
+        self._atomic_write(data_path, content)
+        self._write_meta(url, meta)
+        return self._result(meta, content, "downloaded")
+
+    def _revalidate_in_background(self, url):
+        with self._lock:
+            if url in self._inflight:
+                return
+            self._inflight.add(url)
+
+        def run():
+            try:
+                self._revalidate(url, self._read_entry(url))
+            except Exception as e:
+                logger.warning("Background revalidation of %s failed: %s", url, e)
+            finally:
+                with self._lock:
+                    self._inflight.discard(url)
+
+        threading.Thread(target=run, name="zen-fetch-revalidate", daemon=True).start()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache():
+    """Process-wide FetchCache built from config"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = FetchCache()
+        return _default_cache
@@ -0,0 +1,67 @@
+"""Process-wide LRU of ready-to-render Plotly figures, keyed by data version.
+
+A data version carries every figure as JSON (see ``artifact.build_figures``),
+so no ``create_*`` builder runs during a rerun.  Turning that JSON back into a
+validated ``go.Figure`` still costs ~25 ms per chart, so the loaded figure is
+kept here under ``(data version, builder, params)`` and shared by every session
+until a newer version pushes it out.  ``st.plotly_chart`` only copies a
+``go.Figure`` (no second validation), so a hit skips figure construction and
+validation completely.  Figures of a date range other than the whole ledger
+are not in the version; they are built on first request (``build``) and kept
+under a key that includes the range.
+"""
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+from zen_dashboard import config
+
+
+class FigureCache:
+    """Bounded LRU of go.Figure objects built from figure JSON"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (figure, size of its JSON)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, figure_json=None, build=None):
+        """(figure, 'hit' | 'miss') for key, loading figure_json (or calling build()) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], 'hit'
+            self.misses += 1
+        # Load outside the lock; two sessions missing at once both load, the last one is kept
+        figure = pio.from_json(figure_json) if figure_json is not None else build()
+        with self._lock:
+            self._entries[key] = (figure, len(figure_json) if figure_json is not None else 0)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure, 'miss'
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Entries, JSON bytes held (of the loaded figures) and lookups so far"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'json_bytes': sum(size for _, size in self._entries.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+            }
+
+
+FIGURES = FigureCache(config.FIGURE_CACHE_ENTRIES)
@@ -0,0 +1,142 @@
+"""Next-month collection forecasts and arrears-risk scores (no Streamlit code).
+
+Every entity (wing, shop or unit) is one column of (period x entity) To_Be
+and Received matrices, such as the wing rollup's ``values``, so each step is a
+NumPy expression over all entities at once instead of a loop per entity:
+
+- billing trend: a least-squares line through the last ``TREND_MONTHS``
+  billed months of each column, in closed form with centred x;
+- collection rate: Received / To_Be of each billed month, capped at
+  ``RATE_CAP`` and smoothed with an exponentially weighted mean (half-life
+  ``RATE_HALF_LIFE`` months);
+- expected collections: the trend's next To_Be times the smoothed rate.
+
+Months without a bill (a block not filled in yet, a unit not yet occupied)
+are left out of every fit.  The forecast month is the one after the last month
+with any bill.
+
+The risk score (0-100) adds, with ``RISK_WEIGHTS``, the recent shortfall
+(a smoothed rate of ``1 - SHORTFALL_SPAN`` or lower counts fully), the
+months of billing outstanding after fines (``1 - exp(-months /
+ARREARS_MONTHS)``) and how far the collection rate fell over the trend window.
+"""
+import numpy as np
+import pandas as pd
+
+TREND_MONTHS = 12
+RATE_HALF_LIFE = 3.0
+RATE_CAP = 1.5
+ROLLING_MONTHS = 3
+SHORTFALL_SPAN = 0.5
+ARREARS_MONTHS = 2.0
+RISK_WEIGHTS = (0.45, 0.4, 0.15)  # shortfall, arrears, falling rate
+# Lowest score of each level, highest first
+RISK_LEVELS = (('High', 50.0), ('Medium', 20.0), ('Low', 0.0))
+FORECAST_COLUMNS = ['Period', 'Expected_To_Be', 'Expected_Received', 'Collection_Rate', 'Rolling_Rate',
+                    'Outstanding', 'Months_Outstanding', 'Risk_Score', 'Risk']
+
+
+def next_period(period):
+    """'2025-12' -> '2026-01'"""
+    year, month = map(int, period.split('-'))
+    return f'{year + month // 12}-{month % 12 + 1:02d}'
+
+
+def _ratio(numerator, denominator, default=np.nan):
+    return np.divide(numerator, denominator, out=np.full(np.shape(numerator), default, dtype=float),
+                     where=denominator != 0)
+
+
+def trend(values, mask):
+    """(next value, slope) per column of a least-squares line through the rows where mask is set
+
+    The next value is the line one row past the last; a column with one
+    masked row gives that value and slope 0, with none 0 and 0.
+    """
+    x = np.arange(len(values), dtype=float)[:, None]
+    weights = mask.astype(float)
+    count = weights.sum(axis=0)
+    x_mean = _ratio((weights * x).sum(axis=0), count, 0.0)
+    y_mean = _ratio((weights * values).sum(axis=0), count, 0.0)
+    dx = (x - x_mean) * weights
+    slope = _ratio((dx * (values - y_mean)).sum(axis=0), (dx * (x - x_mean)).sum(axis=0), 0.0)
+    return y_mean + slope * (len(values) - x_mean), slope
+
+
+def ewma(values, mask, half_life=RATE_HALF_LIFE):
+    """Exponentially weighted mean of each column over the rows where mask is set (NaN with none)"""
+    decay = 0.5 ** (np.arange(len(values))[::-1] / half_life)
+    weights = decay[:, None] * mask
+    return _ratio((weights * values).sum(axis=0), weights.sum(axis=0))
+
+
+def forecast_collections(periods, keys, to_be, received, deductions=None, key_name='Wing'):
+    """Forecast and risk table of every key, highest risk first
+
+    to_be, received and deductions (fines, optional) are (period x key)
+    arrays over the sorted periods.  Period is the forecast month;
+    Collection_Rate the smoothed rate, Rolling_Rate Received / To_Be of the
+    last ROLLING_MONTHS billed months; Outstanding the To_Be - Received -
+    deductions of all months and Months_Outstanding that in months of the
+    average bill.
+    """
+    periods = list(periods)
+    to_be = np.asarray(to_be, dtype=float)
+    received = np.asarray(received, dtype=float)
+    deductions = np.zeros_like(to_be) if deductions is None else np.asarray(deductions, dtype=float)
+    billed_months = np.flatnonzero(to_be.sum(axis=1) > 0)
+    if not len(keys) or not len(billed_months):
+        return pd.DataFrame(columns=[key_name, *FORECAST_COLUMNS])
+    last = billed_months[-1] + 1
+    to_be, received, deductions = to_be[:last], received[:last], deductions[:last]
+    billed = to_be > 0
+    # Keys never billed (e.g. a shop that has not opened) have nothing to forecast
+    keep = billed.any(axis=0)
+    keys = np.asarray(list(keys), dtype=object)[keep]
+    to_be, received, deductions, billed = to_be[:, keep], received[:, keep], deductions[:, keep], billed[:, keep]
+
+    window = slice(max(0, last - TREND_MONTHS), last)
+    expected_to_be, _ = trend(to_be[window], billed[window])
+    expected_to_be = np.maximum(expected_to_be, 0.0)
+    rates = np.minimum(_ratio(received, to_be, 0.0), RATE_CAP)
+    collection_rate = ewma(rates, billed)
+    _, rate_slope = trend(rates[window], billed[window])
+
+    # Last ROLLING_MONTHS billed months of each key
+    recent = billed & (np.cumsum(billed[::-1], axis=0)[::-1] <= ROLLING_MONTHS)
+    rolling_rate = _ratio((received * recent).sum(axis=0), (to_be * recent).sum(axis=0))
+
+    outstanding = (to_be - received - deductions).sum(axis=0)
+    average_bill = _ratio(to_be.sum(axis=0), billed.sum(axis=0), 0.0)
+    months_outstanding = np.maximum(_ratio(outstanding, average_bill, 0.0), 0.0)
+
+    shortfall = np.clip((1 - np.nan_to_num(collection_rate, nan=1.0)) / SHORTFALL_SPAN, 0, 1)
+    arrears = 1 - np.exp(-months_outstanding / ARREARS_MONTHS)
+    falling = np.clip(-rate_slope * min(TREND_MONTHS, last), 0, 1)
+    score = 100 * (RISK_WEIGHTS[0] * shortfall + RISK_WEIGHTS[1] * arrears + RISK_WEIGHTS[2] * falling)
+    thresholds = np.array([threshold for _, threshold in RISK_LEVELS])
+    levels = np.array([level for level, _ in RISK_LEVELS], dtype=object)
+
+    table = pd.DataFrame({
+        key_name: keys,
+        'Period': next_period(periods[last - 1]),
+        'Expected_To_Be': expected_to_be,
+        'Expected_Received': expected_to_be * np.nan_to_num(collection_rate, nan=1.0),
+        'Collection_Rate': collection_rate,
+        'Rolling_Rate': rolling_rate,
+        'Outstanding': outstanding,
+        'Months_Outstanding': months_outstanding,
+        'Risk_Score': score,
+        'Risk': levels[np.argmax(score[:, None] >= thresholds, axis=1)],
+    })
+    table = table.round({'Expected_To_Be': 2, 'Expected_Received': 2, 'Outstanding': 2, 'Months_Outstanding': 2,
+                         'Risk_Score': 1})
+    return table.sort_values('Risk_Score', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def wing_forecast(wings):
+    """forecast_collections of every wing/shop of the wing rollup (see zen_dashboard.cube)"""
+    metric = {name: i for i, name in enumerate(wings.metrics)}
+    return forecast_collections(wings.periods, wings.keys, wings.values[:, :, metric['To_Be']],
+                                wings.values[:, :, metric['Received']], wings.values[:, :, metric['Fines']],
+                                key_name=wings.key_name)
@@ -0,0 +1,87 @@
+"""Re-extract only the month blocks that changed since the previous parse.
+
+Each block is fingerprinted from the cells it covers (every row of the block,
+every column the parser reads) plus its geometry relative to the block start,
+so a block that merely moved down because a month was inserted above keeps its
+fingerprint.  When a workbook changes, blocks whose fingerprint is found in
+the previous parse are copied over from its frames; only the rest go through
+``extract_frames``.
+"""
+import hashlib
+
+import pandas as pd
+
+from zen_dashboard.parser import extract_frames, required_columns
+
+FRAME_COUNT = 5
+
+
+def _relative_geometry(block):
+    start = block['start_row']
+    geometry = []
+    for key in sorted(block):
+        if key in ('start_row', 'end_row', 'fingerprint'):
+            continue
+        value = block[key]
+        if key.endswith('_rows'):
+            value = (value[0] - start, value[1] - start)
+        elif key.endswith('_row'):
+            value = value - start
+        geometry.append((key, value))
+    return geometry
+
+
+def fingerprint_blocks(values, blocks):
+    """Add a 'fingerprint' to every block (in place) and return the blocks"""
+    width = required_columns(blocks)
+    for block in blocks:
+        cells = values[block['start_row']:block['end_row'], :width]
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(_relative_geometry(block)).encode('utf-8'))
+        digest.update(repr(cells.tolist()).encode('utf-8'))
+        block['fingerprint'] = digest.hexdigest()
+    return blocks
+
+
+def _split_by_period(frames, periods):
+    """{period: (five single-month frames)} for the given periods"""
+    wanted = set(periods)
+    parts = {period: [None] * FRAME_COUNT for period in wanted}
+    for kind, frame in enumerate(frames):
+        if frame.empty:
+            continue
+        for period, group in frame.groupby('Period', sort=False):
+            if period in wanted:
+                parts[period][kind] = group
+    return parts
+
+
+def extract_incremental(values, blocks, previous=None):
+    """(frames, changed periods) for fingerprinted blocks, reusing previous=(frames, layout) where unchanged"""
+    reused = set()
+    if previous is not None:
+        old_frames, old_layout = previous
+        # The block title is part of the fingerprint, so a match is always the same period
+        old_fingerprints = {b.get('fingerprint') for b in old_layout or []}
+        reused = {b['period'] for b in blocks if b['fingerprint'] in old_fingerprints}
+
+    changed = [b for b in blocks if b['period'] not in reused]
+    if not reused:
+        return extract_frames(values, blocks), [b['period'] for b in blocks]
+
+    pieces = _split_by_period(old_frames, reused)
+    if changed:
+        fresh = extract_frames(values, changed)
+        pieces.update(_split_by_period(fresh, [b['period'] for b in changed]))
+
+    order = {b['period']: i for i, b in enumerate(blocks)}
+    frames = []
+    for kind in range(FRAME_COUNT):
+        parts = [pieces[b['period']][kind] for b in blocks if pieces[b['period']][kind] is not None]
+        if not parts:
+            frames.append(pd.DataFrame())
+            continue
+        frame = pd.concat(parts, ignore_index=True)
+        frame = frame.iloc[frame['Period'].map(order).argsort(kind='stable')].reset_index(drop=True)
+        frames.append(frame)
+    return tuple(frames), [b['period'] for b in changed]
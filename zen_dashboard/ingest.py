@@ -0,0 +1,166 @@
+"""Loading several workbooks (one per quarter) into one set of frames.
+
+Sources are local paths, glob patterns or http(s) URLs, or SQLite/Parquet
+ledger stores (see ``zen_dashboard.ledger``).  Each workbook is
+fetched and parsed in its own worker process, then the frames are stacked on
+their ``Period`` (YYYY-MM) column.  When two workbooks contain the same month
+the one listed later wins, so a corrected or more complete quarter overrides
+an older copy; globs expand in sorted order, which keeps that deterministic.
+The combined frames get the categorical dtypes of ``zen_dashboard.schema``.
+"""
+import glob
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from zen_dashboard.fetch import default_cache
+from zen_dashboard.ledger import is_ledger, load_ledger
+from zen_dashboard.loader import parse_workbook, read_bytes
+from zen_dashboard.metrics import instrumented
+from zen_dashboard.parser import PARSER_VERSION
+from zen_dashboard.schema import apply_schema
+from zen_dashboard.snapshot import SnapshotCache
+
+FRAME_COUNT = 5
+GLOB_CHARS = set('*?[')
+
+
+class IngestError(Exception):
+    """A workbook could not be fetched or parsed"""
+
+    def __init__(self, source, error):
+        # args must mirror __init__ so the error pickles back from a worker process
+        super().__init__(source, str(error))
+        self.source = source
+        self.error = str(error)
+
+    def __str__(self):
+        return f"{self.source}: {self.error}"
+
+
+def is_url(source):
+    return source.startswith(('http://', 'https://'))
+
+
+def expand_sources(sources):
+    """List of workbook sources, with globs expanded; accepts a list or a comma/newline separated string"""
+    if isinstance(sources, str):
+        sources = sources.replace('\n', ',').split(',')
+    expanded = []
+    for source in sources:
+        source = str(source).strip()
+        if not source:
+            continue
+        if not is_url(source) and GLOB_CHARS & set(source):
+            matches = sorted(glob.glob(os.path.expanduser(source)))
+            if not matches:
+                raise IngestError(source, "pattern matched no files")
+            expanded.extend(matches)
+        else:
+            expanded.append(source)
+    # A file listed twice keeps its last position
+    seen = {}
+    for i, source in enumerate(expanded):
+        seen[source] = i
+    return [s for i, s in enumerate(expanded) if seen[s] == i]
+
+
+def fetch_source(source, revalidate=False):
+    """Raw bytes of a workbook path or URL"""
+    if is_url(source):
+        return default_cache().fetch(source, revalidate=revalidate).content
+    return read_bytes(os.path.expanduser(source))
+
+
+def load_source(source, use_snapshots=True, revalidate=False):
+    """(frames, layout) of one workbook or ledger store; runs in a worker process"""
+    try:
+        if is_ledger(source):
+            return load_ledger(source)
+        content = fetch_source(source, revalidate)
+        snapshots = SnapshotCache(PARSER_VERSION) if use_snapshots else None
+        return parse_workbook(content, snapshots, source=source)
+    except Exception as e:
+        raise IngestError(source, e) from None
+
+
+def _period_owners(results):
+    owner = {}
+    for i, (frames, _) in enumerate(results):
+        for period in frames[0]['Period']:
+            owner[period] = i
+    return owner
+
+
+def combine_layouts(results):
+    """The blocks behind the combined frames, in Period order"""
+    owner = _period_owners(results)
+    blocks = [block for i, (_, layout) in enumerate(results) for block in layout or []
+              if owner.get(block['period']) == i]
+    return sorted(blocks, key=lambda block: block['period'])
+
+
+def combine_frames(results):
+    """Stack per-workbook (frames, layout); for each Period only the last workbook containing it is kept"""
+    owner = _period_owners(results)
+
+    combined = []
+    for kind in range(FRAME_COUNT):
+        parts = []
+        for i, (frames, _) in enumerate(results):
+            frame = frames[kind]
+            if frame.empty:
+                continue
+            parts.append(frame[frame['Period'].map(owner).eq(i).to_numpy()])
+        if not parts:
+            combined.append(pd.DataFrame())
+            continue
+        frame = pd.concat(parts, ignore_index=True)
+        # Stable sort keeps each month's rows in sheet order
+        combined.append(frame.sort_values('Period', kind='stable').reset_index(drop=True))
+    return tuple(combined)
+
+
+@instrumented('ingest_workbooks')
+def ingest_workbooks(sources, max_workers=None, progress=None, use_snapshots=True, with_layout=False,
+                     revalidate=False):
+    """The five dashboard frames for all workbooks in sources
+
+    progress, if given, is called as progress(done, total, source) after each workbook.
+    revalidate asks the server about every URL source instead of trusting the fetch TTL.
+    With with_layout, returns (frames, blocks) where blocks are the month blocks
+    (with their fingerprints) the frames came from.
+    """
+    sources = expand_sources(sources)
+    if not sources:
+        raise ValueError("No workbook sources given")
+    total = len(sources)
+    results = [None] * total
+
+    if total == 1 or max_workers == 1:
+        for i, source in enumerate(sources):
+            results[i] = load_source(source, use_snapshots, revalidate)
+            if progress:
+                progress(i + 1, total, source)
+        return _combined(results, with_layout)
+
+    workers = min(total, max_workers or os.cpu_count() or 1)
+    # spawn, not fork: the Streamlit server process runs threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {pool.submit(load_source, source, use_snapshots, revalidate): i for i, source in enumerate(sources)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            results[i] = future.result()
+            if progress:
+                progress(done, total, sources[i])
+    return _combined(results, with_layout)
+
+
+def _combined(results, with_layout):
+    frames = apply_schema(combine_frames(results))
+    if with_layout:
+        return frames, combine_layouts(results)
+    return frames
@@ -0,0 +1,146 @@
+"""Discovery of the month blocks in Sheet1.
+
+Every month in the ledger is laid out the same way::
+
+    Sep 2025 Vendor Bills (Paid in Oct)                          <- block title (col 0)
+    Sr. No | Date | Vendor Name | Amount Paid | | Wing | A Wing ... | Wing | HK ...   <- header row
+    ...vendor bills...          | Amount received ...
+                                | Total Amount Received per Wing  <- received / extra income row
+                                | Total Amount To be Received     <- to be row
+                                | Pending Amount                  <- difference row
+                                | Total Amount To be Received per Wing | ... Total Sep 2025 Expense | Extra Income  <- summary row
+
+``discover_layout`` finds those markers in one scan of the grid and returns
+one block per month, in the same dict form ``parser.extract_frames`` takes,
+so a workbook with any number of months parses without code changes.
+"""
+import calendar
+import re
+
+import numpy as np
+
+TITLE_COL = 0
+TITLE_RE = re.compile(r'^\s*([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{4})\s+Vendor Bills', re.IGNORECASE)
+MONTH_NUMBERS = {calendar.month_abbr[i].lower(): i for i in range(1, 13)}
+
+# Defaults for when a label is missing from a block
+DEFAULT_LABEL_COL = 5
+DEFAULT_SUMMARY_COLS = {'to_be_col': 6, 'received_col': 9, 'expense_col': 15, 'extra_income_col': 18}
+DEFAULT_FINE_WING_COL = 29
+
+# Columns read from the sheet: everything up to the last fine column (STP, col 33)
+DEFAULT_MAX_COL = DEFAULT_FINE_WING_COL + 5
+
+# Summary row labels -> the value sits in the next column
+SUMMARY_LABELS = (
+    ('total amount to be received', 'to_be_col'),
+    ('total amount received', 'received_col'),
+    ('expense', 'expense_col'),
+    ('extra income', 'extra_income_col'),
+)
+
+_normalize = np.frompyfunc(lambda v: ' '.join(v.split()).lower() if isinstance(v, str) else '', 1, 1)
+
+
+def _find(row, predicate, default=None):
+    for col, cell in enumerate(row):
+        if cell and predicate(cell):
+            return col
+    return default
+
+
+def _summary_cols(row):
+    cols = dict(DEFAULT_SUMMARY_COLS)
+    for col, cell in enumerate(row):
+        for label, key in SUMMARY_LABELS:
+            if cell and label in cell:
+                cols[key] = col + 1
+                break
+    return cols
+
+
+def _parse_block(text, name, year, month, start, end):
+    header = next((r for r in range(start, end) if 'vendor name' in text[r]), None)
+    if header is None:
+        return None
+
+    label_col = _find(text[header], lambda c: c == 'wing', DEFAULT_LABEL_COL)
+    fine_wing_col = DEFAULT_FINE_WING_COL
+    for col in range(label_col + 1, text.shape[1] - 1):
+        if text[header, col] == 'wing' and text[header, col + 1] == 'hk':
+            fine_wing_col = col
+            break
+
+    rows = {}
+    summary_cols = dict(DEFAULT_SUMMARY_COLS)
+    for r in range(header + 1, end):
+        label = text[r, label_col]
+        if not label:
+            continue
+        # The summary row repeats the To Be label, but it is the one carrying the Expense total
+        if label.startswith('total amount to be received') and any('expense' in cell for cell in text[r]):
+            rows.setdefault('summary_row', r)
+            summary_cols = _summary_cols(text[r])
+        elif label.startswith('total amount received'):
+            rows.setdefault('received_row', r)
+        elif label.startswith('total amount to be received'):
+            rows.setdefault('to_be_row', r)
+        elif label.startswith('pending amount'):
+            rows.setdefault('diff_row', r)
+
+    if 'received_row' not in rows or 'summary_row' not in rows:
+        return None
+    # The To Be and Pending rows always follow the Received row; tolerate a missing label
+    rows.setdefault('to_be_row', rows['received_row'] + 1)
+    rows.setdefault('diff_row', rows['received_row'] + 2)
+
+    fine_end = header + 1
+    while fine_end < end and 'wing' in text[fine_end, fine_wing_col]:
+        fine_end += 1
+
+    return {
+        'name': name,
+        'year': year,
+        'period': f'{year:04d}-{month:02d}',
+        'start_row': start,
+        'end_row': end,
+        'header_row': header,
+        **rows,
+        **summary_cols,
+        'income_row': rows['received_row'],
+        'vendor_rows': (header + 1, end),
+        'fine_wing_col': fine_wing_col,
+        'fine_rows': (header + 1, fine_end),
+    }
+
+
+def discover_layout(values):
+    """Month blocks of the Sheet1 grid (an object ndarray), in sheet order"""
+    values = np.asarray(values, dtype=object)
+    if values.ndim != 2 or values.shape[1] <= TITLE_COL:
+        raise ValueError("Sheet1 is empty")
+    text = _normalize(values)
+
+    titles = []
+    for r in np.flatnonzero(text[:, TITLE_COL] != ''):
+        match = TITLE_RE.match(values[r, TITLE_COL])
+        if match and match.group(1).lower() in MONTH_NUMBERS:
+            titles.append((int(r), match.group(1).title(), int(match.group(2)), MONTH_NUMBERS[match.group(1).lower()]))
+    if not titles:
+        raise ValueError("No '<Month> <Year> Vendor Bills' blocks found in Sheet1")
+
+    blocks = []
+    for i, (start, name, year, month) in enumerate(titles):
+        end = titles[i + 1][0] if i + 1 < len(titles) else values.shape[0]
+        block = _parse_block(text, name, year, month, start, end)
+        if block is not None:
+            blocks.append(block)
+    if not blocks:
+        raise ValueError("No complete month blocks found in Sheet1")
+    return blocks
+
+
+def period_label(period):
+    """'2025-09' -> 'Sep 2025'"""
+    year, month = period.split('-')
+    return f'{calendar.month_abbr[int(month)]} {year}'
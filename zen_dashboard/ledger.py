@@ -0,0 +1,273 @@
+"""Ledger stores: the five frames kept in SQLite or a Parquet dataset, queried by period, wing and vendor.
+
+The Excel workbooks stay the way data is entered; ``python app.py import-ledger``
+parses them and writes their months into a store, replacing any month already
+in it, so quarterly workbooks accumulate into one multi-year ledger.  A store
+path can be listed in ``ZEN_WORKBOOKS`` like a workbook and gives the same five
+frames (and per-month fingerprints, so an unchanged store keeps its data
+version).
+
+Reads push filters down to the store: a period range and a set of wings or
+vendors become an indexed SQL query, or Parquet row-group filters.  With
+``ZEN_HISTORY_MONTHS`` the dashboard loads only the latest months of a store
+instead of its whole history.
+
+- ``SQLiteLedger``: one table per frame plus ``blocks`` (period, fingerprint),
+  with indexes on (Period, Wing) and (Period, Vendor).
+- ``ParquetLedger``: a directory of ``<frame>.parquet`` files sorted by
+  Period, written in small row groups so a period filter skips most of them.
+"""
+import argparse
+import contextlib
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from zen_dashboard import config
+from zen_dashboard.snapshot import FRAME_NAMES, HAS_PARQUET
+
+SQLITE_SUFFIXES = ('.sqlite', '.sqlite3', '.db')
+PARQUET_ROW_GROUP = 4096
+# Columns each frame can be filtered on besides Period
+FILTER_COLUMNS = {'wings': 'Wing', 'fines': 'Wing', 'vendors': 'Vendor'}
+SQLITE_INDEXES = {
+    'monthly': ('Period',),
+    'wings': ('Period', 'Wing'),
+    'vendors': ('Period', 'Vendor'),
+    'extra_income_breakdown': ('Period',),
+    'fines': ('Period', 'Wing'),
+}
+
+
+def is_ledger(source):
+    """Whether source is a ledger store rather than a workbook"""
+    source = os.path.expanduser(str(source))
+    return source.lower().endswith(SQLITE_SUFFIXES) or os.path.isfile(os.path.join(source, 'blocks.parquet'))
+
+
+def open_ledger(path):
+    """SQLiteLedger for a .sqlite/.sqlite3/.db path, else ParquetLedger"""
+    path = os.path.expanduser(str(path))
+    return SQLiteLedger(path) if path.lower().endswith(SQLITE_SUFFIXES) else ParquetLedger(path)
+
+
+def period_fingerprints(frames, blocks=None):
+    """{period: fingerprint}: the workbook block's where known, else a hash of the month's rows"""
+    known = {block['period']: block.get('fingerprint') for block in blocks or []}
+    periods = sorted(set(frames[0]['Period'].astype(str))) if not frames[0].empty else []
+    fingerprints = {}
+    for period in periods:
+        if known.get(period):
+            fingerprints[period] = known[period]
+            continue
+        digest = hashlib.md5()
+        for frame in frames:
+            if not frame.empty:
+                rows = frame[frame['Period'].astype(str) == period]
+                digest.update(pd.util.hash_pandas_object(rows.astype(str), index=False).to_numpy().tobytes())
+        fingerprints[period] = digest.hexdigest()
+    return fingerprints
+
+
+def _plain(frame):
+    # Categorical labels are stored as their strings
+    return frame.astype({column: object for column in frame.columns if isinstance(frame[column].dtype,
+                                                                                   pd.CategoricalDtype)})
+
+
+def last_periods_start(periods, months):
+    """First of the latest months periods (None: all of them)"""
+    periods = sorted(periods)
+    return periods[-months] if months and len(periods) > months else None
+
+
+class SQLiteLedger:
+    """Ledger in one SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Commits on success, and always closes
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def write(self, frames, blocks=None):
+        """Store the months of frames, replacing those months if already present"""
+        fingerprints = period_fingerprints(frames, blocks)
+        periods = list(fingerprints)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS blocks (Period TEXT PRIMARY KEY, fingerprint TEXT)')
+            marks = ','.join('?' * len(periods))
+            for name, frame in zip(FRAME_NAMES, frames):
+                if self._has_table(conn, name):
+                    conn.execute(f'DELETE FROM "{name}" WHERE Period IN ({marks})', periods)
+                if not frame.empty:
+                    _plain(frame).to_sql(name, conn, if_exists='append', index=False)
+                    columns = SQLITE_INDEXES[name]
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}_{"_".join(columns).lower()}" '
+                                 f'ON "{name}" ({", ".join(columns)})')
+            conn.executemany('INSERT OR REPLACE INTO blocks VALUES (?, ?)', fingerprints.items())
+        return fingerprints
+
+    @staticmethod
+    def _has_table(conn, name):
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+
+    def periods(self):
+        """{period: fingerprint} of the stored months"""
+        with self._connect() as conn:
+            if not self._has_table(conn, 'blocks'):
+                return {}
+            return dict(conn.execute('SELECT Period, fingerprint FROM blocks ORDER BY Period'))
+
+    def read_frame(self, name, start=None, end=None, keys=None, conn=None):
+        """Rows of one frame in start..end (inclusive) and, for wings/fines/vendors, with a key in keys"""
+        if conn is None:
+            with self._connect() as conn:
+                return self.read_frame(name, start, end, keys, conn)
+        where, params = [], []
+        if start is not None:
+            where.append('Period >= ?')
+            params.append(start)
+        if end is not None:
+            where.append('Period <= ?')
+            params.append(end)
+        if keys is not None and name in FILTER_COLUMNS:
+            keys = list(keys)
+            where.append(f"{FILTER_COLUMNS[name]} IN ({','.join('?' * len(keys))})")
+            params.extend(keys)
+        clause = f" WHERE {' AND '.join(where)}" if where else ''
+        if not self._has_table(conn, name):
+            return pd.DataFrame()
+        # rowid keeps each month's rows in sheet order
+        return pd.read_sql_query(f'SELECT * FROM "{name}"{clause} ORDER BY Period, rowid', conn, params=params)
+
+    def read(self, start=None, end=None, wings=None, vendors=None):
+        """The five frames in start..end, optionally only some wings/vendors"""
+        with self._connect() as conn:
+            return tuple(self.read_frame(name, start, end, vendors if name == 'vendors' else wings, conn)
+                         for name in FRAME_NAMES)
+
+
+class ParquetLedger:
+    """Ledger in a directory of Parquet files, one per frame"""
+
+    def __init__(self, path):
+        if not HAS_PARQUET:
+            raise RuntimeError("A Parquet ledger needs pyarrow (pip install pyarrow)")
+        self.path = path
+
+    def _file(self, name):
+        return os.path.join(self.path, f'{name}.parquet')
+
+    def _write_file(self, frame, name):
+        # Written next to the old file and swapped in, so a reader never sees half a file
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix='.tmp-', suffix='.parquet')
+        os.close(fd)
+        try:
+            frame.to_parquet(tmp, index=False, row_group_size=PARQUET_ROW_GROUP)
+            os.replace(tmp, self._file(name))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def write(self, frames, blocks=None):
+        """Store the months of frames, replacing those months if already present"""
+        os.makedirs(self.path, exist_ok=True)
+        fingerprints = period_fingerprints(frames, blocks)
+        stored = self.periods()
+        for name, frame in zip(FRAME_NAMES, frames):
+            parts = []
+            if os.path.exists(self._file(name)):
+                old = pd.read_parquet(self._file(name))
+                parts.append(old[~old['Period'].isin(list(fingerprints))])
+            if not frame.empty:
+                parts.append(_plain(frame))
+            parts = [part for part in parts if not part.empty]
+            if parts:
+                merged = pd.concat(parts, ignore_index=True).sort_values('Period', kind='stable')
+                self._write_file(merged.reset_index(drop=True), name)
+        stored.update(fingerprints)
+        blocks_frame = pd.DataFrame({'Period': list(stored), 'fingerprint': list(stored.values())})
+        self._write_file(blocks_frame.sort_values('Period').reset_index(drop=True), 'blocks')
+        return fingerprints
+
+    def periods(self):
+        """{period: fingerprint} of the stored months"""
+        if not os.path.exists(self._file('blocks')):
+            return {}
+        blocks = pd.read_parquet(self._file('blocks'))
+        return dict(zip(blocks['Period'], blocks['fingerprint']))
+
+    def read_frame(self, name, start=None, end=None, keys=None):
+        """Rows of one frame in start..end (inclusive) and, for wings/fines/vendors, with a key in keys"""
+        if not os.path.exists(self._file(name)):
+            return pd.DataFrame()
+        filters = []
+        if start is not None:
+            filters.append(('Period', '>=', start))
+        if end is not None:
+            filters.append(('Period', '<=', end))
+        if keys is not None and name in FILTER_COLUMNS:
+            filters.append((FILTER_COLUMNS[name], 'in', list(keys)))
+        return pd.read_parquet(self._file(name), filters=filters or None)
+
+    def read(self, start=None, end=None, wings=None, vendors=None):
+        """The five frames in start..end, optionally only some wings/vendors"""
+        return tuple(self.read_frame(name, start, end, vendors if name == 'vendors' else wings)
+                     for name in FRAME_NAMES)
+
+
+def load_ledger(path, months=None):
+    """(frames, layout) of a ledger source, like ingest.load_source for a workbook
+
+    months (default: ZEN_HISTORY_MONTHS) limits the read to the latest months.
+    """
+    ledger = open_ledger(path)
+    stored = ledger.periods()
+    start = last_periods_start(stored, config.HISTORY_MONTHS if months is None else months)
+    frames = ledger.read(start=start)
+    layout = [{'period': period, 'fingerprint': fingerprint} for period, fingerprint in stored.items()
+              if start is None or period >= start]
+    return frames, layout
+
+
+def main(argv=None):
+    from zen_dashboard.ingest import IngestError, ingest_workbooks
+
+    parser = argparse.ArgumentParser(prog='app.py import-ledger',
+                                     description='Parse workbooks and store their months in a SQLite or Parquet ledger')
+    parser.add_argument('ledger', help='a .sqlite/.sqlite3/.db file or a directory for a Parquet ledger')
+    parser.add_argument('--sources', default=config.WORKBOOK_SOURCES,
+                        help='comma/newline separated workbook paths, globs or URLs')
+    parser.add_argument('--workers', type=int, default=config.INGEST_WORKERS)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        frames, blocks = ingest_workbooks(args.sources, max_workers=args.workers, with_layout=True, revalidate=True)
+    except (IngestError, ValueError) as e:
+        # No sources, a glob that matches nothing or a workbook that does not parse: a message, not a traceback
+        parser.exit(1, f"{parser.prog}: {e}\n")
+    ledger = open_ledger(args.ledger)
+    written = ledger.write(frames, blocks)
+    stored = ledger.periods()
+    elapsed = time.perf_counter() - start
+    if not stored:
+        # Nothing parsed from the sources and nothing stored before
+        print(f"No months found in the workbooks; {args.ledger} holds no months ({elapsed:.2f} s)")
+        return 0
+    print(f"Stored {len(written)} months in {args.ledger}; it now holds {len(stored)} months "
+          f"({min(stored)} .. {max(stored)}) in {elapsed:.2f} s")
+    return 0
@@ -0,0 +1,71 @@
+"""Workbook bytes -> dashboard frames, going through the snapshot cache."""
+import logging
+
+from zen_dashboard import config
+from zen_dashboard.incremental import extract_incremental, fingerprint_blocks
+from zen_dashboard.layout import DEFAULT_MAX_COL, discover_layout
+from zen_dashboard.metrics import timed
+from zen_dashboard.parser import required_columns
+from zen_dashboard.reader import read_sheet
+from zen_dashboard.snapshot import workbook_digest
+
+logger = logging.getLogger(__name__)
+
+
+def read_bytes(file):
+    """Raw bytes of a path, bytes object or file-like"""
+    if isinstance(file, (bytes, bytearray)):
+        return bytes(file)
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    if hasattr(file, 'read'):
+        return file.read()
+    with open(file, 'rb') as f:
+        return f.read()
+
+
+def parse_workbook(content, snapshots=None, engine=None, source=None):
+    """(frames, layout) for workbook bytes, reusing a snapshot when one exists
+
+    With a source name, a changed workbook only re-extracts the month blocks
+    that differ from the last snapshot of that source.
+    """
+    digest = workbook_digest(content)
+    previous = None
+    if snapshots is not None:
+        with timed('snapshot_load') as stage:
+            cached = snapshots.load(digest)
+            stage['cache'] = 'hit' if cached is not None else 'miss'
+        if cached is not None:
+            if source:
+                snapshots.remember(source, digest)
+            return cached
+        if source:
+            latest = snapshots.latest(source)
+            previous = latest[1:] if latest else None
+
+    engine = engine or config.READ_ENGINE
+    with timed('read_sheet') as stage:
+        stage['bytes'] = len(content)
+        values = read_sheet(content, engine=engine, max_col=DEFAULT_MAX_COL)
+    with timed('discover_layout'):
+        layout = discover_layout(values)
+    needed = required_columns(layout)
+    if needed > values.shape[1]:
+        # Blocks reach past the default bound - read again wide enough
+        with timed('read_sheet'):
+            values = read_sheet(content, engine=engine, max_col=needed)
+        layout = discover_layout(values)
+    with timed('extract_frames') as stage:
+        fingerprint_blocks(values, layout)
+        frames, changed = extract_incremental(values, layout, previous)
+        # Blocks taken over from the previous snapshot count as hits
+        stage['cache'] = 'partial' if previous is not None and len(changed) < len(layout) else 'miss'
+    logger.debug("Re-extracted %d of %d month blocks: %s", len(changed), len(layout), changed)
+
+    if snapshots is not None:
+        with timed('snapshot_store'):
+            snapshots.store(digest, frames, layout)
+        if source:
+            snapshots.remember(source, digest)
+    return frames, layout
@@ -0,0 +1,202 @@
+"""Lightweight per-stage timing, cache and payload metrics with Prometheus text export.
+
+``timed(stage)`` wraps a block (``instrumented(stage)`` a function) and
+observes its wall time in the ``zen_stage_seconds`` histogram.  Inside the
+block the yielded entry can be annotated: ``entry['bytes']`` goes to the
+``zen_payload_bytes`` histogram and ``entry['cache']`` (e.g. 'hit'/'miss') to
+the ``zen_cache_requests_total`` counter.
+
+A thread can also collect the stages it runs into a trace (``start_trace`` /
+``finish_trace``); that is how the diagnostics panel shows where one rerun or
+one background refresh spent its time.  Stages run in ingest worker processes
+are not seen here, only the ingest as a whole.
+
+``serve_metrics(port)`` exposes ``/metrics`` on localhost for a scraper.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}  # sorted label items -> [bucket counts, sum, count]
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for key, (counts, total, count) in sorted(self._series.items()):
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{_format_labels(key + (("le", _format_value(bound)),))} {bucket_count}')
+            lines.append(f'{self.name}_bucket{_format_labels(key + (("le", "+Inf"),))} {count}')
+            lines.append(f'{self.name}_sum{_format_labels(key)} {total!r}')
+            lines.append(f'{self.name}_count{_format_labels(key)} {count}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for key, value in sorted(self._series.items()):
+            lines.append(f'{self.name}{_format_labels(key)} {value}')
+        return lines
+
+
+class Registry:
+    """Process-wide metrics and the last trace of each kind"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = Histogram('zen_stage_seconds', 'Wall time per stage in seconds', SECONDS_BUCKETS)
+        self.payload_bytes = Histogram('zen_payload_bytes', 'Size of the data produced per stage in bytes',
+                                       BYTES_BUCKETS)
+        self.cache_requests = Counter('zen_cache_requests_total', 'Cache lookups per stage and result')
+        self.traces = {}
+
+    def record(self, entry):
+        with self._lock:
+            self.stage_seconds.observe(entry['seconds'], stage=entry['stage'])
+            if entry.get('bytes') is not None:
+                self.payload_bytes.observe(entry['bytes'], stage=entry['stage'])
+            if entry.get('cache') is not None:
+                self.cache_requests.inc(stage=entry['stage'], result=entry['cache'])
+
+    def count_cache(self, stage, result):
+        with self._lock:
+            self.cache_requests.inc(stage=stage, result=result)
+
+    def cache_stats(self):
+        """{stage: {result: lookups}} of every cache lookup counted so far"""
+        with self._lock:
+            stats = {}
+            for key, value in self.cache_requests._series.items():
+                labels = dict(key)
+                stats.setdefault(labels['stage'], {})[labels['result']] = value
+        return stats
+
+    def render(self):
+        """Prometheus text exposition of every metric"""
+        with self._lock:
+            lines = self.stage_seconds.render() + self.payload_bytes.render() + self.cache_requests.render()
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+_local = threading.local()
+
+
+def start_trace():
+    """Start collecting this thread's stages; returns the (live) trace list"""
+    _local.trace = []
+    _local.depth = 0
+    return _local.trace
+
+
+def finish_trace(name=None):
+    """Stop collecting; the trace is also kept as REGISTRY.traces[name]"""
+    trace = getattr(_local, 'trace', None) or []
+    _local.trace = None
+    if name:
+        with REGISTRY._lock:
+            REGISTRY.traces[name] = trace
+    return trace
+
+
+@contextmanager
+def timed(stage):
+    """Time a block as stage; yields an entry dict to annotate with 'bytes' / 'cache'"""
+    entry = {'stage': stage, 'seconds': None, 'bytes': None, 'cache': None, 'depth': getattr(_local, 'depth', 0)}
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.append(entry)
+    _local.depth = entry['depth'] + 1
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry['seconds'] = time.perf_counter() - start
+        _local.depth = entry['depth']
+        REGISTRY.record(entry)
+
+
+def instrumented(stage):
+    """Decorator form of timed(stage)"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count_cache(stage, result):
+    """Count a cache lookup that is not a timed stage of its own"""
+    REGISTRY.count_cache(stage, result)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve /metrics on host:port from a daemon thread (once per process)"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name='zen-metrics', daemon=True).start()
+        return _server
@@ -0,0 +1,163 @@
+"""Extraction of the dashboard frames from the raw Sheet1 grid.
+
+Row and column positions come from ``layout.discover_layout``.  The sheet is converted to one object ndarray and every section (summary cells,
+wing rows, vendor bills, extra income, fines) is pulled out for all months at
+once with fancy indexing; numbers are coerced with a single ``pd.to_numeric``
+per block instead of cell-by-cell ``iloc`` lookups.
+"""
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.layout import discover_layout
+
+# Bump whenever the extracted frames or the stored layout change, so old snapshots are not reused
+PARSER_VERSION = 4
+
+# Wing names from columns 6-21
+WINGS = ['A Wing', 'A Shop', 'B Wing', 'B Shop', 'C Wing', 'C Shop Total',
+         'C Shop Rahul', 'C Shop Sagar', 'D Wing', 'D Shop', 'E Wing', 'E Shop',
+         'F Wing', 'G Wing', 'H Wing', 'I Wing']
+WING_COL = 6
+
+# Vendor bills: name and amount
+VENDOR_NAME_COL = 2
+VENDOR_AMOUNT_COL = 3
+
+# Extra income sources: NBH=23(X), Lift=24(Y), Event=25(Z), Scrap=26(AA), Parking Fine=27(AB)
+EXTRA_INCOME_COLS = {'NBH': 23, 'Lift': 24, 'Event': 25, 'Scrap': 26, 'Parking_Fine': 27}
+
+# Fines sit right of the block's fine Wing column: HK, Quinteze, Security, STP
+FINE_COLS = ('HK', 'Quinteze', 'Security', 'STP')
+
+VENDOR_HEADERS = ('Vendor Name', 'Vendor Bills')
+
+
+def to_numbers(block):
+    """Coerce an object block to float64; blanks and non-numeric cells become 0"""
+    block = np.asarray(block, dtype=object)
+    numbers = pd.to_numeric(pd.Series(block.ravel(), dtype=object), errors='coerce').fillna(0).to_numpy(dtype=float)
+    return numbers.reshape(block.shape)
+
+
+def _text_contains(cells, needles):
+    """Boolean mask of cells that are strings containing any of needles"""
+    return np.fromiter((isinstance(v, str) and any(n in v for n in needles) for v in cells),
+                       dtype=bool, count=len(cells))
+
+
+def _section_rows(blocks, key, n_rows):
+    """Concatenated row indices of a per-month [start, end) range, with the index of its block"""
+    ranges = [np.arange(b[key][0], min(b[key][1], n_rows)) for b in blocks]
+    rows = np.concatenate(ranges) if ranges else np.empty(0, dtype=int)
+    owner = np.repeat(np.arange(len(blocks)), [len(r) for r in ranges])
+    return rows.astype(int), owner
+
+
+def _labels(blocks, owner=None):
+    """Month and Period columns for rows owned by blocks"""
+    months = np.array([b['name'] for b in blocks], dtype=object)
+    periods = np.array([b['period'] for b in blocks], dtype=object)
+    if owner is None:
+        return months, periods
+    return months[owner], periods[owner]
+
+
+def extract_monthly(values, blocks):
+    months, periods = _labels(blocks)
+    rows = np.array([b['summary_row'] for b in blocks], dtype=int)
+    cols = np.array([[b['to_be_col'], b['received_col'], b['expense_col'], b['extra_income_col']] for b in blocks],
+                    dtype=int).reshape(-1, 4)
+    summary = to_numbers(values[rows[:, None], cols])
+    return pd.DataFrame({
+        'Month': months,
+        'Period': periods,
+        'To_Be': summary[:, 0],
+        'Received': summary[:, 1],
+        'Expense': summary[:, 2],
+        'Extra_Income': summary[:, 3],
+    })
+
+
+def extract_wings(values, blocks):
+    wings = WINGS[:max(0, min(len(WINGS), values.shape[1] - WING_COL))]
+    cols = np.arange(WING_COL, WING_COL + len(wings))
+    # One (months x wings) grid per measure
+    grids = {}
+    for measure, key in (('To_Be', 'to_be_row'), ('Received', 'received_row'), ('Difference', 'diff_row')):
+        rows = np.array([b[key] for b in blocks], dtype=int)
+        grids[measure] = to_numbers(values[np.ix_(rows, cols)]).ravel()
+    months, periods = _labels(blocks)
+    return pd.DataFrame({
+        'Month': np.repeat(months, len(wings)),
+        'Period': np.repeat(periods, len(wings)),
+        'Wing': np.tile(np.array(wings, dtype=object), len(blocks)),
+        **grids,
+    })
+
+
+def extract_vendors(values, blocks):
+    rows, owner = _section_rows(blocks, 'vendor_rows', values.shape[0])
+    names = values[rows, VENDOR_NAME_COL]
+    amounts = to_numbers(values[rows, VENDOR_AMOUNT_COL])
+    # Skip blanks, non-positive amounts and the header rows of each section
+    keep = ~pd.isna(names) & (amounts > 0) & ~_text_contains(names, VENDOR_HEADERS)
+    if not keep.any():
+        return pd.DataFrame()
+    months, periods = _labels(blocks, owner[keep])
+    return pd.DataFrame({
+        'Vendor': [str(v) for v in names[keep]],
+        'Amount': amounts[keep],
+        'Month': months,
+        'Period': periods,
+    })
+
+
+def extract_extra_income(values, blocks):
+    blocks = [b for b in blocks if b['income_row'] < values.shape[0]]
+    rows = np.array([b['income_row'] for b in blocks], dtype=int)
+    amounts = to_numbers(values[np.ix_(rows, list(EXTRA_INCOME_COLS.values()))])
+    frame = pd.DataFrame(amounts, columns=list(EXTRA_INCOME_COLS))
+    months, periods = _labels(blocks)
+    frame.insert(0, 'Month', months)
+    frame.insert(1, 'Period', periods)
+    return frame
+
+
+def extract_fines(values, blocks):
+    rows, owner = _section_rows(blocks, 'fine_rows', values.shape[0])
+    wing_cols = np.array([b['fine_wing_col'] for b in blocks], dtype=int)[owner]
+    wings = values[rows, wing_cols]
+    keep = _text_contains(wings, ('Wing',))
+    if not keep.any():
+        return pd.DataFrame()
+    rows, wing_cols = rows[keep], wing_cols[keep]
+    fines = to_numbers(values[rows[:, None], wing_cols[:, None] + np.arange(1, len(FINE_COLS) + 1)])
+    frame = pd.DataFrame(fines, columns=list(FINE_COLS))
+    months, periods = _labels(blocks, owner[keep])
+    frame.insert(0, 'Month', months)
+    frame.insert(1, 'Period', periods)
+    frame.insert(2, 'Wing', wings[keep])
+    frame['Total_Fine'] = fines.sum(axis=1)
+    return frame
+
+
+def extract_frames(values, blocks=None):
+    """The five dashboard frames from the Sheet1 grid (an object ndarray)"""
+    values = np.asarray(values, dtype=object)
+    blocks = discover_layout(values) if blocks is None else blocks
+    return (
+        extract_monthly(values, blocks),
+        extract_wings(values, blocks),
+        extract_vendors(values, blocks),
+        extract_extra_income(values, blocks),
+        extract_fines(values, blocks),
+    )
+
+
+def required_columns(blocks):
+    """Number of leading sheet columns the blocks read from"""
+    cols = [WING_COL + len(WINGS), max(EXTRA_INCOME_COLS.values()) + 1]
+    for b in blocks:
+        cols += [b['to_be_col'] + 1, b['received_col'] + 1, b['expense_col'] + 1, b['extra_income_col'] + 1,
+                 b['fine_wing_col'] + len(FINE_COLS) + 1]
+    return max(cols)
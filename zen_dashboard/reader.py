@@ -0,0 +1,99 @@
+"""Bounded readers for Sheet1.
+
+``pd.read_excel`` materialises every cell of the sheet (styles included) into
+an object DataFrame, although the parser only looks at the first ~34 columns.
+The readers here stream rows and stop at the column (and optional row) bound:
+
+* ``openpyxl`` - ``read_only=True`` / ``values_only=True`` row streaming
+* ``calamine`` - the Rust reader from ``python-calamine``, when installed
+* ``pandas``   - the old ``pd.read_excel`` path, kept for comparison
+
+All three return the same object ndarray (blank cells are None), row 0 being
+Excel row 1.
+"""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.layout import DEFAULT_MAX_COL
+
+SHEET_NAME = 'Sheet1'
+
+try:
+    import python_calamine
+    HAS_CALAMINE = True
+except ImportError:
+    python_calamine = None
+    HAS_CALAMINE = False
+
+ENGINES = ('auto', 'openpyxl', 'calamine', 'pandas')
+
+
+def _as_filelike(file):
+    if isinstance(file, (bytes, bytearray)):
+        return BytesIO(file)
+    return file
+
+
+def _to_grid(rows, max_col):
+    """List of row sequences -> (rows x max_col) object ndarray, trailing blank rows dropped"""
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    width = max_col if max_col is not None else max((len(r) for r in rows), default=0)
+    grid = np.full((len(rows), width), None, dtype=object)
+    for i, row in enumerate(rows):
+        row = row[:width]
+        grid[i, :len(row)] = row
+    return grid
+
+
+def read_openpyxl(file, max_row=None, max_col=DEFAULT_MAX_COL):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(_as_filelike(file), read_only=True, data_only=True)
+    try:
+        sheet = workbook[SHEET_NAME]
+        rows = [row for row in sheet.iter_rows(max_row=max_row, max_col=max_col, values_only=True)]
+    finally:
+        workbook.close()
+    return _to_grid(rows, max_col)
+
+
+def read_calamine(file, max_row=None, max_col=DEFAULT_MAX_COL):
+    if not HAS_CALAMINE:
+        raise ImportError("python-calamine is not installed")
+    file = _as_filelike(file)
+    if hasattr(file, 'read'):
+        workbook = python_calamine.CalamineWorkbook.from_filelike(file)
+    else:
+        workbook = python_calamine.CalamineWorkbook.from_path(file)
+    sheet = workbook.get_sheet_by_name(SHEET_NAME)
+    # iter_rows() starts at the used range, dropping blank leading columns; keep them so cells stay at their column
+    rows = sheet.to_python(skip_empty_area=False, nrows=max_row)
+    # calamine reports blank cells as ''
+    rows = [[None if v == '' else v for v in row[:max_col]] for row in rows]
+    return _to_grid(rows, max_col)
+
+
+def read_pandas(file, max_row=None, max_col=DEFAULT_MAX_COL):
+    values = pd.read_excel(_as_filelike(file), sheet_name=SHEET_NAME, header=None).to_numpy(dtype=object)
+    values = values[:max_row, :max_col]
+    if max_col is not None and values.shape[1] < max_col:
+        values = np.hstack([values, np.full((values.shape[0], max_col - values.shape[1]), np.nan, dtype=object)])
+    # Same blank marker as the streaming readers
+    values[pd.isna(values)] = None
+    return values
+
+
+def read_sheet(file, engine='auto', max_row=None, max_col=DEFAULT_MAX_COL):
+    """Sheet1 as an object ndarray, read with the given engine"""
+    if engine == 'auto':
+        engine = 'calamine' if HAS_CALAMINE else 'openpyxl'
+    if engine == 'openpyxl':
+        return read_openpyxl(file, max_row, max_col)
+    if engine == 'calamine':
+        return read_calamine(file, max_row, max_col)
+    if engine == 'pandas':
+        return read_pandas(file, max_row, max_col)
+    raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
@@ -0,0 +1,218 @@
+"""Background refresh of the dashboard data (stale-while-revalidate).
+
+One daemon thread per process loads the workbooks on a schedule and publishes
+each result as an immutable ``DataVersion``.  Page renders only read
+``DataRefresher.current`` - a single attribute read, so a session always sees
+one complete version and never waits on a download.  A failed refresh keeps
+the last good version and records the error.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.artifact import artifact_frames
+from zen_dashboard.cube import build_cubes
+from zen_dashboard.metrics import finish_trace, start_trace, timed
+from zen_dashboard.units import unit_risk, unit_wings, wing_units
+from zen_dashboard.views import detail_sort_orders, wing_index
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 30.0
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    number: int
+    artifact: dict           # see zen_dashboard.artifact
+    loaded_at: float = 0.0   # when this data was parsed
+    checked_at: float = 0.0  # when the sources were last confirmed unchanged
+    estate: str = ''         # estate id (see config.ESTATES)
+
+    @property
+    def frames(self):
+        return artifact_frames(self.artifact)
+
+    @property
+    def fingerprints(self):
+        return self.artifact['fingerprints']
+
+    @property
+    def tables(self):
+        return self.artifact['tables']
+
+    @property
+    def figures(self):
+        return self.artifact['figures']
+
+    @property
+    def units(self):
+        """Typed unit rows (see zen_dashboard.units), or None without a unit register"""
+        return self.artifact.get('units')
+
+    @property
+    def key(self):
+        """Identifies this data in process-wide caches, also across estates and refresher restarts"""
+        return (self.estate, self.number, self.artifact['built_at'])
+
+    @cached_property
+    def nbytes(self):
+        """Approximate memory held by this version: frames, unit rows, tables, figure JSON and rollups"""
+        frames = sum(int(frame.memory_usage(deep=True).sum()) for frame in self.artifact['frames'].values())
+        if self.units is not None:
+            frames += int(self.units.memory_usage(deep=True).sum())
+        tables = sum(int(table.memory_usage(deep=True).sum()) for table in self.tables.values())
+        figures = sum(len(figure_json) for figure_json in self.figures.values())
+        cubes = sum(cube.values.nbytes + cube.prefix.nbytes for cube in self.artifact.get('cubes', {}).values())
+        return frames + tables + figures + cubes
+
+    # Built once per version on first use, so switching wings is a dict / index lookup
+    @cached_property
+    def cubes(self):
+        """Period rollups (see zen_dashboard.cube); an artifact read from a file carries none"""
+        return self.artifact.get('cubes') or build_cubes(self.frames, self.units)
+
+    @cached_property
+    def wing_index(self):
+        """{wing: fine-adjusted monthly rows}"""
+        wing_detail = self.tables.get('wing_detail')
+        return wing_index(wing_detail) if wing_detail is not None else {}
+
+    @cached_property
+    def wing_summary(self):
+        """Per-wing totals indexed by Wing"""
+        wing_summary = self.tables.get('wing_summary')
+        return wing_summary.set_index('Wing') if wing_summary is not None else pd.DataFrame()
+
+    @cached_property
+    def unit_wings(self):
+        """Wing of every unit, in unit rollup key order"""
+        units = self.cubes.get('units')
+        return unit_wings(self.units, units.keys) if units is not None else np.array([], dtype=object)
+
+    @cached_property
+    def wing_units(self):
+        """{wing: unit rollup positions of its units}"""
+        return wing_units(self.unit_wings) if len(self.unit_wings) else {}
+
+    @cached_property
+    def unit_risk(self):
+        """Arrears risk of every unit, in unit rollup key order"""
+        units = self.cubes.get('units')
+        forecast = self.tables.get('unit_forecast')
+        return unit_risk(units, forecast) if units is not None and forecast is not None else pd.DataFrame()
+
+    @cached_property
+    def detail_orders(self):
+        """Row order of the detail table for every sort column and direction"""
+        detail = self.tables.get('detail')
+        return detail_sort_orders(detail) if detail is not None else {}
+
+    @cached_property
+    def detail_periods(self):
+        """Sorted periods of the detail table, so month colors do not shift between pages"""
+        detail = self.tables.get('detail')
+        return np.sort(detail['Period'].unique()) if detail is not None else np.array([])
+
+
+class DataRefresher:
+    """Loads data with load(progress, previous artifact or None) -> artifact every interval seconds"""
+
+    def __init__(self, load, interval, estate=''):
+        self._load = load
+        self.interval = interval
+        self.estate = estate
+        self.current = None
+        self.last_error = None
+        self.progress = None  # (done, total, source) while a load is running
+        self._wake = threading.Event()
+        self._published = threading.Condition()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                name = f"zen-data-refresh-{self.estate}" if self.estate else "zen-data-refresh"
+                self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        """End the refresh thread after its current load; the published version stays readable"""
+        self._stopped.set()
+        self._wake.set()
+
+    def request_refresh(self):
+        """Refresh now instead of at the next scheduled time"""
+        self._wake.set()
+
+    def wait_for_data(self, timeout=None):
+        """Block until a first version (or a first error) exists; returns current"""
+        with self._published:
+            self._published.wait_for(lambda: self.current is not None or self.last_error is not None, timeout)
+        return self.current
+
+    def refresh(self):
+        """Load once and publish the result; returns the current version"""
+        # The stages of the latest refresh are kept as the 'refresh' trace for the diagnostics panel
+        start_trace()
+        try:
+            with timed('refresh') as stage:
+                version = self._refresh()
+                if self.last_error is not None:
+                    stage['cache'] = 'error'
+                else:
+                    # A hit is a refresh that found the data unchanged and kept the version
+                    stage['cache'] = 'hit' if version.loaded_at < version.checked_at else 'miss'
+        finally:
+            finish_trace('refresh')
+        return version
+
+    def _refresh(self):
+        previous = self.current
+        try:
+            artifact = self._load(self._report, previous.artifact if previous is not None else None)
+        except Exception as e:
+            logger.warning("Data refresh failed: %s", e)
+            with self._published:
+                self.last_error = e
+                self._published.notify_all()
+            return previous
+        finally:
+            self.progress = None
+
+        now = time.time()
+        fingerprints = artifact['fingerprints']
+        if previous is not None and fingerprints == previous.fingerprints and None not in fingerprints.values():
+            version = replace(previous, checked_at=now)
+        else:
+            number = previous.number + 1 if previous is not None else 1
+            version = DataVersion(number, artifact, loaded_at=now, checked_at=now, estate=self.estate)
+        with self._published:
+            self.current = version
+            self.last_error = None
+            self._published.notify_all()
+        return version
+
+    def _report(self, done, total, source):
+        self.progress = (done, total, source)
+
+    def _run(self):
+        while True:
+            # Cleared before the check, not after the wait: a request_refresh() that lands while a load runs leaves
+            # the event set and the wait below returns at once.  stop() sets _stopped before _wake, so it is seen here
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            self.refresh()
+            # Retry a failed load sooner than the regular schedule
+            delay = min(self.interval, RETRY_DELAY) if self.last_error is not None else self.interval
+            self._wake.wait(delay)
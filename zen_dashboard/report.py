@@ -0,0 +1,306 @@
+"""The whole dashboard as one self-contained static HTML file, for read-only viewers.
+
+    python app.py build-report [--output zen-report.html] [--sources ...] [--snapshot dashboard-snapshot.zip]
+
+The page is rendered from a data version's artifact (see
+``zen_dashboard.artifact``): its prebuilt figure JSON is drawn by plotly.js,
+which is inlined once in the page head and shared by every chart, and its
+tables become plain HTML tables.  The Wing/Shop section has a client-side
+filter: picking a wing shows only its rows and its totals, with no server
+involved.  Any static file server can serve the file to any number of viewers.
+
+The page carries a digest of the data's month fingerprints.  ``write_report``
+leaves an existing file alone when the digest matches, so it is rewritten only
+when the data changes.  With ``ZEN_REPORT_DIR`` set, the app's background
+refresh writes ``<estate>.html`` there on every new data version.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from html import escape
+
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from zen_dashboard import config
+from zen_dashboard.artifact import ARTIFACT_VERSION, artifact_frames, build_artifact, read_artifact
+from zen_dashboard.ingest import ingest_workbooks
+from zen_dashboard.layout import period_label
+from zen_dashboard.units import load_units
+from zen_dashboard.views import PENDING_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# Bump when the page changes, so reports of unchanged data are still rewritten
+REPORT_FORMAT = 1
+DEFAULT_OUTPUT = 'zen-report.html'
+# Read from the start of an existing report to find its digest
+DIGEST_BYTES = 4096
+_DIGEST = re.compile(r'<meta name="zen-data" content="([0-9a-f]+)">')
+
+RUPEES = '₹{:,.2f}'.format
+PERCENT = '{:.1%}'.format
+
+PAGE_CSS = """
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 0 auto; max-width: 1400px;
+       padding: 1rem 2rem; }
+h1 { color: #1f77b4; text-align: center; }
+.caption { color: #666; text-align: center; font-size: 0.9rem; }
+.section { color: white; padding: 12px 15px; border-radius: 10px; font-size: 1.5rem; font-weight: bold;
+           margin: 2rem 0 1rem; background: linear-gradient(90deg, #1f77b4 0%, #2ca02c 100%); }
+.chart { width: 100%; min-height: 520px; }
+.table-wrap { max-height: 600px; overflow: auto; }
+table { border-collapse: collapse; width: 100%; }
+th { position: sticky; top: 0; background-color: #1f77b4; color: white; font-weight: bold; padding: 8px; }
+td { text-align: center; padding: 6px 8px; border-bottom: 1px solid #eee; }
+td.pending, td.High { background-color: #ffcccc; font-weight: bold; }
+td.excess, td.Low { background-color: #ccffcc; }
+td.excess { font-weight: bold; }
+td.even { background-color: #ffffcc; }
+td.Medium { background-color: #fff3cd; }
+.metrics { display: flex; gap: 1rem; margin: 1rem 0; }
+.metric { flex: 1; border: 1px solid #ddd; border-radius: 8px; padding: 0.8rem 1rem; }
+.metric .label { color: #666; font-size: 0.9rem; }
+.metric .value { font-size: 1.6rem; }
+select { font-size: 1rem; padding: 4px 8px; }
+"""
+
+# Wing/Shop filter: shows the picked wing's rows and totals (an empty value shows all of them)
+WING_FILTER_JS = """
+function rupees(value) {
+  return '₹' + value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+}
+function showWing(wing) {
+  document.querySelectorAll('#wing-rows tbody tr').forEach(function (row) {
+    row.style.display = !wing || row.dataset.wing === wing ? '' : 'none';
+  });
+  var totals = WING_TOTALS[wing];
+  document.getElementById('wing-to-be').textContent = rupees(totals[0]);
+  document.getElementById('wing-received').textContent = rupees(totals[1]);
+  document.getElementById('wing-fines').textContent = rupees(totals[2]);
+  document.getElementById('wing-adjusted-label').textContent = totals[3] > 0 ? 'Total Pending' : 'Total Excess';
+  document.getElementById('wing-adjusted').textContent = rupees(Math.abs(totals[3]));
+}
+document.getElementById('wing-filter').addEventListener('change', function (event) { showWing(event.target.value); });
+showWing('');
+"""
+
+
+def data_digest(artifact):
+    """Digest of the data behind a report (None when a month has no fingerprint)"""
+    fingerprints = artifact['fingerprints']
+    if not fingerprints or None in fingerprints.values():
+        return None
+    payload = json.dumps([REPORT_FORMAT, ARTIFACT_VERSION, artifact.get('parser_version'),
+                          sorted(fingerprints.items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def report_digest(path):
+    """Digest written into an existing report, None if there is none"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            match = _DIGEST.search(f.read(DIGEST_BYTES))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def difference_classes(values):
+    """CSS class of each amount: 'pending' above zero, 'excess' below, 'even' at zero"""
+    values = np.asarray(values, dtype=float)
+    return np.where(values > 0, 'pending', np.where(values < 0, 'excess', 'even'))
+
+
+def html_table(frame, formats=None, classes=None, row_attrs=None, table_id=None):
+    """<table> of frame; formats: {column: value -> str}, classes: {column: CSS class per row}"""
+    formats = formats or {}
+    classes = classes or {}
+    columns = []
+    for column in frame.columns:
+        fmt = formats.get(column, str)
+        text = ['–' if pd.isna(value) else escape(fmt(value)) for value in frame[column].tolist()]
+        if column in classes:
+            columns.append([f'<td class="{css}">{value}</td>' for value, css in zip(text, classes[column])])
+        else:
+            columns.append([f'<td>{value}</td>' for value in text])
+    attrs = row_attrs if row_attrs is not None else [''] * len(frame)
+    rows = '\n'.join(f'<tr{attr}>{"".join(cells)}</tr>' for attr, cells in zip(attrs, zip(*columns)))
+    head = ''.join(f'<th>{escape(str(column))}</th>' for column in frame.columns)
+    table_id = f' id="{table_id}"' if table_id else ''
+    return (f'<div class="table-wrap"><table{table_id}><thead><tr>{head}</tr></thead>'
+            f'<tbody>\n{rows}\n</tbody></table></div>')
+
+
+def script_json(value):
+    """JSON (a string, or a value to dump) to inline in a <script>, where '</' would end the element early"""
+    text = value if isinstance(value, str) else json.dumps(value)
+    return text.replace('</', '<\\/')
+
+
+def figure_html(name, figure_json):
+    """<div> drawn from prebuilt figure JSON by the shared plotly.js"""
+    return (f'<div id="figure-{name}" class="chart"></div>\n'
+            f'<script>(function () {{ var figure = {script_json(figure_json)}; '
+            f'Plotly.newPlot("figure-{name}", figure.data, figure.layout, {{responsive: true}}); }})();</script>')
+
+
+def section(title):
+    return f'<div class="section">{escape(title)}</div>'
+
+
+def metric(label, value, element_id):
+    return (f'<div class="metric"><div class="label" id="{element_id}-label">{escape(label)}</div>'
+            f'<div class="value" id="{element_id}">{escape(value)}</div></div>')
+
+
+def wing_section(wing_summary, wing_detail):
+    """Wing/Shop picker, its totals and the monthly rows of every wing, filtered in the browser"""
+    totals = {'': [float(wing_summary[column].sum()) for column in ('To_Be', 'Received', 'Fines', 'Adjusted')]}
+    for row in wing_summary.itertuples(index=False):
+        totals[str(row.Wing)] = [float(row.To_Be), float(row.Received), float(row.Fines), float(row.Adjusted)]
+    options = '<option value="">All wings/shops</option>' + ''.join(
+        f'<option value="{escape(str(wing))}">{escape(str(wing))}</option>' for wing in wing_summary['Wing'])
+    rows = wing_detail[['Wing', 'Period', 'To Be Received', 'Actual Received', 'Fine_Details', PENDING_COLUMN]]
+    rows = rows.assign(Period=rows['Period'].astype(str).map(period_label)).rename(columns={'Period': 'Month'})
+    table = html_table(rows, {'To Be Received': RUPEES, 'Actual Received': RUPEES, PENDING_COLUMN: RUPEES},
+                       {PENDING_COLUMN: difference_classes(rows[PENDING_COLUMN])},
+                       [f' data-wing="{escape(str(wing))}"' for wing in rows['Wing']], table_id='wing-rows')
+    return '\n'.join([
+        f'<label for="wing-filter">Select a Wing/Shop: </label><select id="wing-filter">{options}</select>',
+        '<div class="metrics">' + metric('Total To Be Received', '', 'wing-to-be') +
+        metric('Total Received', '', 'wing-received') + metric('Total Fines Deducted', '', 'wing-fines') +
+        metric('Total Pending', '', 'wing-adjusted') + '</div>',
+        table,
+        f'<script>var WING_TOTALS = {script_json(totals)};\n{WING_FILTER_JS}</script>',
+    ])
+
+
+def render_report(artifact, estate=None):
+    """The dashboard page of an artifact as one HTML string"""
+    df_monthly = artifact_frames(artifact)[0]
+    tables, figures = artifact['tables'], artifact['figures']
+    title = 'Zen Estate Financial Dashboard'
+    if not df_monthly.empty:
+        periods = df_monthly['Period'].astype(str)
+        title += f" ({period_label(periods.iloc[0])} – {period_label(periods.iloc[-1])})"
+    built = time.strftime('%d %b %Y %H:%M', time.localtime(artifact['built_at']))
+    shown = f"Estate {estate}, data" if estate else "Data"
+    digest = data_digest(artifact)
+
+    body = [f'<h1>🏢 {escape(title)}</h1>',
+            f'<p class="caption">{escape(shown)} as of {built}. Static report: reload to see newer data.</p>']
+    if 'overview' in tables:
+        overview = tables['overview']
+        body += [section('📊 Monthly Overview (To Be vs Received)'),
+                 html_table(overview, {column: RUPEES for column in ('To_Be', 'Received', 'Difference', 'Expense')},
+                            {'Difference': difference_classes(overview['Difference'])})]
+    forecast = tables.get('forecast')
+    if 'monthly' in figures:
+        body += [section('🔮 Collection Forecast & Arrears Risk'), figure_html('monthly', figures['monthly'])]
+    if forecast is not None and not forecast.empty:
+        body += [f'<p class="caption">Forecast for {period_label(str(forecast["Period"].iloc[0]))}, '
+                 'highest risk first. Outstanding is after fines.</p>',
+                 html_table(forecast.drop(columns='Period'), {
+                     'Expected_To_Be': RUPEES, 'Expected_Received': RUPEES, 'Collection_Rate': PERCENT,
+                     'Rolling_Rate': PERCENT, 'Outstanding': RUPEES, 'Months_Outstanding': '{:.2f}'.format,
+                     'Risk_Score': '{:.1f}'.format}, {'Risk': forecast['Risk'].astype(str).to_numpy()})]
+    if 'vendors' in figures:
+        body += [section('💼 Vendor Expenses (Month-wise)'), figure_html('vendors', figures['vendors'])]
+    if 'vendor_totals' in tables:
+        body.append(html_table(tables['vendor_totals'], {'Total': RUPEES, 'Share': PERCENT, 'Last Month': RUPEES,
+                                                          'MoM Change': '₹{:+,.2f}'.format}))
+    if 'extra_income' in figures:
+        body += [section('💰 Extra Income (Month-wise)'), figure_html('extra_income', figures['extra_income'])]
+    if 'extra_income' in tables:
+        income = tables['extra_income']
+        body.append(html_table(income, {column: RUPEES for column in income.columns if column != 'Month'}))
+    if 'wing_difference' in figures:
+        body += [section('🏘️ Pending/Excess Amount Received by Wing/Shop'),
+                 figure_html('wing_difference', figures['wing_difference'])]
+    if 'wing_summary' in tables and 'wing_detail' in tables:
+        body += [section('🏢 Wing/Shop-Wise Analysis'), wing_section(tables['wing_summary'], tables['wing_detail'])]
+
+    return '\n'.join([
+        '<!DOCTYPE html>',
+        '<html lang="en">',
+        '<head>',
+        '<meta charset="utf-8">',
+        f'<meta name="zen-data" content="{digest}">' if digest else '',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f'<title>{escape(title)}</title>',
+        f'<style>{PAGE_CSS}</style>',
+        f'<script>{get_plotlyjs()}</script>',
+        '</head>',
+        '<body>',
+        *body,
+        '</body>',
+        '</html>',
+    ])
+
+
+def write_report(artifact, path, estate=None):
+    """Write the report of artifact to path atomically; False when path already shows this data"""
+    digest = data_digest(artifact)
+    if digest is not None and report_digest(path) == digest:
+        return False
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.html')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(render_report(artifact, estate))
+        # mkstemp creates the file private; a static file server has to read it
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return True
+
+
+def publish_report(artifact, estate, directory=None):
+    """Write <directory>/<estate>.html (default ZEN_REPORT_DIR) after a refresh; a failure is only logged"""
+    directory = directory or config.REPORT_DIR
+    if not directory:
+        return False
+    try:
+        return write_report(artifact, os.path.join(directory, f'{estate}.html'),
+                            estate if len(config.ESTATES) > 1 else None)
+    except OSError as e:
+        logger.warning("Could not write the static report of estate %s: %s", estate, e)
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='app.py build-report',
+                                     description='Render the dashboard into one static HTML file without Streamlit')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT)
+    parser.add_argument('--sources', default=config.WORKBOOK_SOURCES,
+                        help='comma/newline separated workbook paths, globs or URLs')
+    parser.add_argument('--snapshot', default=config.ARTIFACT_PATH,
+                        help='render a prebuilt snapshot (python app.py build-snapshot) instead of loading sources')
+    parser.add_argument('--units', default=config.UNIT_SOURCES.get(config.DEFAULT_ESTATE),
+                        help='unit registers (CSV/Parquet or workbooks with a Units sheet) to roll up into the wings')
+    parser.add_argument('--workers', type=int, default=config.INGEST_WORKERS)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.snapshot:
+        artifact = read_artifact(args.snapshot)
+    else:
+        frames, blocks = ingest_workbooks(args.sources, max_workers=args.workers, with_layout=True, revalidate=True)
+        artifact = build_artifact(frames, blocks, load_units(args.units))
+    if write_report(artifact, args.output):
+        print(f"Wrote {args.output} ({os.path.getsize(args.output) / 1024:,.0f} KiB) "
+              f"in {time.perf_counter() - start:.2f} s")
+    else:
+        print(f"{args.output} already shows this data; left unchanged")
+    return 0
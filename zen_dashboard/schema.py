@@ -0,0 +1,66 @@
+"""Explicit dtypes of the five dashboard frames.
+
+The parser emits plain object columns; ``apply_schema`` turns the repeated
+labels of the combined frames into categoricals shared by every frame:
+
+- ``Period`` (YYYY-MM): ordered, chronological.  The key to sort and join on.
+- ``Month`` (Sep, Oct, ...): ordered by the first period each name appears in,
+  so a single year sorts chronologically without a lookup table.
+- ``Wing`` and ``Vendor``: categories in alphabetical order, so sorting and
+  grouping give the same order as the strings did.
+
+Every frame gets the same ``Period`` / ``Wing`` dtype, so merges and filters
+across frames compare integer codes instead of strings.  With ``float32``
+the amount columns are stored in single precision, which halves their memory
+but keeps only ~7 significant digits (paise of lakh-sized amounts are lost),
+so it is off unless ``ZEN_FLOAT32`` is set.  Sums are still accumulated in
+float64 by pandas.
+"""
+import numpy as np
+import pandas as pd
+
+from zen_dashboard import config
+
+LABEL_COLUMNS = ('Month', 'Period', 'Wing', 'Vendor')
+
+
+def _values(frames, column):
+    """Distinct non-null values of column across frames"""
+    parts = [frame[column].dropna().unique() for frame in frames if column in frame.columns]
+    return pd.unique(np.concatenate([np.asarray(p, dtype=object) for p in parts])) if parts else []
+
+
+def frame_dtypes(frames):
+    """{column: CategoricalDtype} of the label columns present in frames"""
+    periods = sorted(_values(frames, 'Period'))
+    dtypes = {'Period': pd.CategoricalDtype(periods, ordered=True)}
+
+    # Month names in the order of the first period they belong to
+    first_period = {}
+    for frame in frames:
+        if 'Month' in frame.columns and 'Period' in frame.columns:
+            for month, period in zip(frame['Month'], frame['Period']):
+                if month not in first_period or period < first_period[month]:
+                    first_period[month] = period
+    months = sorted(first_period, key=lambda month: first_period[month])
+    dtypes['Month'] = pd.CategoricalDtype(months, ordered=True)
+
+    dtypes['Wing'] = pd.CategoricalDtype(sorted(_values(frames, 'Wing')))
+    dtypes['Vendor'] = pd.CategoricalDtype(sorted(_values(frames, 'Vendor')))
+    return dtypes
+
+
+def apply_schema(frames, float32=None):
+    """The frames with categorical labels and, with float32 (default: ZEN_FLOAT32), single-precision amounts"""
+    float32 = config.FLOAT32 if float32 is None else float32
+    dtypes = frame_dtypes(frames)
+    typed = []
+    for frame in frames:
+        if frame.empty:
+            typed.append(frame)
+            continue
+        casts = {column: dtypes[column] for column in LABEL_COLUMNS if column in frame.columns}
+        if float32:
+            casts.update({column: np.float32 for column in frame.columns if frame[column].dtype == np.float64})
+        typed.append(frame.astype(casts))
+    return tuple(typed)
@@ -0,0 +1,156 @@
+"""Parquet snapshots of the parsed frames, keyed by the SHA-256 of the workbook.
+
+A workbook that has been parsed once is never run through openpyxl again: the
+five frames are written to ``<digest>-v<version>/`` (with the discovered
+layout in ``manifest.json``) and read back on the next start.  The version
+stamp is the parser version, so changing the parser makes old snapshots
+unreachable and they are evicted.  The directory is bounded by
+entry count and total size, oldest-used first.
+
+Each source (path or URL) also records the digest it was last parsed from, so
+when a workbook changes its previous snapshot can seed an incremental parse.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+from zen_dashboard import config
+
+logger = logging.getLogger(__name__)
+
+FRAME_NAMES = ("monthly", "wings", "vendors", "extra_income_breakdown", "fines")
+
+try:
+    import pyarrow  # noqa: F401  (pandas needs it for Parquet)
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+
+def workbook_digest(content):
+    """SHA-256 of the raw workbook bytes"""
+    return hashlib.sha256(content).hexdigest()
+
+
+class SnapshotCache:
+    """Bounded on-disk LRU of parsed frame sets"""
+
+    def __init__(self, version, cache_dir=None, max_entries=None, max_bytes=None):
+        self.version = str(version)
+        self.cache_dir = cache_dir or config.SNAPSHOT_DIR
+        self.max_entries = config.SNAPSHOT_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = config.SNAPSHOT_MAX_BYTES if max_bytes is None else max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return HAS_PARQUET
+
+    def _entry_dir(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}-v{self.version}")
+
+    def _source_path(self, source):
+        name = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, ".sources", name)
+
+    def remember(self, source, digest):
+        """Record digest as the latest parse of source"""
+        path = self._source_path(source)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(digest)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not record snapshot for %s: %s", source, e)
+
+    def latest(self, source):
+        """(digest, frames, layout) of the last snapshot parsed from source, or None"""
+        try:
+            with open(self._source_path(source), "r", encoding="utf-8") as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        cached = self.load(digest)
+        if cached is None:
+            return None
+        return (digest,) + cached
+
+    def load(self, digest):
+        """(frames, layout) stored for digest, or None"""
+        if not self.enabled:
+            return None
+        entry = self._entry_dir(digest)
+        manifest_path = os.path.join(entry, "manifest.json")
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != self.version or manifest.get("digest") != digest:
+                return None
+            frames = tuple(pd.read_parquet(os.path.join(entry, f"{name}.parquet")) for name in FRAME_NAMES)
+        except (OSError, ValueError) as e:
+            if os.path.isdir(entry):
+                logger.warning("Discarding unreadable snapshot %s: %s", entry, e)
+                shutil.rmtree(entry, ignore_errors=True)
+            return None
+        # The manifest mtime is the LRU clock
+        os.utime(manifest_path)
+        return frames, manifest.get("layout")
+
+    def store(self, digest, frames, layout=None):
+        """Write frames (and the layout they were parsed with) for digest, then evict old snapshots"""
+        if not self.enabled:
+            return
+        entry = self._entry_dir(digest)
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        try:
+            for name, frame in zip(FRAME_NAMES, frames):
+                frame.to_parquet(os.path.join(tmp, f"{name}.parquet"), index=False)
+            manifest = {"digest": digest, "version": self.version, "created_at": time.time(), "layout": layout}
+            with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            with self._lock:
+                if os.path.isdir(entry):
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.replace(tmp, entry)
+        except Exception as e:
+            logger.warning("Could not write snapshot %s: %s", entry, e)
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """Drop snapshots of other parser versions, then the least recently used ones over budget"""
+        suffix = f"-v{self.version}"
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if name.startswith(".") or not os.path.isdir(path):
+                    continue
+                if not name.endswith(suffix):
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                try:
+                    used = os.path.getmtime(os.path.join(path, "manifest.json"))
+                    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                except OSError:
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                entries.append((used, size, path))
+
+            entries.sort(reverse=True)
+            total = sum(size for _, size, _ in entries)
+            while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+                _, size, path = entries.pop()
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
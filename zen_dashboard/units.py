@@ -0,0 +1,269 @@
+"""Unit (flat/shop) level ledger rolled up to the wing rows (no Streamlit code).
+
+Sheet1 only carries a total per wing/shop.  A unit register - a CSV or
+Parquet file, or the ``Units`` sheet of a workbook, listed in ``ZEN_UNITS`` -
+adds one row per unit per month with the columns Period ('YYYY-MM' or a
+date), Wing, Unit, To_Be and Received.  ``Unit`` names one flat or shop
+across the estate (e.g. 'A-101'); a unit listed under several wings belongs
+to the wing of its last row.  As with workbooks, a month found in several
+registers is taken from the last one listed.
+
+The rows are kept with categorical Period / Wing / Unit columns, so every
+aggregation works on their integer codes:
+
+- ``unit_wing_rows`` sums the units of each (period, wing) with one
+  ``np.bincount`` over ``period code * wings + wing code``;
+- ``merge_units`` puts those sums in place of the workbook's wing rows for
+  the months and wings the register covers, so the wing charts, tables and
+  rollups are built from them unchanged (a cell where the sheet disagrees
+  is logged);
+- ``zen_dashboard.cube.unit_cube`` is the period x unit rollup behind the
+  drilldown: the totals of every unit of a wing over a date range are one
+  prefix difference, whatever the number of months.
+"""
+import calendar
+import hashlib
+import logging
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.forecast import forecast_collections
+from zen_dashboard.ingest import IngestError, expand_sources, fetch_source
+from zen_dashboard.metrics import instrumented
+from zen_dashboard.schema import apply_schema
+
+logger = logging.getLogger(__name__)
+
+UNITS_SHEET = 'Units'
+UNIT_COLUMNS = ['Period', 'Wing', 'Unit', 'To_Be', 'Received']
+UNIT_METRICS = ('To_Be', 'Received', 'Difference')
+# Rupees a wing cell of the sheet may differ from the sum of its units before it is logged
+RECONCILE_TOLERANCE = 1.0
+UNIT_LIST_COLUMNS = ['Unit', 'Wing', 'To_Be', 'Received', 'Difference', 'Months_Outstanding', 'Risk_Score', 'Risk']
+
+
+def read_register(source):
+    """The unit columns of one register: a .csv or .parquet file, or the Units sheet of a workbook"""
+    content = BytesIO(fetch_source(source))
+    name = source.split('?')[0].lower()
+    if name.endswith('.csv'):
+        frame = pd.read_csv(content, dtype={'Wing': str, 'Unit': str})
+    elif name.endswith(('.parquet', '.pq')):
+        frame = pd.read_parquet(content)
+    elif name.endswith(('.xlsx', '.xlsm')):
+        frame = pd.read_excel(content, sheet_name=UNITS_SHEET, dtype={'Wing': str, 'Unit': str})
+    else:
+        raise ValueError("expected a .csv or .parquet unit register or a workbook with a Units sheet")
+    missing = [column for column in UNIT_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"unit register lacks the columns {', '.join(missing)}")
+    return frame[UNIT_COLUMNS]
+
+
+def period_labels(values):
+    """'YYYY-MM' of 'YYYY-MM' strings, dates or datetimes, parsed once per distinct value"""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    labels = pd.to_datetime(pd.Series(uniques, dtype=object).astype(str), format='mixed').dt.strftime('%Y-%m')
+    return labels.to_numpy(dtype=object)[codes]
+
+
+def unit_rows(frame):
+    """Register rows with 'YYYY-MM' periods, stripped labels, numeric amounts and Difference; incomplete rows dropped"""
+    frame = frame.dropna(subset=['Period', 'Wing', 'Unit'])
+    return pd.DataFrame({
+        'Period': period_labels(frame['Period']),
+        'Wing': frame['Wing'].astype(str).str.strip().to_numpy(dtype=object),
+        'Unit': frame['Unit'].astype(str).str.strip().to_numpy(dtype=object),
+        'To_Be': pd.to_numeric(frame['To_Be'], errors='coerce').fillna(0.0).to_numpy(dtype=float),
+        'Received': pd.to_numeric(frame['Received'], errors='coerce').fillna(0.0).to_numpy(dtype=float),
+    }).assign(Difference=lambda rows: (rows['To_Be'] - rows['Received']).round(2))
+
+
+def typed_units(rows):
+    """Unit rows with categorical Period (ordered) / Wing / Unit, sorted by period, wing and unit"""
+    typed = rows.astype({
+        'Period': pd.CategoricalDtype(sorted(pd.unique(rows['Period'])), ordered=True),
+        'Wing': pd.CategoricalDtype(sorted(pd.unique(rows['Wing']))),
+        'Unit': pd.CategoricalDtype(sorted(pd.unique(rows['Unit']))),
+    })
+    order = np.lexsort([typed[column].cat.codes for column in ('Unit', 'Wing', 'Period')])
+    return typed.iloc[order].reset_index(drop=True)
+
+
+@instrumented('load_units')
+def load_units(sources):
+    """Typed unit rows of the registers in sources (paths, globs or URLs), or None without any"""
+    sources = expand_sources(sources) if sources else []
+    if not sources:
+        return None
+    parts = []
+    for source in sources:
+        try:
+            parts.append(unit_rows(read_register(source)))
+        except Exception as e:
+            raise IngestError(source, e) from None
+    # Each month from the last register that has it
+    owner = {}
+    for i, rows in enumerate(parts):
+        owner.update(dict.fromkeys(pd.unique(rows['Period']), i))
+    rows = pd.concat([rows[rows['Period'].map(owner).eq(i).to_numpy()] for i, rows in enumerate(parts)],
+                     ignore_index=True)
+    return typed_units(rows) if not rows.empty else None
+
+
+def units_in_periods(units, periods):
+    """The unit rows of the given periods (the months loaded from the workbooks), or None if none are left"""
+    if units is None:
+        return None
+    units = units[units['Period'].isin(list(periods)).to_numpy()]
+    if units.empty:
+        return None
+    return units.assign(**{column: units[column].cat.remove_unused_categories()
+                           for column in ('Period', 'Wing', 'Unit')}).reset_index(drop=True)
+
+
+def unit_wing_rows(units, months=None):
+    """Wing rows (Month, Period, Wing, To_Be, Received, Difference) summed over the units of each period and wing
+
+    months maps a period to its month name; periods not in it get the
+    abbreviated calendar month ('2025-09' -> 'Sep').
+    """
+    periods = np.asarray(units['Period'].cat.categories, dtype=object)
+    wings = np.asarray(units['Wing'].cat.categories, dtype=object)
+    cells = units['Period'].cat.codes.to_numpy(dtype=np.int64) * len(wings) + units['Wing'].cat.codes.to_numpy()
+    size = len(periods) * len(wings)
+    present = np.flatnonzero(np.bincount(cells, minlength=size))
+    sums = {metric: np.bincount(cells, weights=units[metric].to_numpy(dtype=float), minlength=size)[present].round(2)
+            for metric in ('To_Be', 'Received')}
+    period_codes, wing_codes = np.divmod(present, len(wings))
+    months = months or {}
+    names = np.array([months.get(p) or calendar.month_abbr[int(p[5:7])] for p in periods], dtype=object)
+    return pd.DataFrame({
+        'Month': names[period_codes],
+        'Period': periods[period_codes],
+        'Wing': wings[wing_codes],
+        'To_Be': sums['To_Be'],
+        'Received': sums['Received'],
+        'Difference': (sums['To_Be'] - sums['Received']).round(2),
+    })
+
+
+def merge_units(frames, units):
+    """The frames with the wing rows of every (period, wing) in units replaced by the sums of its units
+
+    Cells the register does not cover keep the sheet's row; wings only the
+    register has are added.  The result goes through apply_schema again.
+    """
+    if units is None or units.empty:
+        return frames
+    df_monthly, df_wings, *rest = frames
+    months = {} if df_monthly.empty else dict(zip(df_monthly['Period'].astype(str), df_monthly['Month'].astype(str)))
+    summed = unit_wing_rows(units, months)
+    if df_wings.empty:
+        return apply_schema((df_monthly, summed, *rest))
+
+    cells = pd.MultiIndex.from_arrays([summed['Period'], summed['Wing']])
+    position = cells.get_indexer(pd.MultiIndex.from_arrays([df_wings['Period'].astype(str).to_numpy(dtype=object),
+                                                            df_wings['Wing'].astype(str).to_numpy(dtype=object)]))
+    covered = position >= 0
+    measures = ['To_Be', 'Received', 'Difference']
+    replacement = summed[measures].to_numpy()[position[covered]]
+    sheet = df_wings.loc[covered, ['To_Be', 'Received']].to_numpy(dtype=float)
+    differing = int((np.abs(sheet - replacement[:, :2]) > RECONCILE_TOLERANCE).any(axis=1).sum())
+    if differing:
+        logger.warning("%d of %d wing cells differ from the sum of their units; the unit sums are shown",
+                       differing, int(covered.sum()))
+    wings = df_wings.copy()
+    wings.loc[covered, measures] = replacement.astype(wings[measures].dtypes.iloc[0])
+    added = np.setdiff1d(np.arange(len(summed)), position[covered])
+    if len(added):
+        wings = pd.concat([wings.astype({'Month': object, 'Period': object, 'Wing': object}), summed.iloc[added]],
+                          ignore_index=True)
+        # Stable: each month's sheet rows first, in sheet order
+        wings = wings.sort_values('Period', kind='stable').reset_index(drop=True)
+    return apply_schema((df_monthly, wings, *rest))
+
+
+def unit_fingerprints(fingerprints, units):
+    """{period: fingerprint} with the unit rows of each period folded into the workbook block's fingerprint
+
+    A period whose block fingerprint is unknown (None) stays None.
+    """
+    if units is None or units.empty:
+        return fingerprints
+    hashes = pd.util.hash_pandas_object(units, index=False).to_numpy()
+    # Rows are sorted by period, so each period's rows are one slice
+    codes = units['Period'].cat.codes.to_numpy()
+    bounds = np.searchsorted(codes, np.arange(len(units['Period'].cat.categories) + 1))
+    combined = dict(fingerprints)
+    for i, period in enumerate(units['Period'].cat.categories):
+        if combined.get(period) is not None:
+            digest = hashlib.blake2b(combined[period].encode('utf-8'), digest_size=16)
+            digest.update(hashes[bounds[i]:bounds[i + 1]].tobytes())
+            combined[period] = digest.hexdigest()
+    return combined
+
+
+def unit_wings(units, keys):
+    """Wing of each unit in keys (the unit rollup's keys): the wing of its last row"""
+    codes = units['Unit'].cat.codes.to_numpy()
+    # First occurrence in the reversed rows = last row of each unit
+    present, first = np.unique(codes[::-1], return_index=True)
+    last = len(codes) - 1 - first
+    wings = pd.Series(units['Wing'].to_numpy(dtype=object)[last], index=units['Unit'].cat.categories[present])
+    return wings.reindex(keys).to_numpy(dtype=object)
+
+
+def unit_forecast(units_cube, units):
+    """forecast_collections of every unit of the unit rollup, with its wing"""
+    metric = {name: i for i, name in enumerate(units_cube.metrics)}
+    table = forecast_collections(units_cube.periods, units_cube.keys, units_cube.values[:, :, metric['To_Be']],
+                                 units_cube.values[:, :, metric['Received']], key_name='Unit')
+    wings = pd.Series(unit_wings(units, units_cube.keys), index=units_cube.keys)
+    table.insert(1, 'Wing', wings.reindex(table['Unit']).to_numpy(dtype=object))
+    return table
+
+
+def wing_units(wings):
+    """{wing: rollup positions of its units} for the unit wings from unit_wings"""
+    codes, names = pd.factorize(wings)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+    return {name: order[bounds[i]:bounds[i + 1]] for i, name in enumerate(names)}
+
+
+def unit_risk(units_cube, forecast):
+    """Months_Outstanding, Risk_Score and Risk of every unit, in rollup key order (NaN / None if never billed)"""
+    return forecast.set_index('Unit')[['Months_Outstanding', 'Risk_Score', 'Risk']].reindex(units_cube.keys)
+
+
+def unit_list(units_cube, wings, risk, positions, start=None, end=None):
+    """UNIT_LIST_COLUMNS of the units at positions: their sums over start..end and their risk
+
+    wings and risk are aligned with the rollup's keys (unit_wings, unit_risk);
+    the sums are one prefix difference per unit.
+    """
+    i, j = units_cube.period_range(start, end)
+    sums = np.round(units_cube.prefix[j, positions] - units_cube.prefix[i, positions], 2)
+    metric = {name: m for m, name in enumerate(units_cube.metrics)}
+    return pd.DataFrame({
+        'Unit': np.asarray(units_cube.keys, dtype=object)[positions],
+        'Wing': wings[positions],
+        'To_Be': sums[:, metric['To_Be']],
+        'Received': sums[:, metric['Received']],
+        'Difference': sums[:, metric['Difference']],
+        'Months_Outstanding': risk['Months_Outstanding'].to_numpy()[positions],
+        'Risk_Score': risk['Risk_Score'].to_numpy()[positions],
+        'Risk': risk['Risk'].to_numpy(dtype=object)[positions],
+    })
+
+
+def unit_months(units_cube, unit, start=None, end=None):
+    """Period x UNIT_METRICS rows of one unit over start..end, months without a bill or payment left out"""
+    i, j = units_cube.period_range(start, end)
+    values = np.round(units_cube.values[i:j, units_cube.keys.index(unit)], 2)
+    billed = (values != 0).any(axis=1)
+    return pd.DataFrame(values[billed], columns=units_cube.metrics,
+                        index=pd.Index(units_cube.periods[i:j][billed], name='Period')).reset_index()
@@ -0,0 +1,103 @@
+"""Vendor names grouped across spelling variants (no Streamlit code).
+
+Bills name the same vendor in many ways: "H.K. Services" and "HK Services",
+doubled spaces, "Dass Enterprise" / "Dass Enterprises", or a utility bill
+with the month in its name ("STP Electricity Bill October 2025").  A name is
+reduced to tokens: lower case, punctuation and ``&`` dropped, month names
+and years removed, a plural ``s`` and legal suffixes (Pvt, Ltd, ...) cut.
+Names with the same token set are one vendor.  Token sets that still differ
+are merged when their Jaccard similarity is at least ``MATCH_THRESHOLD`` and
+their numbers agree ("Barge Enterprises #2" stays separate).  Candidates
+come from an inverted index of each token set's rarest tokens (prefix
+filtering: two sets this similar must share one of them), so common words
+like "services" never make every name a candidate of every other.  Tokens
+and display names are cached, so a refresh only normalizes names it has not
+seen before.
+"""
+import calendar
+import functools
+import math
+import re
+from collections import Counter, defaultdict
+
+MATCH_THRESHOLD = 0.8
+MONTH_TOKENS = frozenset(
+    [name.lower() for name in calendar.month_name[1:]] + [name.lower() for name in calendar.month_abbr[1:]] + ['sept']
+)
+SUFFIX_TOKENS = frozenset(['pvt', 'ltd', 'private', 'limited', 'llp', 'co', 'the', 'and', 'm', 's'])
+_YEAR = re.compile(r'(19|20)\d\d')
+_DROPPED = re.compile(r"[.'’`]")
+_WORD = re.compile(r'[a-z0-9]+')
+_MONTH_WORDS = re.compile(
+    r'\b(' + '|'.join(sorted(MONTH_TOKENS, key=len, reverse=True)) + r'|(19|20)\d\d)\b', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=16384)
+def vendor_tokens(name):
+    """Sorted normalized tokens of a vendor name, e.g. ('enterprise', 'dass')"""
+    words = _WORD.findall(_DROPPED.sub('', str(name).lower()).replace('&', ' '))
+    tokens = set()
+    for word in words:
+        if word in MONTH_TOKENS or word in SUFFIX_TOKENS or _YEAR.fullmatch(word):
+            continue
+        tokens.add(word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word)
+    # A name made only of dropped words keeps them, so it is not merged with everything else
+    return tuple(sorted(tokens or words))
+
+
+@functools.lru_cache(maxsize=16384)
+def display_name(name, drop_dates=False):
+    """Name shown for a vendor: whitespace collapsed and, with drop_dates, month names and years removed"""
+    collapsed = ' '.join(str(name).split())
+    if not drop_dates:
+        return collapsed
+    return ' '.join(_MONTH_WORDS.sub(' ', collapsed).split()) or collapsed
+
+
+def canonical_vendors(names, counts=None):
+    """{name: canonical name} for the distinct vendor names
+
+    The canonical name of a group is the display_name() of its most used
+    variant (counts: bill lines per name, default one each), the shortest on a
+    tie.  Month names and years are cut from it when the group has several names.
+    """
+    names = list(dict.fromkeys(names))
+    counts = counts or {}
+    keys = {name: vendor_tokens(name) for name in names}
+    token_sets = list(dict.fromkeys(keys.values()))
+    parent = list(range(len(token_sets)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Tokens rarest first; sets with Jaccard >= MATCH_THRESHOLD share one of their first prefix tokens
+    frequency = Counter(token for tokens in token_sets for token in tokens)
+    numbers = [frozenset(token for token in tokens if token.isdigit()) for tokens in token_sets]
+    index = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        ordered = sorted(tokens, key=lambda token: (frequency[token], token))
+        prefix = ordered[:len(ordered) - math.ceil(MATCH_THRESHOLD * len(ordered)) + 1]
+        current = set(tokens)
+        for j in {j for token in prefix for j in index[token]}:
+            other = set(token_sets[j])
+            if numbers[i] == numbers[j] and \
+                    len(current & other) / len(current | other) >= MATCH_THRESHOLD:
+                parent[find(i)] = find(j)
+        for token in prefix:
+            index[token].append(i)
+
+    position = {tokens: i for i, tokens in enumerate(token_sets)}
+    members = defaultdict(list)
+    for name in names:
+        members[find(position[keys[name]])].append(name)
+    labels = {}
+    for group, group_names in members.items():
+        variants = Counter()
+        for name in group_names:
+            variants[display_name(name, drop_dates=len(group_names) > 1)] += counts.get(name, 1)
+        # Most used spelling, then the shortest, then alphabetical: independent of row order
+        labels[group] = min(variants.items(), key=lambda item: (-item[1], len(item[0]), item[0]))[0]
+    return {name: labels[find(position[keys[name]])] for name in names}
@@ -0,0 +1,210 @@
+"""Derived tables shown by the dashboard, computed from the five frames (no Streamlit code)."""
+import numpy as np
+import pandas as pd
+
+from zen_dashboard.forecast import wing_forecast
+from zen_dashboard.units import unit_forecast
+
+EXTRA_INCOME_SOURCES = ['NBH', 'Lift', 'Event', 'Scrap', 'Parking_Fine']
+PENDING_COLUMN = 'Pending/Excess (-ve = Excess)'
+# Fine columns and their short labels in Fine_Details
+FINE_LABELS = {'HK': 'HK', 'Quinteze': 'Q', 'Security': 'Sec', 'STP': 'STP'}
+# Sortable columns of the detail table and the column each one sorts on ('Month' sorts chronologically)
+DETAIL_SORT_COLUMNS = {'Month': 'Period', 'Wing': 'Wing', 'To Be Received': 'To Be Received',
+                       'Actual Received': 'Actual Received', 'Difference': 'Difference'}
+# Vendors outside the top N of the vendor chart, summed
+OTHER_VENDORS = 'Other vendors'
+
+
+def overview_table(df_monthly):
+    """Monthly overview with the To Be - Received difference"""
+    overview_data = df_monthly.copy()
+    overview_data['Difference'] = overview_data['To_Be'] - overview_data['Received']
+    return overview_data[['Month', 'To_Be', 'Received', 'Difference', 'Expense']]
+
+
+def extra_income_table(df_extra_income_breakdown, income):
+    """Extra income per source and month, with a Total column from the income rollup"""
+    breakdown_display = df_extra_income_breakdown.drop(columns='Period')
+    # Add total column (including Parking_Fine)
+    totals = income.by_period('Amount')
+    breakdown_display['Total'] = totals.reindex(df_extra_income_breakdown['Period'].astype(object)).to_numpy()
+    return breakdown_display
+
+
+def fine_amounts(wing_rows, df_fines):
+    """Fines deducted from each wing row: the FINE_LABELS columns and Fine_Amount, indexed like wing_rows
+
+    Shops are never fined and a month with several fine rows for a wing uses the
+    first.  A row counts as fined when any of its fines is positive; all of its
+    fines are then deducted.
+    """
+    fines = df_fines if not df_fines.empty else pd.DataFrame(columns=['Period', 'Wing', *FINE_LABELS])
+    fines = fines[~fines['Wing'].astype(str).str.contains('Shop')].drop_duplicates(['Period', 'Wing'])
+    merged = wing_rows[['Period', 'Wing']].merge(fines[['Period', 'Wing', *FINE_LABELS]], on=['Period', 'Wing'],
+                                                 how='left')
+    amounts = merged[list(FINE_LABELS)].apply(pd.to_numeric, errors='coerce').fillna(0.0)
+    has_fine = (amounts > 0).any(axis=1)
+    amounts = amounts.mul(has_fine, axis=0)
+    amounts['Fine_Amount'] = amounts.sum(axis=1)
+    amounts.index = wing_rows.index
+    return amounts
+
+
+def wing_tables(df_wings, df_fines):
+    """Monthly rows of every wing/shop with fine details and the pending/excess after fines
+
+    One merge of the wing rows with the fines for all wings at once, sorted by
+    wing then month; wing_index() splits it for O(1) lookups.
+    """
+    wing_shop_display = df_wings.sort_values(['Wing', 'Period'], kind='stable').reset_index(drop=True)
+    wing_shop_display = wing_shop_display.rename(columns={
+        'To_Be': 'To Be Received',
+        'Received': 'Actual Received',
+        'Difference': PENDING_COLUMN
+    })
+
+    amounts = fine_amounts(wing_shop_display, df_fines)
+    positive = amounts[list(FINE_LABELS)] > 0
+    # "HK: ₹1,200 | Sec: ₹500" - each part carries its separator, the last one is cut off
+    details = pd.Series('', index=amounts.index, dtype=object)
+    for column, label in FINE_LABELS.items():
+        part = label + ': ₹' + amounts[column].map('{:,.0f}'.format) + ' | '
+        details = details + part.where(positive[column], '')
+    wing_shop_display['Fine_Details'] = details.str[:-3].where(positive.any(axis=1), '-')
+    wing_shop_display['Fine_Amount'] = amounts['Fine_Amount']
+
+    # Adjusted pending/excess after deducting fines
+    wing_shop_display[PENDING_COLUMN] = wing_shop_display[PENDING_COLUMN] - wing_shop_display['Fine_Amount']
+    return wing_shop_display
+
+
+def wing_table(df_wings, df_fines, wing):
+    """wing_tables() rows of one wing/shop"""
+    return wing_tables(df_wings[df_wings['Wing'] == wing], df_fines)
+
+
+def wing_summary_table(wings, start=None, end=None):
+    """One row per wing/shop from the wing rollup: totals over the periods start..end, fines and the adjusted difference"""
+    totals = wings.totals(start, end)
+    summary = totals[['To_Be', 'Received', 'Difference', 'Fines']].copy()
+    # Pending (positive) or excess (negative) after deducting fines
+    summary['Adjusted'] = summary['Difference'] - summary['Fines']
+    return summary.reset_index()
+
+
+def wing_index(wing_detail):
+    """{wing: its monthly rows} from the stacked wing_tables() frame"""
+    return {wing: rows.reset_index(drop=True)
+            for wing, rows in wing_detail.groupby('Wing', sort=False, observed=True)}
+
+
+def period_mask(periods, start=None, end=None):
+    """Boolean array: which of the 'YYYY-MM' periods lie in start..end (inclusive, None = open)"""
+    periods = np.asarray(periods, dtype=object)
+    mask = np.ones(len(periods), dtype=bool)
+    if start is not None:
+        mask &= periods >= start
+    if end is not None:
+        mask &= periods <= end
+    return mask
+
+
+def detail_table(df_wings):
+    """All wing/shop rows, grouped by month (chronologically) then wing"""
+    # Sort by Month FIRST (chronologically), then Wing (alphabetically)
+    # This groups all Wings/Shops for each month together
+    detailed_breakdown = df_wings.sort_values(['Period', 'Wing'])
+
+    # Reset index to show sequential numbering starting from 0
+    detailed_breakdown = detailed_breakdown.reset_index(drop=True)
+
+    # Rename columns for clarity
+    return detailed_breakdown.rename(columns={
+        'To_Be': 'To Be Received',
+        'Received': 'Actual Received'
+    })
+
+
+def detail_sort_orders(detail):
+    """{(sort column, descending): row positions in that order}, computed once per data version
+
+    Ties keep the table's own (month, wing) order in both directions.
+    """
+    orders = {}
+    for name, column in DETAIL_SORT_COLUMNS.items():
+        for descending in (False, True):
+            ordered = detail[column].sort_values(ascending=not descending, kind='stable')
+            orders[(name, descending)] = detail.index.get_indexer(ordered.index)
+    return orders
+
+
+def detail_positions(detail, orders, sort_by='Month', descending=False, wings=(), periods=()):
+    """Row positions of the detail table matching the filters, in the requested order"""
+    positions = orders[(sort_by, descending)]
+    if wings or periods:
+        mask = np.ones(len(detail), dtype=bool)
+        if wings:
+            mask &= detail['Wing'].isin(wings).to_numpy()
+        if periods:
+            mask &= detail['Period'].isin(periods).to_numpy()
+        positions = positions[mask[positions]]
+    return positions
+
+
+def detail_page(detail, positions, page, page_size):
+    """Rows of one page (1-based); only these are copied out of the detail table"""
+    start = (page - 1) * page_size
+    return detail.take(positions[start:start + page_size])
+
+
+def vendor_monthly(vendors, n, start=None, end=None):
+    """(period x vendor) bills of the top n vendors over start..end, the rest summed as OTHER_VENDORS"""
+    names = vendors.top('Amount', n, start, end)
+    monthly = vendors.matrix('Amount', start, end, names)
+    if len(names) < len(vendors.keys):
+        monthly[OTHER_VENDORS] = (vendors.by_period('Amount', start, end) - monthly.sum(axis=1)).round(2)
+    return monthly
+
+
+def vendor_table(vendors, n=None, start=None, end=None):
+    """Vendors by total billed over start..end (the top n, largest first)
+
+    Share of all bills, months billed, the last month of the range and its
+    change against the month before, and the other spellings merged into the name.
+    """
+    names = vendors.top('Amount', len(vendors.keys) if n is None else n, start, end)
+    monthly = vendors.matrix('Amount', start, end, names)
+    totals = monthly.sum()
+    all_vendors = vendors.total('Amount', start, end)
+    last = monthly.iloc[-1] if len(monthly) else totals * 0
+    before = monthly.iloc[-2] if len(monthly) > 1 else totals * 0
+    return pd.DataFrame({
+        'Vendor': names,
+        'Total': totals.to_numpy(),
+        'Share': (totals / all_vendors).to_numpy() if all_vendors else 0.0,
+        'Months': (monthly > 0).sum().to_numpy(),
+        'Last Month': last.to_numpy(),
+        'MoM Change': (last - before).round(2).to_numpy(),
+        'Also Billed As': ['; '.join(vendors.aliases.get(name, [])) or '-' for name in names],
+    })
+
+
+def build_tables(frames, cubes, units=None):
+    """Every derived table, by name (cubes: zen_dashboard.cube.build_cubes of the frames and unit rows)"""
+    df_monthly, df_wings, df_vendors, df_extra_income_breakdown, df_fines = frames
+    tables = {}
+    if not df_monthly.empty:
+        tables['overview'] = overview_table(df_monthly)
+    if not df_extra_income_breakdown.empty:
+        tables['extra_income'] = extra_income_table(df_extra_income_breakdown, cubes['income'])
+    if not df_wings.empty:
+        tables['wing_detail'] = wing_tables(df_wings, df_fines)
+        tables['wing_summary'] = wing_summary_table(cubes['wings'])
+        tables['detail'] = detail_table(df_wings)
+        tables['forecast'] = wing_forecast(cubes['wings'])
+    if not df_vendors.empty:
+        tables['vendor_totals'] = vendor_table(cubes['vendors'])
+    if 'units' in cubes:
+        tables['unit_forecast'] = unit_forecast(cubes['units'], units)
+    return tables